@@ -0,0 +1,88 @@
+"""Microbenchmark: the old list-per-option vote store vs VoteIndex.
+
+Run from the repo root:  python benchmarks/poll_votes.py [voters]
+"""
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.votes import VoteIndex
+
+OPTIONS = 5
+
+
+def list_vote(votes: dict, user_id: int, option: str):
+    # What PollButton.callback used to do on every click.
+    for voters in votes.values():
+        if user_id in voters:
+            voters.remove(user_id)
+    if user_id not in votes[option]:
+        votes[option].append(user_id)
+
+
+def list_tally(votes: dict):
+    total = sum(len(voters) for voters in votes.values())
+    return total, [len(voters) for voters in votes.values()]
+
+
+def cast(index: VoteIndex, pairs):
+    for voter_id, option in pairs:
+        index.vote(voter_id, option)
+
+
+def recast(index: VoteIndex, pairs):
+    for voter_id, option in pairs:
+        index.retract(voter_id)
+        index.vote(voter_id, option)
+
+
+def tally(index: VoteIndex, times: int):
+    for _ in range(times):
+        index.total, list(index.counts)
+
+
+def measure(label: str, fn, count: int):
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<34} {elapsed * 1000:9.1f} ms  ({elapsed / count * 1e6:8.2f} us/op)")
+
+
+def main():
+    voters = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    rng = random.Random(1)
+    ids = [rng.getrandbits(62) for _ in range(voters)]
+    ballots = [rng.randrange(OPTIONS) for _ in range(voters)]
+    changes = [(rng.choice(ids), rng.randrange(OPTIONS)) for _ in range(10_000)]
+    print(f"{voters} voters, {OPTIONS} options")
+
+    index = VoteIndex(OPTIONS)
+    measure("VoteIndex: cast all votes", lambda: cast(index, zip(ids, ballots)), voters)
+    measure("VoteIndex: 10k vote changes", lambda: cast(index, changes), len(changes))
+    measure("VoteIndex: 10k retract + revote", lambda: recast(index, changes), len(changes))
+    measure("VoteIndex: 10k tallies", lambda: tally(index, 10_000), 10_000)
+
+    # Voter ids are allocated by Discord, not by the index, so only count what the index adds.
+    tracemalloc.start()
+    fresh = VoteIndex(OPTIONS)
+    cast(fresh, zip(ids, ballots))
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"VoteIndex memory for {voters} voters: {size / 1024 / 1024:.1f} MiB")
+
+    # The list store is O(voters) per click, so only time a sample of clicks.
+    options = [str(n) for n in range(OPTIONS)]
+    votes = {option: [] for option in options}
+    for i, b in zip(ids, ballots):
+        votes[options[b]].append(i)
+    sample = changes[:200]
+    measure("lists: 200 vote changes", lambda: [list_vote(votes, i, options[b]) for i, b in sample], len(sample))
+    measure("lists: 200 tallies", lambda: [list_tally(votes) for _ in range(200)], 200)
+
+
+if __name__ == "__main__":
+    main()
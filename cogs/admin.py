@@ -2,6 +2,7 @@ import discord
 from discord import app_commands
 from discord.ext import commands
 import config
+from utils.render import render_coalescer
 
 class Admin(commands.Cog):
     def __init__(self, bot):
@@ -24,5 +25,18 @@ class Admin(commands.Cog):
         except Exception as e:
             await interaction.response.send_message(f"Error: {e}", ephemeral=True)
 
+    @app_commands.command(name="renderstats", description="Show how many message edits were merged (admin only).")
+    @app_commands.guilds(discord.Object(id=config.GUILD_ID))
+    async def renderstats(self, interaction: discord.Interaction):
+        """Show live-update edit counters (admin only)."""
+        if not interaction.user.guild_permissions.administrator:
+            await interaction.response.send_message(
+                "You don't have permission to use this command.",
+                ephemeral=True
+            )
+            return
+
+        await interaction.response.send_message(f"Live updates: {render_coalescer.stats()}.", ephemeral=True)
+
 async def setup(bot):
     await bot.add_cog(Admin(bot))
\ No newline at end of file
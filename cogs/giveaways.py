@@ -1,49 +1,157 @@
 import discord
 import asyncio
-import random
+import time
+from functools import partial
 from discord import app_commands
 from discord.ext import commands
 import config
-import datetime
-
-def format_time(seconds: int) -> str:
-    """Format seconds into human-readable countdown (e.g. 1h 23m 10s)."""
-    delta = datetime.timedelta(seconds=seconds)
-    days, remainder = divmod(delta.total_seconds(), 86400)
-    hours, remainder = divmod(remainder, 3600)
-    minutes, seconds = divmod(remainder, 60)
-
-    parts = []
-    if days > 0:
-        parts.append(f"{int(days)}d")
-    if hours > 0:
-        parts.append(f"{int(hours)}h")
-    if minutes > 0:
-        parts.append(f"{int(minutes)}m")
-    if seconds > 0:
-        parts.append(f"{int(seconds)}s")
-
-    return " ".join(parts) if parts else "0s"
+from utils.render import render_coalescer
+from utils.database import Database
+from utils.giveaway_store import GiveawayStore
+from utils.giveaway_rules import GiveawayRules
+from utils.sampling import WeightedDraw
+from utils.giveaway_entries import EntryArray
+from utils.job_queue import Job, JobQueue
+from utils.rate_limit import RouteLimiter
+from utils.scheduler import DeadlineScheduler
+from utils.durations import parse_duration
+
+GIVEAWAY_DB_FILE = "giveaways.db"
+NOTIFY_WORKERS = 4
+END_RETRY_SECONDS = 60
+
+giveaway_db = Database(GIVEAWAY_DB_FILE)
+giveaway_store = GiveawayStore(giveaway_db)
+# Owns every giveaway's end time; replaces one countdown loop per giveaway.
+giveaway_deadlines = DeadlineScheduler("giveaways")
+# Winner DMs and staff log posts: few workers and per-route rates, retried with backoff.
+notify_queue = JobQueue(giveaway_db, workers=NOTIFY_WORKERS)
+notify_limits = RouteLimiter({
+    "dm": (config.GIVEAWAY_DMS_PER_SECOND, config.GIVEAWAY_DMS_PER_SECOND),
+    "log": (1, 5),
+})
+
+
+def jump_url(channel_id: int, message_id: int) -> str:
+    return f"https://discord.com/channels/{config.GUILD_ID}/{channel_id}/{message_id}"
+
+
+async def queue_notifications(giveaway_id: int, channel_id: int, message_id: int, host_id: int, prize_text: str,
+                              winners: list[int], entrants: int = 0, reroll: bool = False):
+    """Queue a DM for each winner and one staff log post."""
+    details = {
+        "channel_id": channel_id,
+        "message_id": message_id,
+        "host_id": host_id,
+        "prize": prize_text,
+    }
+    if config.GIVEAWAY_DM_WINNERS:
+        for user_id in winners:
+            await notify_queue.enqueue("giveaway_dm", f"{giveaway_id}:{user_id}", {**details, "user_id": user_id})
+    if config.GIVEAWAY_LOG_CHANNEL_ID:
+        await notify_queue.enqueue("giveaway_log", f"{giveaway_id}:{','.join(map(str, winners))}", {
+            **details, "winners": winners, "entrants": entrants, "reroll": reroll
+        })
+
+
+async def notify_winner(bot: commands.Bot, job: Job):
+    payload = job.payload
+    await notify_limits.acquire("dm")
+    embed = discord.Embed(
+        title="🎉 You won a giveaway!",
+        description=(
+            f"You won **{payload['prize']}** in <#{payload['channel_id']}>.\n"
+            f"Contact <@{payload['host_id']}> to claim your prize.\n\n"
+            f"[Jump to the giveaway]({jump_url(payload['channel_id'], payload['message_id'])})"
+        ),
+        color=discord.Color.green()
+    )
+    try:
+        user = bot.get_user(payload["user_id"]) or await bot.fetch_user(payload["user_id"])
+        await user.send(embed=embed)
+    except (discord.Forbidden, discord.NotFound):
+        # DMs closed or the account is gone; retrying won't help. Anything else is retried.
+        print(f"Could not DM giveaway winner {payload['user_id']}.")
+
+
+async def post_giveaway_log(bot: commands.Bot, job: Job):
+    payload = job.payload
+    channel = bot.get_channel(config.GIVEAWAY_LOG_CHANNEL_ID)
+    if channel is None:
+        print("Giveaway log channel not found.")
+        return
+    await notify_limits.acquire("log")
+    winners = ", ".join(f"<@{user_id}>" for user_id in payload["winners"]) or "No winners"
+    embed = discord.Embed(
+        title="Giveaway Rerolled" if payload["reroll"] else "Giveaway Ended",
+        description=f"[Jump to the giveaway]({jump_url(payload['channel_id'], payload['message_id'])})",
+        color=config.EMBED_COLOR
+    )
+    embed.add_field(name="Prize", value=payload["prize"], inline=False)
+    embed.add_field(name="Host", value=f"<@{payload['host_id']}>", inline=True)
+    if payload["entrants"]:
+        embed.add_field(name="Entrants", value=str(payload["entrants"]), inline=True)
+    embed.add_field(name="Winners", value=winners[:1024], inline=False)
+    await channel.send(embed=embed)
+
+
+async def still_eligible(user_id: int, rules: GiveawayRules, guild: discord.Guild | None) -> bool:
+    """Roles or membership may have changed since the member entered."""
+    if not rules.restricted:
+        return True
+    if guild is None:
+        return False
+    member = guild.get_member(user_id)
+    if member is None:
+        try:
+            member = await guild.fetch_member(user_id)
+        except discord.HTTPException:
+            return False
+    return rules.check(member) is None
+
+
+async def draw_winners(entries: EntryArray, count: int, rules: GiveawayRules, guild: discord.Guild | None,
+                       exclude: set[int] = frozenset()) -> list[int]:
+    """Draw weighted winners, re-checking eligibility only for the candidates drawn."""
+    # Keying every entry is O(n); keep it off the event loop for big giveaways.
+    loop = asyncio.get_running_loop()
+    draw = await loop.run_in_executor(None, WeightedDraw, entries)
+    winners = []
+    for user_id in draw:
+        if user_id in exclude:
+            continue
+        if await still_eligible(user_id, rules, guild):
+            winners.append(user_id)
+            if len(winners) == count:
+                break
+    return winners
 
 
 class GiveawayView(discord.ui.View):
-    def __init__(self, host: discord.Member, prize: str, winners: int, seconds: int, prize_link: str | None = None):
-        super().__init__(timeout=seconds)
-        self.host = host
+    def __init__(self, giveaway_id: int, host_id: int, prize: str, winners: int, end_time: float,
+                 prize_link: str | None = None, entries: EntryArray | None = None,
+                 rules: GiveawayRules | None = None, guild: discord.Guild | None = None):
+        # Persistent: the scheduler ends the giveaway, so it survives restarts.
+        super().__init__(timeout=None)
+        self.giveaway_id = giveaway_id
+        self.host_id = host_id
         self.prize = prize
         self.prize_link = prize_link
         self.winners = winners
-        self.entries = set()
+        # Entrants and their number of entries (1 plus any bonus-role entries)
+        self.entries = entries if entries is not None else EntryArray()
+        self.rules = rules or GiveawayRules()
+        self.guild = guild
         self.message: discord.Message | None = None
-        self.end_time = discord.utils.utcnow().timestamp() + seconds
-        self.update_task: asyncio.Task | None = None
+        self.end_time = end_time
+        self.ending = False
 
         self.add_item(self.EnterButton(self))
         self.add_item(self.LeaveButton(self))
 
     class EnterButton(discord.ui.Button):
         def __init__(self, parent_view: "GiveawayView"):
-            super().__init__(label="Enter Giveaway", style=discord.ButtonStyle.green)
+            super().__init__(label="Enter Giveaway", style=discord.ButtonStyle.green, custom_id=f"giveaway:{parent_view.giveaway_id}:enter")
             self.parent_view = parent_view
 
         async def callback(self, interaction: discord.Interaction):
@@ -53,18 +161,31 @@ class GiveawayView(discord.ui.View):
                 await interaction.response.send_message("Bots cannot enter giveaways!", ephemeral=True)
                 return
 
+            if view.ending:
+                await interaction.response.send_message("This giveaway has ended.", ephemeral=True)
+                return
+
             if interaction.user.id in view.entries:
                 await interaction.response.send_message("You are already entered!", ephemeral=True)
                 return
 
-            view.entries.add(interaction.user.id)
-            remaining = int(view.end_time - discord.utils.utcnow().timestamp())
-            await view.update_embed(remaining)
-            await interaction.response.send_message("You have entered the giveaway!", ephemeral=True)
+            reason = view.rules.check(interaction.user)
+            if reason:
+                await interaction.response.send_message(reason, ephemeral=True)
+                return
+
+            weight = view.rules.weight(interaction.user)
+            view.entries.add(interaction.user.id, weight)
+            giveaway_store.record_entry(view.giveaway_id, interaction.user.id, weight)
+            view.update_embed()
+            if weight > 1:
+                await interaction.response.send_message(f"You have entered the giveaway with **{weight}** entries!", ephemeral=True)
+            else:
+                await interaction.response.send_message("You have entered the giveaway!", ephemeral=True)
 
     class LeaveButton(discord.ui.Button):
         def __init__(self, parent_view: "GiveawayView"):
-            super().__init__(label="Leave Giveaway", style=discord.ButtonStyle.red)
+            super().__init__(label="Leave Giveaway", style=discord.ButtonStyle.red, custom_id=f"giveaway:{parent_view.giveaway_id}:leave")
             self.parent_view = parent_view
 
         async def callback(self, interaction: discord.Interaction):
@@ -74,104 +195,142 @@ class GiveawayView(discord.ui.View):
                 await interaction.response.send_message("Bots cannot leave giveaways!", ephemeral=True)
                 return
 
+            if view.ending:
+                await interaction.response.send_message("This giveaway has ended.", ephemeral=True)
+                return
+
             if interaction.user.id not in view.entries:
                 await interaction.response.send_message("You are not in the giveaway!", ephemeral=True)
                 return
 
             view.entries.remove(interaction.user.id)
-            remaining = int(view.end_time - discord.utils.utcnow().timestamp())
-            await view.update_embed(remaining)
+            giveaway_store.record_entry(view.giveaway_id, interaction.user.id, 0)
+            view.update_embed()
             await interaction.response.send_message("You have left the giveaway.", ephemeral=True)
 
-    async def start_updating(self):
-        """Background task to update countdown at safe intervals and finish the giveaway."""
-        while True:
-            if not self.message:
-                await asyncio.sleep(5)
-                continue
+    def update_embed(self):
+        """Queue an embed refresh; bursts of entries are merged into one edit."""
+        render_coalescer.mark_dirty(self.message, self.render)
 
-            remaining = int(self.end_time - discord.utils.utcnow().timestamp())
-            if remaining <= 0:
-                await self.end_giveaway()
-                break
+    def render(self) -> dict | None:
+        if self.is_finished():
+            return None
+        return {"embed": self.build_embed(), "view": self}
 
-            await self.update_embed(remaining)
-
-            if remaining > 86400:
-                await asyncio.sleep(900)
-            elif remaining > 3600:
-                await asyncio.sleep(300)
-            elif remaining > 600:
-                await asyncio.sleep(60)
-            elif remaining > 60:
-                await asyncio.sleep(15)
-            else:
-                await asyncio.sleep(5)
-
-    async def update_embed(self, remaining: int | None = None):
-        """Update the giveaway embed dynamically with countdown and entries."""
-        if remaining is None:
-            remaining = int(self.end_time - discord.utils.utcnow().timestamp())
-
-        prize_text = f"[{self.prize}]({self.prize_link})" if self.prize_link else self.prize
+    @property
+    def prize_text(self) -> str:
+        return f"[{self.prize}]({self.prize_link})" if self.prize_link else self.prize
 
+    def build_embed(self) -> discord.Embed:
+        """Build the giveaway embed with countdown and entries."""
+        # <t:...:R> counts down on the client, so the message only changes when entries do.
+        requirements = self.rules.describe()
         embed = discord.Embed(
             title="🎉 New Giveaway Alert! 🥳",
             description=(
-                f"**Prize:** {prize_text}\n"
-                f"**Hosted by:** {self.host.mention}\n"
-                f"**Time remaining:** {format_time(remaining)}\n"
-                f"**Number of winners:** {self.winners}\n\n"
-                f"**Entries so far:** {len(self.entries)}"
+                f"**Prize:** {self.prize_text}\n"
+                f"**Hosted by:** <@{self.host_id}>\n"
+                f"**Ends:** <t:{int(self.end_time)}:R>\n"
+                f"**Number of winners:** {self.winners}\n"
+                + (f"{requirements}\n" if requirements else "")
+                + f"\n**Entries so far:** {len(self.entries)}"
             ),
             color=config.EMBED_COLOR
         )
         embed.set_footer(text="The giveaway has not ended yet.")
-        if self.message:
-            try:
-                await self.message.edit(embed=embed, view=self)
-            except discord.HTTPException:
-                pass
+        return embed
 
     async def end_giveaway(self):
-        """End the giveaway, pick winners, and update the embed."""
-        if not self.message:
+        """End the giveaway, save the winners, then announce them."""
+        if not self.message or self.ending:
             return
 
-        prize_text = f"[{self.prize}]({self.prize_link})" if self.prize_link else self.prize
-
-        if not self.entries:
-            description = (
-                f"**Prize:** {prize_text}\n"
-                f"**Hosted by:** {self.host.mention}\n\n"
-                "**No one entered the giveaway.**"
-            )
-            embed = discord.Embed(title="Giveaway Ended", description=description, color=discord.Color.red())
-            await self.message.edit(embed=embed, view=None)
+        # Blocks entries during the draw; the view keeps listening until the winners are saved.
+        self.ending = True
+        try:
+            winners = await draw_winners(self.entries, self.winners, self.rules, self.guild)
+            # Saved before announcing, so a restart in between re-announces the same winners.
+            await giveaway_store.save_winners(self.giveaway_id, winners, self.entries)
+        except Exception as e:
+            print(f"Failed to draw giveaway {self.giveaway_id}, retrying in {END_RETRY_SECONDS}s: {e}")
+            self.ending = False
+            giveaway_deadlines.schedule(self.giveaway_id, time.time() + END_RETRY_SECONDS, self.end_giveaway)
             return
 
-        winners = random.sample(list(self.entries), min(self.winners, len(self.entries)))
-        winner_mentions = ", ".join(f"<@{user_id}>" for user_id in winners)
-
-        description = (
-            f"**Prize:** {prize_text}\n"
-            f"**Hosted by:** {self.host.mention}\n"
-            f"**Winners:** {winner_mentions}\n\n"
-            "Congratulations!"
-        )
+        self.stop()
+        render_coalescer.discard(self.message.id)
+        await self.announce(winners)
 
-        embed = discord.Embed(title="Giveaway Ended", description=description, color=discord.Color.green())
-        await self.message.edit(embed=embed, view=None)
+    async def announce(self, winners: list[int]):
+        """Edit the giveaway message to show the winners and ping them."""
+        try:
+            if not winners:
+                # Everyone who entered may have lost a required role or left the server.
+                reason = "No eligible entrants were left to draw." if self.entries else "No one entered the giveaway."
+                description = (
+                    f"**Prize:** {self.prize_text}\n"
+                    f"**Hosted by:** <@{self.host_id}>\n\n"
+                    f"**{reason}**"
+                )
+                embed = discord.Embed(title="Giveaway Ended", description=description, color=discord.Color.red())
+                await self.message.edit(embed=embed, view=None)
+            else:
+                winner_mentions = ", ".join(f"<@{user_id}>" for user_id in winners)
+                description = (
+                    f"**Prize:** {self.prize_text}\n"
+                    f"**Hosted by:** <@{self.host_id}>\n"
+                    f"**Winners:** {winner_mentions}\n\n"
+                    "Congratulations!"
+                )
+                embed = discord.Embed(title="Giveaway Ended", description=description, color=discord.Color.green())
+                await self.message.edit(embed=embed, view=None)
 
-        await self.message.reply(
-            f"Congratulations {winner_mentions}! You won **{prize_text}**!",
-            mention_author=False
+                await self.message.reply(
+                    f"Congratulations {winner_mentions}! You won **{self.prize_text}**!",
+                    mention_author=False
+                )
+        except discord.NotFound:
+            print(f"Giveaway {self.giveaway_id} message was deleted before the winners were announced.")
+        await queue_notifications(
+            self.giveaway_id, self.message.channel.id, self.message.id, self.host_id, self.prize_text,
+            winners, entrants=len(self.entries)
         )
+        await giveaway_store.mark_done(self.giveaway_id)
 
 class Giveaways(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
 
+    async def cog_load(self):
+        await giveaway_store.load()
+        giveaway_store.start()
+        notify_queue.register("giveaway_dm", partial(notify_winner, self.bot))
+        notify_queue.register("giveaway_log", partial(post_giveaway_log, self.bot))
+        await notify_queue.start()
+        giveaway_deadlines.start()
+        for giveaway in await giveaway_store.unfinished():
+            view = GiveawayView(
+                giveaway["id"], giveaway["host_id"], giveaway["prize"], giveaway["winner_count"],
+                giveaway["end_time"], giveaway["prize_link"], giveaway["entries"],
+                GiveawayRules.from_dict(giveaway["rules"]), self.bot.get_guild(config.GUILD_ID)
+            )
+            channel = self.bot.get_partial_messageable(giveaway["channel_id"])
+            view.message = channel.get_partial_message(giveaway["message_id"])
+            if giveaway["status"] == "drawn":
+                # Winners were drawn but the announcement didn't finish.
+                view.ending = True
+                giveaway_deadlines.schedule(view.giveaway_id, 0, lambda v=view, w=giveaway["winners"]: v.announce(w))
+                continue
+            self.bot.add_view(view, message_id=giveaway["message_id"])
+            # Giveaways that ended while the bot was down fire straight away.
+            giveaway_deadlines.schedule(view.giveaway_id, view.end_time, view.end_giveaway)
+
+    async def cog_unload(self):
+        giveaway_deadlines.stop()
+        await notify_queue.stop()
+        await giveaway_store.stop()
+        await giveaway_db.close()
+
     @app_commands.command(name="giveaway", description="Start a giveaway in a selected channel.")
     @app_commands.guilds(discord.Object(id=config.GUILD_ID))
     @app_commands.checks.has_permissions(manage_messages=True)
@@ -181,6 +340,12 @@ class Giveaways(commands.Cog):
         prize_link="Optional link for the prize",
         duration="Duration of the giveaway (e.g. 1m, 10m, 2h, 3d)",
         winners="Number of winners (default: 1)",
+        required_role="Only members with this role can enter",
+        forbidden_role="Members with this role can't enter",
+        min_account_age="Minimum account age in days",
+        min_server_days="Minimum days since joining the server",
+        bonus_role="Members with this role get extra entries",
+        bonus_entries="Extra entries for the bonus role (default: 1)",
     )
     async def giveaway(
         self,
@@ -189,29 +354,20 @@ class Giveaways(commands.Cog):
         prize: str,
         duration: str,
         winners: int = 1,
-        prize_link: str | None = None
+        prize_link: str | None = None,
+        required_role: discord.Role | None = None,
+        forbidden_role: discord.Role | None = None,
+        min_account_age: int = 0,
+        min_server_days: int = 0,
+        bonus_role: discord.Role | None = None,
+        bonus_entries: int = 1
     ):
         """Start a giveaway in the chosen channel with flexible duration format."""
 
-        try:
-            unit = duration[-1].lower()
-            time = int(duration[:-1])
-
-            if unit == "m":
-                seconds = time * 60
-            elif unit == "h":
-                seconds = time * 3600
-            elif unit == "d":
-                seconds = time * 86400
-            else:
-                await interaction.response.send_message(
-                    "Invalid duration format! Use `m` for minutes, `h` for hours, or `d` for days. Example: `10m`, `2h`, `1d`.",
-                    ephemeral=True
-                )
-                return
-        except (ValueError, IndexError):
+        seconds = parse_duration(duration)
+        if seconds is None:
             await interaction.response.send_message(
-                "Invalid duration format! Example: `10m`, `2h`, `1d`.",
+                "Invalid duration format! Use `m` for minutes, `h` for hours, or `d` for days. Example: `10m`, `2h`, `1d`.",
                 ephemeral=True
             )
             return
@@ -220,34 +376,79 @@ class Giveaways(commands.Cog):
             await interaction.response.send_message("There must be at least **1 winner**.", ephemeral=True)
             return
 
-        view = GiveawayView(interaction.user, prize, winners, seconds, prize_link)
-
-        prize_text = f"[{prize}]({prize_link})" if prize_link else prize
+        if min(min_account_age, min_server_days, bonus_entries) < 0:
+            await interaction.response.send_message("Ages and bonus entries can't be negative.", ephemeral=True)
+            return
 
-        embed = discord.Embed(
-            title="🎉 New Giveaway Alert! 🥳",
-            description=(
-                f"**Prize:** {prize_text}\n"
-                f"**Hosted by:** {interaction.user.mention}\n"
-                f"**Time remaining:** {format_time(seconds)}\n"
-                f"**Number of winners:** {winners}\n\n"
-                f"**Entries so far:** 0"
-            ),
-            color=config.EMBED_COLOR
+        rules = GiveawayRules(
+            required_roles=[required_role.id] if required_role else [],
+            forbidden_roles=[forbidden_role.id] if forbidden_role else [],
+            min_account_days=min_account_age,
+            min_member_days=min_server_days,
+            bonus_roles={bonus_role.id: bonus_entries} if bonus_role and bonus_entries else {},
         )
-        embed.set_footer(text="The giveaway has not ended yet.")
 
-        giveaway_message = await channel.send(embed=embed, view=view)
-        view.message = giveaway_message
+        end_time = discord.utils.utcnow().timestamp() + seconds
+        view = GiveawayView(interaction.id, interaction.user.id, prize, winners, end_time, prize_link,
+                            rules=rules, guild=interaction.guild)
 
-        # Start background updater
-        view.update_task = asyncio.create_task(view.start_updating())
+        giveaway_message = await channel.send(embed=view.build_embed(), view=view)
+        view.message = giveaway_message
+        await giveaway_store.create(
+            view.giveaway_id, channel.id, giveaway_message.id, interaction.user.id, prize, prize_link, winners, end_time, rules.to_dict()
+        )
+        giveaway_deadlines.schedule(view.giveaway_id, end_time, view.end_giveaway)
 
         await interaction.response.send_message(
             f"Giveaway for **{prize}** started in {channel.mention}!",
             ephemeral=True
         )
 
+    @app_commands.command(name="greroll", description="Draw new winners for an ended giveaway.")
+    @app_commands.guilds(discord.Object(id=config.GUILD_ID))
+    @app_commands.checks.has_permissions(manage_messages=True)
+    @app_commands.describe(
+        message_id="ID of the giveaway message",
+        winners="Number of new winners to draw (default: 1)",
+    )
+    async def greroll(self, interaction: discord.Interaction, message_id: str, winners: int = 1):
+        """Redraw from the ended giveaway's entry snapshot, skipping everyone who already won."""
+        if not message_id.strip().isdigit():
+            await interaction.response.send_message("That isn't a valid message ID.", ephemeral=True)
+            return
+        if winners < 1:
+            await interaction.response.send_message("There must be at least **1 winner**.", ephemeral=True)
+            return
+
+        giveaway = await giveaway_store.find_ended(int(message_id))
+        if giveaway is None:
+            await interaction.response.send_message("No ended giveaway was found for that message.", ephemeral=True)
+            return
+
+        await interaction.response.defer(ephemeral=True)
+        rules = GiveawayRules.from_dict(giveaway["rules"])
+        previous = giveaway["winners"]
+        new_winners = await draw_winners(giveaway["entries"], winners, rules, interaction.guild, exclude=set(previous))
+        if not new_winners:
+            await interaction.followup.send("There are no eligible entrants left to draw.", ephemeral=True)
+            return
+
+        await giveaway_store.set_winners(giveaway["id"], previous + new_winners)
+        prize_text = f"[{giveaway['prize']}]({giveaway['prize_link']})" if giveaway["prize_link"] else giveaway["prize"]
+        winner_mentions = ", ".join(f"<@{user_id}>" for user_id in new_winners)
+        message = self.bot.get_partial_messageable(giveaway["channel_id"]).get_partial_message(giveaway["message_id"])
+        try:
+            await message.reply(f"🎉 Reroll! Congratulations {winner_mentions}! You won **{prize_text}**!", mention_author=False)
+        except discord.HTTPException:
+            channel = self.bot.get_channel(giveaway["channel_id"])
+            if channel:
+                await channel.send(f"🎉 Reroll! Congratulations {winner_mentions}! You won **{prize_text}**!")
+        await queue_notifications(
+            giveaway["id"], giveaway["channel_id"], giveaway["message_id"], giveaway["host_id"], prize_text,
+            new_winners, entrants=len(giveaway["entries"]), reroll=True
+        )
+        await interaction.followup.send(f"Rerolled: {winner_mentions}", ephemeral=True)
+
 
 async def setup(bot: commands.Bot):
     await bot.add_cog(Giveaways(bot))
\ No newline at end of file
@@ -21,12 +21,22 @@ class Help(commands.Cog):
         )
 
         embed.add_field(name="/playerinfo", value="Search up a players info.", inline=False)
-        embed.add_field(name="/stickynote", value="Add a sticky note to a channel.", inline=False)
+        embed.add_field(name="/stickynote", value="Add a sticky note to a channel (with optional repost timing).", inline=False)
         embed.add_field(name="/clearnote", value="Clear stickynote from channel.", inline=False)
         embed.add_field(name="/setupverify", value="Send verify panel to the channel.", inline=False)
+        embed.add_field(name="/reviewapps", value="Approve or deny several pending whitelist applications at once.", inline=False)
+        embed.add_field(name="/blacklist", value="Add, remove, list or import users blocked from applying.", inline=False)
         embed.add_field(name="/ticketadmin", value="Modify ticket panel from the comfort of your discord.", inline=False)
         embed.add_field(name="/ticketpanel", value="Send ticket panel. (Configure ticket panel first)", inline=False)
+        embed.add_field(name="/ticketsearch", value="Search closed ticket transcripts.", inline=False)
+        embed.add_field(name="/ticketunclaim", value="Release your claim on a ticket.", inline=False)
+        embed.add_field(name="/tickettransfer", value="Hand a ticket over to another staff member.", inline=False)
+        embed.add_field(name="/tickethistory", value="Show who claimed a ticket and when.", inline=False)
+        embed.add_field(name="/ticketstats", value="Time-to-claim and time-to-close percentiles.", inline=False)
         embed.add_field(name="/reload", value="Reload a feature for a real-time update.", inline=False)
+        embed.add_field(name="/renderstats", value="Show how many poll/giveaway edits were merged.", inline=False)
+        embed.add_field(name="/choicepoll", value="Create a multi-select or ranked-choice poll (up to 25 options).", inline=False)
+        embed.add_field(name="/greroll", value="Draw new winners for an ended giveaway.", inline=False)
 
         embed.set_footer(
             text=f"Requested by {interaction.user}",
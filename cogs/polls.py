@@ -1,67 +1,121 @@
 import discord
 from discord.ext import commands
 from discord import app_commands
-import asyncio
 import config
+from utils.render import render_coalescer
+from utils.votes import VoteIndex, MultiVoteIndex, RankedTally
+from utils.database import Database
+from utils.poll_store import PollStore
+from utils.durations import parse_duration
+import asyncio
 import datetime
 import re
 
-def format_time(seconds: int) -> str:
-    """Convert seconds into a human-readable time format (Xd Xh Xm Xs)."""
-    delta = datetime.timedelta(seconds=seconds)
-    days, remainder = divmod(delta.total_seconds(), 86400)
-    hours, remainder = divmod(remainder, 3600)
-    minutes, seconds = divmod(remainder, 60)
-    parts = []
-    if days > 0:
-        parts.append(f"{int(days)}d")
-    if hours > 0:
-        parts.append(f"{int(hours)}h")
-    if minutes > 0:
-        parts.append(f"{int(minutes)}m")
-    if seconds > 0:
-        parts.append(f"{int(seconds)}s")
-    return " ".join(parts) if parts else "0s"
+POLL_DB_FILE = "polls.db"
+MAX_CHOICE_OPTIONS = 25  # Discord's limit for options in one select menu
+POLL_KINDS = {"single": VoteIndex, "multi": MultiVoteIndex, "ranked": RankedTally}
+
+poll_db = Database(POLL_DB_FILE)
+poll_store = PollStore(poll_db)
 
 def is_url(text: str) -> bool:
     """Check if the given text is a valid URL."""
     url_pattern = re.compile(r"^https?://[^\s]+$")
     return bool(url_pattern.match(text))
 
+def ordinal(n: int) -> str:
+    suffix = "th" if 10 <= n % 100 <= 20 else {1: "st", 2: "nd", 3: "rd"}.get(n % 10, "th")
+    return f"{n}{suffix}"
+
 class PollView(discord.ui.View):
-    def __init__(self, question: str, options: list[str], links: dict[str, str], author: discord.User, seconds: int, message: discord.Message = None):
-        super().__init__(timeout=seconds)
+    def __init__(self, poll_id: int, question: str, options: list[str], links: dict[str, str], author: str, end_time: float, message: discord.Message = None, kind: str = "single"):
+        # Persistent: the poll's own timer ends it, so it survives restarts.
+        super().__init__(timeout=None)
+        self.poll_id = poll_id
+        self.kind = kind
         self.question = question
         self.options = options
         self.links = links
-        self.votes = {option: [] for option in options}
+        self.votes = POLL_KINDS[kind](len(options))
         self.author = author
-        self.end_time = discord.utils.utcnow().timestamp() + seconds
+        self.end_time = end_time
         self.message = message
 
-        for i, option in enumerate(options, start=1):
-            self.add_item(PollButton(label=option, option=option, row=(i - 1) // 5))
+        if kind == "multi":
+            self.add_item(PollSelect(poll_id, options))
+        elif kind == "ranked":
+            self.add_item(RankButton(poll_id))
+        else:
+            for i, option in enumerate(options, start=1):
+                self.add_item(PollButton(poll_id, label=option, option=option, index=i - 1, row=(i - 1) // 5))
+
+    def restore_ballot(self, user_id: int, ballot: list[int]):
+        if self.kind == "single":
+            self.votes.vote(user_id, ballot[0])
+        else:
+            self.votes.vote(user_id, ballot)
+
+    def multi_results(self) -> str:
+        voters = self.votes.total
+        lines = []
+        for option, count in zip(self.options, self.votes.counts):
+            percent = (count / voters) * 100 if voters else 0
+            bar = "█" * int(percent // 10)
+            lines.append(f"**{option}** — {count} votes ({percent:.1f}% of voters)\n`{bar:<10}`")
+        return "\n".join(lines)
+
+    def ranked_results(self) -> str:
+        tally: RankedTally = self.votes
+        final = tally.rounds[-1]
+        active = sum(final.counts[c] for c in final.remaining)
+        standing = sorted(final.remaining, key=lambda c: -final.counts[c])
+        lines = [f"**Round {len(tally.rounds)}**"]
+        for c in standing:
+            percent = (final.counts[c] / active) * 100 if active else 0
+            lines.append(f"**{self.options[c]}** — {final.counts[c]} ({percent:.1f}%)")
+        eliminated = [self.options[r.outcome[1]] for r in tally.rounds if r.outcome[0] == "eliminate"]
+        if eliminated:
+            lines.append("Eliminated: " + ", ".join(f"~~{name}~~" for name in eliminated))
+        if final.exhausted:
+            lines.append(f"Exhausted ballots: {final.exhausted}")
+        if tally.winner is not None:
+            lines.append(f"\n🏆 **{self.options[tally.winner]}** has a majority")
+        return "\n".join(lines)
 
     def build_results_embed(self) -> discord.Embed:
-        total_votes = sum(len(voters) for voters in self.votes.values())
+        total_votes = self.votes.total
         remaining = int(self.end_time - discord.utils.utcnow().timestamp())
+        # Discord renders <t:...:R> as a live countdown on the client, so the
+        # message doesn't have to be edited to keep the timer current.
+        if remaining > 0:
+            timer_text = f"Ends <t:{int(self.end_time)}:R>"
+        else:
+            timer_text = f"Poll ended <t:{int(self.end_time)}:R>"
         embed = discord.Embed(
             title="SiliconRP Poll",
-            description=self.question,
+            description=f"{self.question}\n\n{timer_text}",
             color=config.EMBED_COLOR
         )
-        if remaining > 0:
-            timer_text = f"Time left: {format_time(remaining)}"
-        else:
-            timer_text = "Poll ended"
-        embed.set_footer(text=f"{timer_text}\nPoll created by {self.author}")
+        embed.set_footer(text=f"Poll created by {self.author}")
+
+        if self.kind != "single":
+            # Up to 25 options don't fit in a 1024-character field.
+            style = "Ranked choice" if self.kind == "ranked" else "Pick any number of options"
+            if total_votes == 0:
+                results_text = "No votes yet."
+            elif self.kind == "ranked":
+                results_text = self.ranked_results()
+            else:
+                results_text = self.multi_results()
+            embed.description = f"{self.question}\n*{style}*\n\n{timer_text}\n\n{results_text}"[:4096]
+            embed.set_footer(text=f"Poll created by {self.author} • {total_votes} voters")
+            return embed
 
         if total_votes == 0:
             results_text = "No votes yet."
         else:
             results_text = ""
-            for option, voters in self.votes.items():
-                count = len(voters)
+            for option, count in zip(self.options, self.votes.counts):
                 percent = (count / total_votes) * 100 if total_votes > 0 else 0
                 bar = "█" * int(percent // 10)
                 results_text += f"**{option}** — {count} votes ({percent:.1f}%)\n`{bar:<10}`\n"
@@ -76,32 +130,156 @@ class PollView(discord.ui.View):
 
         return embed
 
+    def render(self) -> dict | None:
+        if self.is_finished():
+            return None
+        return {"embed": self.build_results_embed(), "view": self}
+
     async def start_timer(self):
-        while True:
-            remaining = int(self.end_time - discord.utils.utcnow().timestamp())
-            if remaining <= 0:
-                await self.message.edit(embed=self.build_results_embed(), view=None)
-                break
-            await self.message.edit(embed=self.build_results_embed(), view=self)
-            await asyncio.sleep(1)
+        """Sleep until the deadline, then post the final results once."""
+        await discord.utils.sleep_until(datetime.datetime.fromtimestamp(self.end_time, datetime.timezone.utc))
+        self.stop()
+        render_coalescer.discard(self.message.id)
+        try:
+            await self.message.edit(embed=self.build_results_embed(), view=None)
+        except discord.HTTPException:
+            pass
+        await poll_store.mark_ended(self.poll_id)
 
 class PollButton(discord.ui.Button):
-    def __init__(self, label: str, option: str, row: int):
-        super().__init__(label=label, style=discord.ButtonStyle.primary, row=row)
+    def __init__(self, poll_id: int, label: str, option: str, index: int, row: int):
+        # Deterministic custom id so the button still works after a restart.
+        super().__init__(label=label, style=discord.ButtonStyle.primary, row=row, custom_id=f"poll:{poll_id}:{index}")
         self.option = option
+        self.index = index
+
+    async def callback(self, interaction: discord.Interaction):
+        view: PollView = self.view
+        # Clicking your current choice again takes the vote back.
+        if view.votes.choice(interaction.user.id) == self.index:
+            view.votes.retract(interaction.user.id)
+            poll_store.record_ballot(view.poll_id, interaction.user.id, None)
+        else:
+            view.votes.vote(interaction.user.id, self.index)
+            poll_store.record_ballot(view.poll_id, interaction.user.id, [self.index])
+        await interaction.response.defer()
+        render_coalescer.mark_dirty(view.message or interaction.message, view.render)
+
+class PollSelect(discord.ui.Select):
+    def __init__(self, poll_id: int, options: list[str]):
+        super().__init__(
+            placeholder="Choose any number of options",
+            min_values=0,
+            max_values=len(options),
+            options=[discord.SelectOption(label=option[:100], value=str(i)) for i, option in enumerate(options)],
+            custom_id=f"poll:{poll_id}:select"
+        )
+
+    async def callback(self, interaction: discord.Interaction):
+        view: PollView = self.view
+        # Submitting an empty selection takes the vote back.
+        chosen = sorted(int(value) for value in self.values)
+        view.votes.vote(interaction.user.id, chosen)
+        poll_store.record_ballot(view.poll_id, interaction.user.id, chosen or None)
+        await interaction.response.defer()
+        render_coalescer.mark_dirty(view.message or interaction.message, view.render)
+
+class RankButton(discord.ui.Button):
+    def __init__(self, poll_id: int):
+        super().__init__(label="Rank options", style=discord.ButtonStyle.primary, custom_id=f"poll:{poll_id}:rank")
 
     async def callback(self, interaction: discord.Interaction):
         view: PollView = self.view
-        for voters in view.votes.values():
-            if interaction.user.id in voters:
-                voters.remove(interaction.user.id)
-        if interaction.user.id not in view.votes[self.option]:
-            view.votes[self.option].append(interaction.user.id)
-        await interaction.response.edit_message(embed=view.build_results_embed(), view=view)
+        ranking = RankingView(view, view.votes.ranking(interaction.user.id))
+        await interaction.response.send_message(embed=ranking.build_embed(), view=ranking, ephemeral=True)
+
+class RankingView(discord.ui.View):
+    """Private ballot: pick options one at a time in order of preference."""
+
+    def __init__(self, poll: PollView, ranking: list[int]):
+        super().__init__(timeout=600)
+        self.poll = poll
+        self.ranking = ranking
+        self.refresh()
+
+    def refresh(self):
+        self.pick.options = [
+            discord.SelectOption(label=option[:100], value=str(i))
+            for i, option in enumerate(self.poll.options) if i not in self.ranking
+        ] or [discord.SelectOption(label="Every option is ranked", value="-1")]
+        self.pick.placeholder = f"Your {ordinal(len(self.ranking) + 1)} choice"
+        self.pick.disabled = len(self.ranking) == len(self.poll.options)
+
+    def build_embed(self) -> discord.Embed:
+        if self.ranking:
+            text = "\n".join(f"{n}. {self.poll.options[i]}" for n, i in enumerate(self.ranking, start=1))
+        else:
+            text = "Nothing ranked yet. Pick your favourite first."
+        return discord.Embed(title=self.poll.question[:256], description=text, color=config.EMBED_COLOR)
+
+    async def redraw(self, interaction: discord.Interaction):
+        self.refresh()
+        await interaction.response.edit_message(embed=self.build_embed(), view=self)
+
+    @discord.ui.select(placeholder="Your 1st choice", options=[discord.SelectOption(label="-", value="-1")])
+    async def pick(self, interaction: discord.Interaction, select: discord.ui.Select):
+        option = int(select.values[0])
+        if option >= 0 and option not in self.ranking:
+            self.ranking.append(option)
+        await self.redraw(interaction)
+
+    @discord.ui.button(label="Submit", style=discord.ButtonStyle.success)
+    async def submit(self, interaction: discord.Interaction, button: discord.ui.Button):
+        if self.poll.is_finished():
+            await interaction.response.edit_message(content="This poll has ended.", embed=None, view=None)
+            return
+        self.poll.votes.vote(interaction.user.id, self.ranking)
+        poll_store.record_ballot(self.poll.poll_id, interaction.user.id, list(self.ranking) or None)
+        message = "Your ranking was saved." if self.ranking else "Your vote was withdrawn."
+        await interaction.response.edit_message(content=message, view=None)
+        render_coalescer.mark_dirty(self.poll.message, self.poll.render)
+        self.stop()
+
+    @discord.ui.button(label="Start over", style=discord.ButtonStyle.secondary)
+    async def clear(self, interaction: discord.Interaction, button: discord.ui.Button):
+        self.ranking = []
+        await self.redraw(interaction)
 
 class Polls(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
+        self.timers: dict[int, asyncio.Task] = {}
+
+    async def cog_load(self):
+        await poll_store.load()
+        poll_store.start()
+        for poll in await poll_store.active_polls():
+            view = PollView(poll["id"], poll["question"], poll["options"], poll["links"], poll["author"], poll["end_time"], kind=poll["kind"])
+            for user_id, ballot in poll["ballots"].items():
+                view.restore_ballot(user_id, ballot)
+            channel = self.bot.get_partial_messageable(poll["channel_id"])
+            view.message = channel.get_partial_message(poll["message_id"])
+            self.bot.add_view(view, message_id=poll["message_id"])
+            self.start_timer(view)
+
+    async def cog_unload(self):
+        for task in self.timers.values():
+            task.cancel()
+        await poll_store.stop()
+        await poll_db.close()
+
+    async def can_create(self, interaction: discord.Interaction) -> bool:
+        if config.POLLONLYADMIN:
+            perms = interaction.user.guild_permissions
+            if not (perms.administrator or perms.manage_messages or perms.manage_guild):
+                await interaction.response.send_message("Only admins or moderators can create polls on this server.", ephemeral=True)
+                return False
+        return True
+
+    def start_timer(self, view: PollView):
+        task = self.bot.loop.create_task(view.start_timer())
+        self.timers[view.poll_id] = task
+        task.add_done_callback(lambda _: self.timers.pop(view.poll_id, None))
 
     @app_commands.command(
         name="poll",
@@ -139,11 +317,8 @@ class Polls(commands.Cog):
         option5_link: str = None,
         duration: str = "1m"
     ):
-        if config.POLLONLYADMIN:
-            perms = interaction.user.guild_permissions
-            if not (perms.administrator or perms.manage_messages or perms.manage_guild):
-                await interaction.response.send_message("Only admins or moderators can create polls on this server.", ephemeral=True)
-                return
+        if not await self.can_create(interaction):
+            return
 
         options = [o for o in [option1, option2, option3, option4, option5] if o]
         if len(options) < 2:
@@ -161,34 +336,77 @@ class Polls(commands.Cog):
             option5: option5_link if option5 and option5_link and is_url(option5_link) else None,
         }
 
-        try:
-            unit = duration[-1].lower()
-            time = int(duration[:-1])
-            if unit == "m":
-                seconds = time * 60
-            elif unit == "h":
-                seconds = time * 3600
-            elif unit == "d":
-                seconds = time * 86400
-            else:
-                await interaction.response.send_message(
-                    "Invalid duration format! Use `m` for minutes, `h` for hours, or `d` for days. Example: `10m`, `2h`, `1d`.",
-                    ephemeral=True
-                )
-                return
-        except (ValueError, IndexError):
+        seconds = parse_duration(duration)
+        if seconds is None:
             await interaction.response.send_message(
-                "Invalid duration format! Example: `10m`, `2h`, `1d`.",
+                "Invalid duration format! Use `m` for minutes, `h` for hours, or `d` for days. Example: `10m`, `2h`, `1d`.",
                 ephemeral=True
             )
             return
 
-        view = PollView(question, options, option_links, interaction.user, seconds)
+        end_time = discord.utils.utcnow().timestamp() + seconds
+        view = PollView(interaction.id, question, options, option_links, str(interaction.user), end_time)
         embed = view.build_results_embed()
         await interaction.response.send_message(embed=embed, view=view)
         message = await interaction.original_response()
         view.message = message
-        self.bot.loop.create_task(view.start_timer())
+        await poll_store.create(
+            view.poll_id, message.channel.id, message.id, "single", question, options, option_links, view.author, end_time
+        )
+        self.start_timer(view)
+
+    @app_commands.command(
+        name="choicepoll",
+        description="Create a multi-select or ranked-choice poll with up to 25 options."
+    )
+    @app_commands.guilds(discord.Object(id=config.GUILD_ID))
+    @app_commands.checks.has_permissions(manage_messages=True)
+    @app_commands.describe(
+        question="The poll question",
+        style="Multi-select lets voters pick several options; ranked choice runs an instant runoff",
+        options="Options separated by | (e.g. Red | Green | Blue)",
+        duration="Poll duration (e.g. 1m, 10m, 2h, 3d)"
+    )
+    @app_commands.choices(style=[
+        app_commands.Choice(name="Multi-select", value="multi"),
+        app_commands.Choice(name="Ranked choice", value="ranked"),
+    ])
+    async def choicepoll(
+        self,
+        interaction: discord.Interaction,
+        question: str,
+        style: app_commands.Choice[str],
+        options: str,
+        duration: str = "1h"
+    ):
+        if not await self.can_create(interaction):
+            return
+
+        choices = list(dict.fromkeys(o.strip() for o in options.split("|") if o.strip()))
+        if len(choices) < 2:
+            await interaction.response.send_message("You must provide at least two options, separated by `|`.", ephemeral=True)
+            return
+        if len(choices) > MAX_CHOICE_OPTIONS:
+            await interaction.response.send_message(f"Polls can have at most {MAX_CHOICE_OPTIONS} options.", ephemeral=True)
+            return
+
+        seconds = parse_duration(duration)
+        if seconds is None:
+            await interaction.response.send_message(
+                "Invalid duration format! Use `m` for minutes, `h` for hours, or `d` for days. Example: `10m`, `2h`, `1d`.",
+                ephemeral=True
+            )
+            return
+
+        end_time = discord.utils.utcnow().timestamp() + seconds
+        view = PollView(interaction.id, question, choices, {}, str(interaction.user), end_time, kind=style.value)
+        await interaction.response.send_message(embed=view.build_results_embed(), view=view)
+        message = await interaction.original_response()
+        view.message = message
+        await poll_store.create(
+            view.poll_id, message.channel.id, message.id, style.value, question, choices, {}, view.author, end_time
+        )
+        self.start_timer(view)
 
 async def setup(bot: commands.Bot):
     await bot.add_cog(Polls(bot))
\ No newline at end of file
@@ -2,21 +2,229 @@ import discord
 from discord import app_commands
 from discord.ext import commands
 import asyncio
+import time
+from collections import defaultdict
 import config
+from utils.storage import JsonStore
 
+STICKY_FILE = "sticky_notes.json"
+RECONCILE_HISTORY = 50  # recent messages checked for leftover copies on startup
+FLUSH_INTERVAL = 10
+
+# channel id (str) -> {"message", "message_id", "quiet", "every", "max_wait"}
+sticky_store = JsonStore(STICKY_FILE)
+# channel id -> the stored settings plus the live message and repost counters
 sticky_notes = {}
-locks = {}
+# Created once per channel and never replaced, so every path shares the same lock.
+locks = defaultdict(asyncio.Lock)
+# Channels whose note was reposted since the last save; only the message id changed.
+moved_notes: set[int] = set()
+
+def format_note(content: str) -> str:
+    return f"**⚠ Important Message Please Read ⚠**\n\n{content}"
+
+def repost_due(note: dict) -> float | None:
+    """When the pending repost should happen (monotonic time), or None to wait for more messages.
+
+    `quiet` reposts that many seconds after the last message, `every` reposts
+    once that many messages have arrived, and `max_wait` caps how long the
+    note can stay buried however busy the channel is.
+    """
+    if note["every"] and note["pending"] >= note["every"]:
+        return time.monotonic()
+    deadlines = []
+    if note["quiet"]:
+        deadlines.append(note["last_activity"] + note["quiet"])
+    if note["max_wait"]:
+        deadlines.append(note["first_pending"] + note["max_wait"])
+    if not note["every"] and not note["quiet"]:
+        # No debounce configured: repost after every message, as before.
+        deadlines.append(note["last_activity"])
+    return min(deadlines) if deadlines else None
+
+def new_note(content: str, quiet: int, every: int, max_wait: int, msg_obj=None) -> dict:
+    return {
+        "message": content,
+        "msg_obj": msg_obj,
+        "quiet": quiet,
+        "every": every,
+        "max_wait": max_wait,
+        "pending": 0,
+        "first_pending": 0.0,
+        "last_activity": 0.0,
+    }
+
+async def save_note(channel_id: int):
+    note = sticky_notes.get(channel_id)
+    moved_notes.discard(channel_id)
+    async with sticky_store.edit() as data:
+        if note is None:
+            data.pop(str(channel_id), None)
+        else:
+            data[str(channel_id)] = {
+                "message": note["message"],
+                "message_id": note["msg_obj"].id if note["msg_obj"] else None,
+                "quiet": note["quiet"],
+                "every": note["every"],
+                "max_wait": note["max_wait"],
+            }
+
+async def save_moved_notes():
+    """Write the latest message ids of reposted notes in one go.
+
+    Reposts are written behind because a busy channel can repost on every
+    message. If the bot stops before a flush, reconcile still finds the copy
+    by its content.
+    """
+    if not moved_notes:
+        return
+    channel_ids = list(moved_notes)
+    moved_notes.clear()
+    try:
+        async with sticky_store.edit() as data:
+            for channel_id in channel_ids:
+                note = sticky_notes.get(channel_id)
+                saved = data.get(str(channel_id))
+                if note and saved:
+                    saved["message_id"] = note["msg_obj"].id if note["msg_obj"] else None
+    except BaseException:
+        moved_notes.update(channel_ids)
+        raise
 
 class StickyNote(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        # One pending repost per channel; new messages only wake it up.
+        self.pending: dict[int, asyncio.Task] = {}
+        self.wakeups: dict[int, asyncio.Event] = {}
+
+    async def cog_load(self):
+        for channel_id, saved in sticky_store.snapshot().items():
+            note = new_note(saved["message"], saved.get("quiet", 0), saved.get("every", 0), saved.get("max_wait", 0))
+            if saved.get("message_id"):
+                note["msg_obj"] = self.bot.get_partial_messageable(int(channel_id)).get_partial_message(saved["message_id"])
+            sticky_notes[int(channel_id)] = note
+        self.bot.loop.create_task(self.reconcile_all())
+        self.flush_task = self.bot.loop.create_task(self.flush_loop())
+
+    async def cog_unload(self):
+        for task in self.pending.values():
+            task.cancel()
+        self.flush_task.cancel()
+        await save_moved_notes()
+
+    async def flush_loop(self):
+        while True:
+            await asyncio.sleep(FLUSH_INTERVAL)
+            try:
+                await save_moved_notes()
+            except Exception as e:
+                print(f"Failed to save sticky notes: {e}")
+
+    async def reconcile_all(self):
+        await self.bot.wait_until_ready()
+        for channel_id in list(sticky_notes):
+            try:
+                await self.reconcile(channel_id)
+            except discord.HTTPException as e:
+                print(f"Failed to restore sticky note in {channel_id}: {e}")
+
+    async def reconcile(self, channel_id: int):
+        """Leave exactly one copy of the note at the bottom of the channel after a restart."""
+        channel = self.bot.get_channel(channel_id)
+        if channel is None:
+            print(f"Sticky note channel {channel_id} no longer exists, removing its note.")
+            sticky_notes.pop(channel_id, None)
+            await save_note(channel_id)
+            return
+
+        async with locks[channel_id]:
+            note = sticky_notes.get(channel_id)
+            if note is None:
+                return
+            text = format_note(note["message"])
+            stored_id = note["msg_obj"].id if note["msg_obj"] else None
+            recent = [m async for m in channel.history(limit=RECONCILE_HISTORY)]
+            copies = [m for m in recent if m.author.id == self.bot.user.id and (m.id == stored_id or m.content == text)]
+
+            if recent and copies and recent[0].id == copies[0].id:
+                # Already at the bottom: keep it and remove older copies.
+                keep, stale = copies[0], copies[1:]
+            else:
+                keep, stale = None, copies
+            if stored_id and stored_id not in {m.id for m in copies}:
+                # Older than the history we scanned; delete it blind.
+                stale.append(note["msg_obj"])
+
+            for message in stale:
+                try:
+                    await message.delete()
+                except discord.NotFound:
+                    pass
+            note["msg_obj"] = keep or await channel.send(text)
+        await save_note(channel_id)
+
+    async def repost(self, channel: discord.abc.Messageable):
+        """Move the sticky note to the bottom of the channel."""
+        async with locks[channel.id]:
+            note = sticky_notes.get(channel.id)
+            if note is None:
+                return
+            # Messages that arrive while we're sending count towards the next repost.
+            note["pending"] = 0
+            if note["msg_obj"]:
+                try:
+                    await note["msg_obj"].delete()
+                except discord.NotFound:
+                    pass
+            note["msg_obj"] = await channel.send(format_note(note["message"]))
+            moved_notes.add(channel.id)
+
+    async def repost_when_due(self, channel: discord.abc.Messageable):
+        wakeup = self.wakeups[channel.id]
+        try:
+            while True:
+                note = sticky_notes.get(channel.id)
+                if note is None or not note["pending"]:
+                    return
+                due = repost_due(note)
+                delay = None if due is None else due - time.monotonic()
+                if delay is not None and delay <= 0:
+                    await self.repost(channel)
+                    continue
+                wakeup.clear()
+                try:
+                    await asyncio.wait_for(wakeup.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+        except discord.HTTPException as e:
+            print(f"Failed to repost sticky note in {channel.id}: {e}")
+        finally:
+            if self.pending.get(channel.id) is asyncio.current_task():
+                del self.pending[channel.id]
 
     @app_commands.command(name="stickynote", description="Set a sticky note in this channel")
     @app_commands.guilds(discord.Object(id=config.GUILD_ID))
     @app_commands.checks.has_permissions(manage_messages=True)
-    async def stickynote(self, interaction: discord.Interaction, content: str):
+    @app_commands.describe(
+        content="The note to keep at the bottom of the channel",
+        quiet_seconds="Repost once the channel has been quiet this long (default 0: repost after every message)",
+        every_messages="Repost after this many messages (0 to disable)",
+        max_wait_seconds="Never leave the note buried longer than this (0 for no limit)"
+    )
+    async def stickynote(
+        self,
+        interaction: discord.Interaction,
+        content: str,
+        quiet_seconds: int = 0,
+        every_messages: int = 0,
+        max_wait_seconds: int = 0
+    ):
+        if min(quiet_seconds, every_messages, max_wait_seconds) < 0:
+            await interaction.response.send_message("Repost settings can't be negative.", ephemeral=True)
+            return
+
         channel = interaction.channel
-        locks[channel.id] = asyncio.Lock()
 
         async with locks[channel.id]:
             if channel.id in sticky_notes and sticky_notes[channel.id]["msg_obj"]:
@@ -25,9 +233,9 @@ class StickyNote(commands.Cog):
                 except discord.NotFound:
                     pass
 
-            formatted_note = f"**⚠ Important Message Please Read ⚠**\n\n{content}"
-            msg = await channel.send(formatted_note)
-            sticky_notes[channel.id] = {"message": content, "msg_obj": msg}
+            msg = await channel.send(format_note(content))
+            sticky_notes[channel.id] = new_note(content, quiet_seconds, every_messages, max_wait_seconds, msg)
+        await save_note(channel.id)
 
         await interaction.response.send_message("Sticky note set!", ephemeral=True)
 
@@ -41,7 +249,11 @@ class StickyNote(commands.Cog):
             await interaction.response.send_message("No sticky note set in this channel.", ephemeral=True)
             return
 
-        async with locks.get(channel.id, asyncio.Lock()):
+        task = self.pending.pop(channel.id, None)
+        if task:
+            task.cancel()
+
+        async with locks[channel.id]:
             note = sticky_notes[channel.id]
             if note["msg_obj"]:
                 try:
@@ -50,6 +262,7 @@ class StickyNote(commands.Cog):
                     pass
 
             del sticky_notes[channel.id]
+        await save_note(channel.id)
 
         await interaction.response.send_message("Sticky note cleared!", ephemeral=True)
 
@@ -58,23 +271,19 @@ class StickyNote(commands.Cog):
         if message.author.bot:
             return
 
-        channel_id = message.channel.id
-
-        if channel_id in sticky_notes:
-            locks.setdefault(channel_id, asyncio.Lock())
-
-            async with locks[channel_id]:
-                note = sticky_notes[channel_id]
+        note = sticky_notes.get(message.channel.id)
+        if note is None:
+            return
 
-                if note["msg_obj"]:
-                    try:
-                        await note["msg_obj"].delete()
-                    except discord.NotFound:
-                        pass
+        now = time.monotonic()
+        if not note["pending"]:
+            note["first_pending"] = now
+        note["pending"] += 1
+        note["last_activity"] = now
 
-                formatted_note = f"**⚠ Important Message Please Read ⚠**\n\n{note['message']}"
-                new_msg = await message.channel.send(formatted_note)
-                sticky_notes[channel_id]["msg_obj"] = new_msg
+        self.wakeups.setdefault(message.channel.id, asyncio.Event()).set()
+        if message.channel.id not in self.pending:
+            self.pending[message.channel.id] = asyncio.create_task(self.repost_when_due(message.channel))
 
 async def setup(bot):
-    await bot.add_cog(StickyNote(bot))
\ No newline at end of file
+    await bot.add_cog(StickyNote(bot))
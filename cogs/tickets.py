@@ -1,28 +1,104 @@
 import discord
 from discord.ext import commands
 from discord import app_commands
-from datetime import datetime, timedelta
+from datetime import datetime, timezone
 import asyncio
+import io
 import json
 import os
-import io
+from functools import partial
+from typing import TypedDict
 import config
+from utils.storage import JsonStore
+from utils.database import Database
+from utils.ticket_registry import TicketRegistry, parse_ticket_channel_name
+from utils.transcripts import build_transcript, cleanup as cleanup_transcript
+from utils.ticket_archive import TicketArchive
+from utils.ticket_pool import TicketChannelPool
+from utils.ticket_claims import TicketClaims, TopicMirror, parse_claim_topic
+from utils.job_queue import Job, JobQueue
+from utils.ticket_inactivity import InactivityScheduler
+from utils.ticket_metrics import TicketMetrics, format_duration
 
 CONFIG_FILE = "ticket_config.json"
+TICKET_DB_FILE = "tickets.db"
+TICKET_ARCHIVE_FILE = "ticket_archive.db"
+TRANSCRIPT_DIR = "transcripts"
+CLOSE_WORKERS = 3
+SEARCH_PAGE_SIZE = 10
+POOL_CHECK_INTERVAL = 10
+ACTIVITY_SCAN_LIMIT = 50
 
 def slugify(name: str) -> str:
     return name.lower().replace(" ", "-")
 
-def load_ticket_config():
-    if not os.path.exists(CONFIG_FILE):
-        with open(CONFIG_FILE, "w") as f:
-            json.dump({}, f)
-    with open(CONFIG_FILE, "r") as f:
-        return json.load(f)
-
-def save_ticket_config(data):
-    with open(CONFIG_FILE, "w") as f:
-        json.dump(data, f, indent=4)
+class TicketSettings(TypedDict, total=False):
+    category_id: int | None
+    staff_roles: list[int]
+    description: str
+    require_reason: bool
+    close_permission: str
+    pool_size: int
+    pool_refill_seconds: int
+    inactivity_warn_hours: float
+    inactivity_close_hours: float
+
+class TicketConfigStore(JsonStore):
+    """Cached ticket_config.json. Reads never hit disk; use `edit()` to change it."""
+
+    def ticket_types(self) -> list[str]:
+        return list(self.snapshot().keys())
+
+    def get(self, ticket_type: str) -> TicketSettings | None:
+        return self.snapshot().get(ticket_type)
+
+    def items(self):
+        return self.snapshot().items()
+
+ticket_config = TicketConfigStore(CONFIG_FILE)
+ticket_db = Database(TICKET_DB_FILE)
+ticket_registry = TicketRegistry(ticket_db)
+ticket_pool = TicketChannelPool(ticket_db)
+ticket_claims = TicketClaims(ticket_db)
+topic_mirror = TopicMirror()
+close_queue = JobQueue(ticket_db, workers=CLOSE_WORKERS)
+
+def inactivity_policy(channel_id: int) -> tuple[float, float] | None:
+    ticket_type, settings = lookup_ticket(channel_id)
+    if not ticket_type:
+        return None
+    return settings.get("inactivity_warn_hours", 0) * 3600, settings.get("inactivity_close_hours", 0) * 3600
+
+inactivity = InactivityScheduler(ticket_db, inactivity_policy)
+ticket_metrics = TicketMetrics(ticket_db)
+archive_db = Database(TICKET_ARCHIVE_FILE)
+ticket_archive = TicketArchive(archive_db)
+pending_tickets: set[tuple[int, str]] = set()
+
+def ticket_slugs() -> dict[str, str]:
+    return {slugify(ticket_type): ticket_type for ticket_type in ticket_config.ticket_types()}
+
+def lookup_ticket(channel_id: int) -> tuple[str | None, TicketSettings | None]:
+    """Return (ticket type, settings) for an open ticket channel."""
+    record = ticket_registry.get(channel_id)
+    if not record:
+        return None, None
+    settings = ticket_config.get(record.ticket_type)
+    if settings is None:
+        return None, None
+    return record.ticket_type, settings
+
+def is_ticket_staff(member: discord.Member) -> bool:
+    if member.guild_permissions.administrator:
+        return True
+    staff_role_ids = {role_id for _, settings in ticket_config.items() for role_id in settings.get("staff_roles", [])}
+    return any(role.id in staff_role_ids for role in member.roles)
+
+def is_staff_for(member: discord.Member, settings: TicketSettings) -> bool:
+    return any(role.id in settings["staff_roles"] for role in member.roles)
+
+def claim_topic(user_id: int | None) -> str:
+    return f"claimed_by:{user_id}" if user_id else ""
 
 class TicketReasonModal(discord.ui.Modal, title="Ticket Reason"):
     reason = discord.ui.TextInput(
@@ -56,68 +132,144 @@ class CloseTicketReasonModal(discord.ui.Modal, title="Close Ticket"):
         self.channel = channel
 
     async def on_submit(self, interaction: discord.Interaction):
-        user = interaction.user
-        guild = interaction.guild
-
+        job = await queue_ticket_close(self.channel, interaction.user.id, self.reason.value, delay=5)
+        if job is None:
+            return await interaction.response.send_message("This ticket is already being closed.", ephemeral=True)
         await interaction.response.send_message("Closing ticket in 5 seconds...", ephemeral=True)
-        await discord.utils.sleep_until(datetime.utcnow() + timedelta(seconds=5))
-
-        transcript = io.StringIO()
-        async for message in self.channel.history(limit=None, oldest_first=True):
-            time = message.created_at.strftime("%Y-%m-%d %H:%M:%S")
-            author = f"{message.author} ({message.author.id})"
-            content = message.content
-            if message.attachments:
-                content += " " + " ".join([att.url for att in message.attachments])
-            transcript.write(f"[{time}] {author}: {content}\n")
 
-        transcript.seek(0)
-        file = discord.File(fp=transcript, filename=f"transcript-{self.channel.name}.txt")
+async def queue_ticket_close(channel: discord.TextChannel, closed_by_id: int, reason: str, delay: float = 0) -> Job | None:
+    """Queue the close pipeline for a ticket. Returns None if it is already queued."""
+    return await close_queue.enqueue("close_ticket", channel.id, {
+        "guild_id": channel.guild.id,
+        "channel_id": channel.id,
+        "channel_name": channel.name,
+        "closed_by": closed_by_id,
+        "reason": reason
+    }, delay=delay)
+
+async def process_close_job(bot: commands.Bot, job: Job):
+    """Close pipeline: transcript -> log -> delete.
+
+    Each step is checkpointed, so a retry or restart continues where the last
+    attempt stopped instead of posting the log twice.
+    """
+    p = job.payload
+    guild = bot.get_guild(p["guild_id"])
+    channel = guild.get_channel(p["channel_id"]) if guild else None
+    directory = os.path.join(TRANSCRIPT_DIR, str(p["channel_id"]))
+
+    if channel is None:
+        # Deleted by hand (or by an earlier attempt); there is nothing left to save.
+        ticket_metrics.closed(p["channel_id"], p["closed_by"], automatic=p["closed_by"] == bot.user.id)
+        await forget_ticket(p["channel_id"])
+        await cleanup_transcript(directory)
+        return
+
+    paths = p.get("paths", [])
+    # Only build once: a rebuilt transcript would restart the uploads and repost the log.
+    if job.step is None:
+        transcript = await build_transcript(channel, guild.filesize_limit, config.TICKET_TRANSCRIPT_HTML, directory)
+        record = ticket_registry.get(channel.id)
+        try:
+            await ticket_archive.archive(
+                transcript.spool_path,
+                channel.id,
+                channel.name,
+                record.ticket_type if record else None,
+                record.user_id if record else None,
+                p["closed_by"],
+                p["reason"],
+                record.opened_at if record else None
+            )
+        except Exception as e:
+            print(f"Failed to archive {channel.name}: {e}")
+        paths = transcript.paths
+        await job.checkpoint("transcript", paths=paths, posted=0)
 
+    if job.step == "transcript":
         log_channel = guild.get_channel(config.TICKET_LOG_CHANNEL_ID)
         if log_channel:
-            embed = discord.Embed(
-            title="Ticket Closed",
-            description=f"Ticket **{self.channel.name}** has been closed.",
-            color=discord.Color.red(),
-            timestamp=datetime.utcnow()
-        )
-        embed.add_field(name="Closed By", value=user.mention, inline=True)
-        embed.add_field(name="Reason", value=self.reason.value, inline=False)
-        embed.add_field(name="Ticket Channel", value=self.channel.name, inline=True)
-        embed.set_footer(text=f"User ID: {user.id}")
-
-        await log_channel.send(embed=embed, file=file)
-
-        await self.channel.delete()
+            # One file per message so each upload stays under the guild limit.
+            for index in range(p.get("posted", 0), len(paths)):
+                if os.path.exists(paths[index]):
+                    file = discord.File(paths[index])
+                else:
+                    print(f"Transcript part {index + 1} of {p['channel_name']} is missing; posting the log without it.")
+                    file = None
+                if index == 0:
+                    embed = discord.Embed(
+                        title="Ticket Closed",
+                        description=f"Ticket **{p['channel_name']}** has been closed.",
+                        color=discord.Color.red(),
+                        timestamp=datetime.utcnow()
+                    )
+                    embed.add_field(name="Closed By", value=f"<@{p['closed_by']}>", inline=True)
+                    embed.add_field(name="Reason", value=p["reason"], inline=False)
+                    embed.add_field(name="Ticket Channel", value=p["channel_name"], inline=True)
+                    embed.set_footer(text=f"User ID: {p['closed_by']}")
+                    await log_channel.send(embed=embed, file=file)
+                elif file:
+                    await log_channel.send(file=file)
+                await job.checkpoint("transcript", posted=index + 1)
+        await job.checkpoint("logged")
+
+    # Recorded before the delete so the channel delete event can't beat us to it.
+    ticket_metrics.closed(channel.id, p["closed_by"], automatic=p["closed_by"] == bot.user.id)
+    try:
+        await channel.delete()
+    except discord.NotFound:
+        pass
+    await forget_ticket(channel.id)
+    await cleanup_transcript(directory)
+
+async def last_member_message_time(channel: discord.TextChannel, since: float) -> float | None:
+    """Time of the newest non-bot message after `since`, or None.
+
+    History is only read when the channel has a message newer than `since`,
+    so tickets that were quiet while the bot was offline cost nothing.
+    """
+    last_id = channel.last_message_id
+    if not last_id or discord.utils.snowflake_time(last_id).timestamp() <= since:
+        return None
+    try:
+        async for message in channel.history(limit=ACTIVITY_SCAN_LIMIT):
+            sent_at = message.created_at.timestamp()
+            if sent_at <= since:
+                break
+            if not message.author.bot:
+                return sent_at
+    except discord.HTTPException as e:
+        print(f"Failed to read history of {channel.name}: {e}")
+    return None
+
+async def forget_ticket(channel_id: int):
+    """Drop a ticket's local state. Callers record the close in ticket_metrics themselves."""
+    inactivity.forget(channel_id)
+    await ticket_registry.remove(channel_id)
+    await ticket_claims.forget(channel_id)
+    topic_mirror.forget(channel_id)
 
 async def create_ticket(interaction: discord.Interaction, ticket_type: str, settings: dict, reason_text: str | None):
     guild = interaction.guild
     user = interaction.user
 
-    existing = discord.utils.get(guild.text_channels, name=f"{ticket_type}-{user.id}")
+    key = (user.id, ticket_type)
+    existing_id = ticket_registry.find(user.id, ticket_type)
+    existing = guild.get_channel(existing_id) if existing_id else None
     if existing:
         return await interaction.response.send_message(
             f"You already have an open {ticket_type} ticket: {existing.mention}", ephemeral=True
         )
+    if key in pending_tickets:
+        return await interaction.response.send_message(
+            f"Your {ticket_type} ticket is already being created.", ephemeral=True
+        )
 
-    category = guild.get_channel(settings["category_id"]) if settings["category_id"] else None
-
-    overwrites = {
-        guild.default_role: discord.PermissionOverwrite(view_channel=False),
-        user: discord.PermissionOverwrite(view_channel=True, send_messages=True, read_message_history=True),
-    }
-    for role_id in settings["staff_roles"]:
-        role = guild.get_role(role_id)
-        if role:
-            overwrites[role] = discord.PermissionOverwrite(view_channel=True, send_messages=True)
-
-    channel = await guild.create_text_channel(
-        name=f"{slugify(ticket_type)}-{user.id}",
-        overwrites=overwrites,
-        category=category,
-        reason=f"{ticket_type.capitalize()} ticket opened by {user}"
-    )
+    pending_tickets.add(key)
+    try:
+        channel = await open_ticket_channel(guild, user, ticket_type, settings)
+    finally:
+        pending_tickets.discard(key)
 
     description = f"{user.mention} created a **{ticket_type}** ticket.\nA staff member will be with you shortly."
     if reason_text:
@@ -140,16 +292,126 @@ async def create_ticket(interaction: discord.Interaction, ticket_type: str, sett
         ephemeral=True
     )
 
+def ticket_overwrites(guild: discord.Guild, settings: TicketSettings, user: discord.Member | None = None) -> dict:
+    overwrites = {
+        guild.default_role: discord.PermissionOverwrite(view_channel=False),
+    }
+    if user:
+        overwrites[user] = discord.PermissionOverwrite(view_channel=True, send_messages=True, read_message_history=True)
+    for role_id in settings["staff_roles"]:
+        role = guild.get_role(role_id)
+        if role:
+            overwrites[role] = discord.PermissionOverwrite(view_channel=True, send_messages=True)
+    return overwrites
+
+async def open_ticket_channel(guild: discord.Guild, user: discord.Member, ticket_type: str, settings: TicketSettings) -> discord.TextChannel:
+    category = guild.get_channel(settings["category_id"]) if settings["category_id"] else None
+    name = f"{slugify(ticket_type)}-{user.id}"
+    reason = f"{ticket_type.capitalize()} ticket opened by {user}"
+    overwrites = ticket_overwrites(guild, settings, user)
+
+    channel = None
+    if settings.get("pool_size", 0) > 0:
+        channel = await take_pooled_channel(guild, ticket_type)
+    if channel:
+        # Name, category and overwrites go out in a single PATCH.
+        try:
+            await channel.edit(name=name, overwrites=overwrites, category=category, reason=reason)
+        except discord.HTTPException as e:
+            print(f"Failed to use pooled channel {channel.id} for a {ticket_type} ticket: {e}")
+            await release_pooled_channel(channel, ticket_type)
+            channel = None
+    if channel is None:
+        channel = await guild.create_text_channel(
+            name=name,
+            overwrites=overwrites,
+            category=category,
+            reason=reason
+        )
+    await ticket_registry.add(channel.id, user.id, ticket_type)
+    inactivity.track(channel.id)
+    ticket_metrics.opened(channel.id, ticket_type)
+    return channel
+
+async def take_pooled_channel(guild: discord.Guild, ticket_type: str) -> discord.TextChannel | None:
+    while True:
+        channel_id = await ticket_pool.take(ticket_type)
+        if channel_id is None:
+            return None
+        channel = guild.get_channel(channel_id)
+        if isinstance(channel, discord.TextChannel):
+            return channel
+
+async def release_pooled_channel(channel: discord.TextChannel, ticket_type: str):
+    """Get rid of a pooled channel that couldn't be turned into a ticket, so it isn't left untracked."""
+    try:
+        await channel.delete(reason="Pooled ticket channel could not be set up")
+    except discord.NotFound:
+        pass
+    except discord.HTTPException:
+        # Still a clean pool channel: hand it back rather than orphan it.
+        await ticket_pool.add(ticket_type, channel.id)
+
+async def fill_ticket_pool(guild: discord.Guild):
+    """Create at most one pooled channel per ticket type whose pool is below size and due."""
+    for ticket_type, settings in list(ticket_config.items()):
+        pool_size = settings.get("pool_size", 0)
+        if pool_size <= 0 or not ticket_pool.due(ticket_type, pool_size, settings.get("pool_refill_seconds", 60)):
+            continue
+        category = guild.get_channel(settings["category_id"]) if settings["category_id"] else None
+        try:
+            channel = await guild.create_text_channel(
+                name=f"pool-{slugify(ticket_type)}",
+                overwrites=ticket_overwrites(guild, settings),
+                category=category,
+                reason=f"Pre-created {ticket_type} ticket channel"
+            )
+        except discord.HTTPException as e:
+            print(f"Failed to pre-create {ticket_type} ticket channel: {e}")
+            continue
+        await ticket_pool.add(ticket_type, channel.id)
+
+async def warn_inactive_ticket(bot: commands.Bot, channel_id: int):
+    channel = bot.get_channel(channel_id)
+    ticket_type, settings = lookup_ticket(channel_id)
+    if not channel or not ticket_type:
+        return
+    description = f"This ticket has had no activity for {settings.get('inactivity_warn_hours', 0):g} hours."
+    if settings.get("inactivity_close_hours", 0):
+        description += f"\nIt will be closed automatically after {settings['inactivity_close_hours']:g} hours without a reply."
+    embed = discord.Embed(title="Inactive Ticket", description=description, color=config.EMBED_COLOR)
+    await channel.send(embed=embed)
+
+async def close_inactive_ticket(bot: commands.Bot, channel_id: int):
+    channel = bot.get_channel(channel_id)
+    ticket_type, settings = lookup_ticket(channel_id)
+    if not channel or not ticket_type:
+        return
+    reason = f"Closed automatically after {settings.get('inactivity_close_hours', 0):g} hours of inactivity."
+    await queue_ticket_close(channel, bot.user.id, reason)
+
+def config_embed(ticket_type: str, ticket_data: TicketSettings) -> discord.Embed:
+    return discord.Embed(
+        title=f"Config: {ticket_type.capitalize()}",
+        description=f"**Description:** {ticket_data['description']}\n"
+                    f"**Category:** {ticket_data['category_id']}\n"
+                    f"**Staff Roles:** {', '.join([str(r) for r in ticket_data['staff_roles']]) or 'None'}\n"
+                    f"**Channel Pool:** size {ticket_data.get('pool_size', 0)}, "
+                    f"refill every {ticket_data.get('pool_refill_seconds', 60)}s ({ticket_pool.stats(ticket_type)})\n"
+                    f"**Inactivity:** warn after {ticket_data.get('inactivity_warn_hours', 0) or 'never'}h, "
+                    f"close after {ticket_data.get('inactivity_close_hours', 0) or 'never'}h",
+        color=config.EMBED_COLOR
+    )
+
 class TicketTypeDropdown(discord.ui.Select):
     def __init__(self):
-        data = load_ticket_config()
         options = [
             discord.SelectOption(
                 label=ticket_type.capitalize(),
                 description=settings["description"],
                 value=ticket_type
             )
-            for ticket_type, settings in data.items()
+            for ticket_type, settings in ticket_config.items()
         ]
 
         if not options:
@@ -168,8 +430,9 @@ class TicketTypeDropdown(discord.ui.Select):
         if ticket_type == "none":
             return await interaction.response.send_message("No ticket types are available. Please ask staff.", ephemeral=True)
 
-        data = load_ticket_config()
-        settings = data[ticket_type]
+        settings = ticket_config.get(ticket_type)
+        if settings is None:
+            return await interaction.response.send_message("That ticket type no longer exists.", ephemeral=True)
 
         if settings.get("require_reason", False):
             modal = TicketReasonModal(ticket_type, settings)
@@ -192,35 +455,24 @@ class ClaimTicketView(discord.ui.View):
         guild = interaction.guild
         user = interaction.user
 
-        data = load_ticket_config()
-        ticket_type = None
-        for ttype, settings in data.items():
-            if channel.name.startswith(slugify(ttype)):
-                ticket_type = ttype
-                break
-
+        ticket_type, settings = lookup_ticket(channel.id)
         if not ticket_type:
             return await interaction.response.send_message("Could not identify ticket type.", ephemeral=True)
 
-        settings = data[ticket_type]
-
         staff_roles = [guild.get_role(r) for r in settings["staff_roles"]]
         if not any(r in user.roles for r in staff_roles if r):
             return await interaction.response.send_message("You don’t have permission to claim this ticket.", ephemeral=True)
 
-        if channel.topic and "claimed_by:" in channel.topic:
-            try:
-                claimed_id = int(channel.topic.split("claimed_by:")[1].strip())
-                claimed_user = guild.get_member(claimed_id)
-            except ValueError:
-                claimed_user = None
-
+        if not await ticket_claims.claim(channel.id, user.id):
+            claim = ticket_claims.get(channel.id)
+            claimed_user = guild.get_member(claim.claimed_by) if claim else None
             return await interaction.response.send_message(
                 f"This ticket is already claimed by {claimed_user.mention if claimed_user else 'someone'}.",
                 ephemeral=True
             )
 
-        await channel.edit(topic=f"claimed_by:{user.id}")
+        topic_mirror.update(channel, claim_topic(user.id))
+        ticket_metrics.claimed(channel.id, user.id)
 
         embed = discord.Embed(
             title=f"{ticket_type.capitalize()} Ticket",
@@ -241,17 +493,10 @@ class CloseTicketView(discord.ui.View):
         guild = interaction.guild
         user = interaction.user
 
-        data = load_ticket_config()
-        ticket_type = None
-        for ttype, settings in data.items():
-            if channel.name.startswith(slugify(ttype)):
-                ticket_type = ttype
-                break
-
+        ticket_type, settings = lookup_ticket(channel.id)
         if not ticket_type:
             return await interaction.response.send_message("Could not identify ticket type.", ephemeral=True)
 
-        settings = data[ticket_type]
         close_permission = settings.get("close_permission", "staff")
 
         if close_permission == "staff":
@@ -276,26 +521,28 @@ class TicketAdminView(discord.ui.View):
         msg = await interaction.client.wait_for("message", check=check)
         ticket_name = msg.content.lower()
 
-        data = load_ticket_config()
-        if ticket_name in data:
+        if ticket_config.get(ticket_name) is not None:
             return await interaction.followup.send("That ticket type already exists!", ephemeral=True)
 
-        data[ticket_name] = {
-            "category_id": None,
-            "staff_roles": [],
-            "description": "New ticket type",
-            "require_reason": False,
-            "close_permission": "staff"
-        }
-        save_ticket_config(data)
+        async with ticket_config.edit() as data:
+            data[ticket_name] = {
+                "category_id": None,
+                "staff_roles": [],
+                "description": "New ticket type",
+                "require_reason": False,
+                "close_permission": "staff",
+                "pool_size": 0,
+                "pool_refill_seconds": 60,
+                "inactivity_warn_hours": 0,
+                "inactivity_close_hours": 0
+            }
 
         await interaction.followup.send(f"Ticket type `{ticket_name}` created!", ephemeral=True)
 
     @discord.ui.button(label="Remove Ticket Type", style=discord.ButtonStyle.red, custom_id="remove_ticket_type")
     async def remove_ticket_type(self, interaction: discord.Interaction, button: discord.ui.Button):
-        data = load_ticket_config()
         options = [
-            discord.SelectOption(label=name, value=name) for name in data.keys()
+            discord.SelectOption(label=name, value=name) for name in ticket_config.ticket_types()
         ]
         if not options:
             return await interaction.response.send_message("No ticket types available.", ephemeral=True)
@@ -304,8 +551,8 @@ class TicketAdminView(discord.ui.View):
 
         async def select_callback(i: discord.Interaction):
             ticket = select.values[0]
-            del data[ticket]
-            save_ticket_config(data)
+            async with ticket_config.edit() as data:
+                data.pop(ticket, None)
             await i.response.send_message(f"Removed ticket type `{ticket}`.", ephemeral=True)
 
         select.callback = select_callback
@@ -315,9 +562,8 @@ class TicketAdminView(discord.ui.View):
 
     @discord.ui.button(label="Configure Ticket Type", style=discord.ButtonStyle.blurple, custom_id="config_ticket_type")
     async def configure_ticket_type(self, interaction: discord.Interaction, button: discord.ui.Button):
-        data = load_ticket_config()
         options = [
-            discord.SelectOption(label=name, value=name) for name in data.keys()
+            discord.SelectOption(label=name, value=name) for name in ticket_config.ticket_types()
         ]
         if not options:
             return await interaction.response.send_message("No ticket types available.", ephemeral=True)
@@ -326,15 +572,11 @@ class TicketAdminView(discord.ui.View):
 
         async def select_callback(i: discord.Interaction):
             ticket = select.values[0]
-            ticket_data = data[ticket]
-
-            embed = discord.Embed(
-                title=f"Config: {ticket.capitalize()}",
-                description=f"**Description:** {ticket_data['description']}\n"
-                            f"**Category:** {ticket_data['category_id']}\n"
-                            f"**Staff Roles:** {', '.join([str(r) for r in ticket_data['staff_roles']]) or 'None'}",
-                color=config.EMBED_COLOR
-            )
+            ticket_data = ticket_config.get(ticket)
+            if ticket_data is None:
+                return await i.response.send_message("That ticket type no longer exists.", ephemeral=True)
+
+            embed = config_embed(ticket, ticket_data)
             view = TicketConfigView(ticket)
             await i.response.send_message(embed=embed, view=view)
 
@@ -350,7 +592,6 @@ class TicketConfigView(discord.ui.View):
 
     @discord.ui.button(label="Set Category", style=discord.ButtonStyle.gray, custom_id="set_category")
     async def set_category(self, interaction: discord.Interaction, button: discord.ui.Button):
-        data = load_ticket_config()
         await interaction.response.send_message(
             "Please enter the **category ID** you want to set for this ticket type.\n"
             "To get a category ID: enable Developer Mode → right-click the category → Copy ID.",
@@ -368,8 +609,8 @@ class TicketConfigView(discord.ui.View):
             if not category or category.type != discord.ChannelType.category:
                 return await interaction.followup.send("That ID does not belong to a valid category.", ephemeral=True)
 
-            data[self.ticket_type]["category_id"] = category_id
-            save_ticket_config(data)
+            async with ticket_config.edit() as data:
+                data[self.ticket_type]["category_id"] = category_id
             await interaction.followup.send(f"Category set to **{category.name}**", ephemeral=True)
 
         except ValueError:
@@ -377,7 +618,6 @@ class TicketConfigView(discord.ui.View):
 
     @discord.ui.button(label="Set Staff Roles", style=discord.ButtonStyle.gray, custom_id="set_roles")
     async def set_roles(self, interaction: discord.Interaction, button: discord.ui.Button):
-        data = load_ticket_config()
         await interaction.response.send_message("Mention the staff roles allowed to access this ticket type:", ephemeral=True)
 
         def check(m):
@@ -388,13 +628,12 @@ class TicketConfigView(discord.ui.View):
         if not role_ids:
             return await interaction.followup.send("You must mention at least one role.", ephemeral=True)
 
-        data[self.ticket_type]["staff_roles"] = role_ids
-        save_ticket_config(data)
+        async with ticket_config.edit() as data:
+            data[self.ticket_type]["staff_roles"] = role_ids
         await interaction.followup.send("Staff roles updated!", ephemeral=True)
 
     @discord.ui.button(label="Set Description", style=discord.ButtonStyle.gray, custom_id="set_description")
     async def set_description(self, interaction: discord.Interaction, button: discord.ui.Button):
-        data = load_ticket_config()
         await interaction.response.send_message("Enter a description for this ticket type:")
 
         def check(m):
@@ -402,29 +641,20 @@ class TicketConfigView(discord.ui.View):
 
         msg = await interaction.client.wait_for("message", check=check)
 
-        data[self.ticket_type]["description"] = msg.content
-        save_ticket_config(data)
+        async with ticket_config.edit() as data:
+            data[self.ticket_type]["description"] = msg.content
 
-        ticket_data = data[self.ticket_type]
-        embed = discord.Embed(
-            title=f"Config: {self.ticket_type.capitalize()}",
-            description=f"**Description:** {ticket_data['description']}\n"
-                        f"**Category:** {ticket_data['category_id']}\n"
-                        f"**Staff Roles:** {', '.join([str(r) for r in ticket_data['staff_roles']]) or 'None'}",
-            color=config.EMBED_COLOR
-        )
+        embed = config_embed(self.ticket_type, ticket_config.get(self.ticket_type))
 
         await interaction.message.edit(embed=embed, view=self)
         await interaction.followup.send("Description updated!", ephemeral=True)
 
     @discord.ui.button(label="Toggle Close Permission", style=discord.ButtonStyle.gray, custom_id="toggle_close_permission")
     async def toggle_close_permission(self, interaction: discord.Interaction, button: discord.ui.Button):
-        data = load_ticket_config()
-        current = data[self.ticket_type].get("close_permission", "staff")
-
-        new_value = "anyone" if current == "staff" else "staff"
-        data[self.ticket_type]["close_permission"] = new_value
-        save_ticket_config(data)
+        async with ticket_config.edit() as data:
+            current = data[self.ticket_type].get("close_permission", "staff")
+            new_value = "anyone" if current == "staff" else "staff"
+            data[self.ticket_type]["close_permission"] = new_value
 
         await interaction.response.send_message(
             f"Close permission set to **{new_value}** for `{self.ticket_type}`.",
@@ -433,18 +663,167 @@ class TicketConfigView(discord.ui.View):
 
     @discord.ui.button(label="Toggle Require Reason", style=discord.ButtonStyle.gray, custom_id="toggle_reason")
     async def toggle_reason(self, interaction: discord.Interaction, button: discord.ui.Button):
-        data = load_ticket_config()
-        current = data[self.ticket_type].get("require_reason", False)
-        data[self.ticket_type]["require_reason"] = not current
-        save_ticket_config(data)
+        async with ticket_config.edit() as data:
+            current = data[self.ticket_type].get("require_reason", False)
+            data[self.ticket_type]["require_reason"] = not current
 
         state = "enabled" if not current else "disabled"
         await interaction.response.send_message(f"Require reason has been **{state}** for `{self.ticket_type}`.", ephemeral=True)
 
+class TicketSearchView(discord.ui.View):
+    def __init__(self, author: discord.abc.User, filters: dict):
+        super().__init__(timeout=300)
+        self.author = author
+        self.filters = filters
+        self.page = 0
+        self.has_more = False
+
+    async def build_embed(self) -> discord.Embed:
+        results, self.has_more = await ticket_archive.search(
+            **self.filters, limit=SEARCH_PAGE_SIZE, offset=self.page * SEARCH_PAGE_SIZE
+        )
+        self.previous_page.disabled = self.page == 0
+        self.next_page.disabled = not self.has_more
+
+        embed = discord.Embed(title="Ticket Archive Search", color=config.EMBED_COLOR)
+        if not results:
+            embed.description = "No archived messages matched your search."
+        else:
+            lines = []
+            for result in results:
+                content = result.content if len(result.content) <= 200 else result.content[:197] + "..."
+                lines.append(
+                    f"**#{result.channel_name}** ({result.ticket_type or 'unknown'}) · <t:{int(result.created_at)}:f>\n"
+                    f"<@{result.author_id}> `{result.author_name}`: {content or '*no text*'}"
+                )
+            embed.description = "\n\n".join(lines)
+        embed.set_footer(text=f"Page {self.page + 1}")
+        return embed
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        return interaction.user.id == self.author.id
+
+    @discord.ui.button(label="Previous", style=discord.ButtonStyle.gray)
+    async def previous_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        self.page = max(0, self.page - 1)
+        await interaction.response.edit_message(embed=await self.build_embed(), view=self)
+
+    @discord.ui.button(label="Next", style=discord.ButtonStyle.gray)
+    async def next_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        self.page += 1
+        await interaction.response.edit_message(embed=await self.build_embed(), view=self)
+
+def stats_line(metric: str, scope: str, key="") -> str:
+    summary = ticket_metrics.histogram(metric, scope, key).summary()
+    if not summary["count"]:
+        return "no data"
+    return (
+        f"p50 {format_duration(summary['p50'])} · p90 {format_duration(summary['p90'])} · "
+        f"p99 {format_duration(summary['p99'])} ({summary['count']} tickets)"
+    )
+
+def parse_date(value: str) -> float:
+    return datetime.strptime(value, "%Y-%m-%d").replace(tzinfo=timezone.utc).timestamp()
+
 class Tickets(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
 
+    async def cog_load(self):
+        ticket_config.start_watching()
+        await ticket_registry.load()
+        await ticket_pool.load()
+        await ticket_claims.load()
+        await ticket_archive.setup()
+        close_queue.register("close_ticket", partial(process_close_job, self.bot))
+        await close_queue.start()
+        await inactivity.load()
+        await ticket_metrics.load()
+        ticket_metrics.start()
+        inactivity.on_warn = partial(warn_inactive_ticket, self.bot)
+        inactivity.on_close = partial(close_inactive_ticket, self.bot)
+        inactivity.start()
+        self.bot.loop.create_task(self.rebuild_registry())
+        self.pool_task = self.bot.loop.create_task(self.pool_refill_loop())
+
+    async def cog_unload(self):
+        ticket_config.stop_watching()
+        self.pool_task.cancel()
+        topic_mirror.cancel_all()
+        await close_queue.stop()
+        await inactivity.stop()
+        await ticket_metrics.stop()
+        await ticket_db.close()
+        await archive_db.close()
+
+    async def rebuild_registry(self):
+        await self.bot.wait_until_ready()
+        guild = self.bot.get_guild(config.GUILD_ID)
+        if not guild:
+            return
+        # All text channels: a type may have no category, or staff may have moved it.
+        removed = await ticket_registry.rebuild(guild.text_channels, ticket_slugs())
+        # Channels deleted while the bot was offline never got a delete event.
+        for channel_id in removed:
+            ticket_metrics.closed(channel_id, None)
+            await forget_ticket(channel_id)
+        print(f"Ticket registry rebuilt ({len(ticket_registry)} open tickets, {len(removed)} removed).")
+        for channel_ids in ticket_registry.duplicates():
+            print(f"Duplicate tickets for one owner and type: {', '.join(str(cid) for cid in channel_ids)}")
+
+        # Tickets claimed before claims were stored locally only have the topic.
+        for record in ticket_registry:
+            channel = guild.get_channel(record.channel_id)
+            claimed_by = parse_claim_topic(channel.topic) if channel else None
+            if claimed_by and not ticket_claims.get(record.channel_id):
+                await ticket_claims.claim(record.channel_id, claimed_by)
+
+        # Bot messages (warnings, claim embeds) don't count as activity, same as on_message.
+        for record in ticket_registry:
+            ticket_metrics.opened(record.channel_id, record.ticket_type, record.opened_at)
+            channel = guild.get_channel(record.channel_id)
+            if channel:
+                since = inactivity.last_activity(record.channel_id) or record.opened_at
+                last = await last_member_message_time(channel, since)
+                inactivity.track(record.channel_id, last or since)
+
+        for channel_id in ticket_pool.channel_ids():
+            if guild.get_channel(channel_id) is None:
+                await ticket_pool.discard(channel_id)
+
+    async def pool_refill_loop(self):
+        await self.bot.wait_until_ready()
+        while True:
+            guild = self.bot.get_guild(config.GUILD_ID)
+            if guild:
+                await fill_ticket_pool(guild)
+            await asyncio.sleep(POOL_CHECK_INTERVAL)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_create(self, channel: discord.abc.GuildChannel):
+        if not isinstance(channel, discord.TextChannel):
+            return
+        if ticket_registry.get(channel.id):
+            return
+        parsed = parse_ticket_channel_name(channel.name, ticket_slugs())
+        if parsed:
+            ticket_type, user_id = parsed
+            await ticket_registry.add(channel.id, user_id, ticket_type, channel.created_at.timestamp())
+            inactivity.track(channel.id, channel.created_at.timestamp())
+            ticket_metrics.opened(channel.id, ticket_type, channel.created_at.timestamp())
+
+    @commands.Cog.listener()
+    async def on_message(self, message: discord.Message):
+        if message.author.bot or not ticket_registry.get(message.channel.id):
+            return
+        inactivity.touch(message.channel.id, message.created_at.timestamp())
+
+    @commands.Cog.listener()
+    async def on_guild_channel_delete(self, channel: discord.abc.GuildChannel):
+        ticket_metrics.closed(channel.id, None)
+        await forget_ticket(channel.id)
+        await ticket_pool.discard(channel.id)
+
     @commands.Cog.listener()
     async def on_ready(self):
         print("Ticket system loaded.")
@@ -472,7 +851,6 @@ class Tickets(commands.Cog):
         if not interaction.user.guild_permissions.administrator:
             return await interaction.response.send_message("You don't have permission to use this.", ephemeral=True)
 
-        data = load_ticket_config()
         embed = discord.Embed(
             title="Ticket Admin Panel",
             description="Use the buttons below to manage ticket types, staff roles, and categories.",
@@ -480,6 +858,174 @@ class Tickets(commands.Cog):
         )
         await interaction.response.send_message(embed=embed, view=TicketAdminView())
 
+    @app_commands.command(name="ticketunclaim", description="Release your claim on this ticket")
+    async def ticket_unclaim(self, interaction: discord.Interaction):
+        channel = interaction.channel
+        user = interaction.user
+
+        ticket_type, settings = lookup_ticket(channel.id)
+        if not ticket_type:
+            return await interaction.response.send_message("This is not a ticket channel.", ephemeral=True)
+
+        claim = ticket_claims.get(channel.id)
+        if not claim:
+            return await interaction.response.send_message("This ticket is not claimed.", ephemeral=True)
+        if claim.claimed_by != user.id and not user.guild_permissions.administrator:
+            return await interaction.response.send_message("Only the staff member who claimed this ticket can unclaim it.", ephemeral=True)
+
+        await ticket_claims.unclaim(channel.id, user.id)
+        topic_mirror.update(channel, claim_topic(None))
+
+        embed = discord.Embed(
+            title=f"{ticket_type.capitalize()} Ticket",
+            description=f"{channel.mention} has been unclaimed by {user.mention}.",
+            color=config.EMBED_COLOR
+        )
+        await interaction.response.send_message(embed=embed)
+
+    @app_commands.command(name="tickettransfer", description="Transfer this ticket to another staff member")
+    @app_commands.describe(member="The staff member who should own this ticket")
+    async def ticket_transfer(self, interaction: discord.Interaction, member: discord.Member):
+        channel = interaction.channel
+        user = interaction.user
+
+        ticket_type, settings = lookup_ticket(channel.id)
+        if not ticket_type:
+            return await interaction.response.send_message("This is not a ticket channel.", ephemeral=True)
+
+        claim = ticket_claims.get(channel.id)
+        if claim and claim.claimed_by != user.id and not user.guild_permissions.administrator:
+            return await interaction.response.send_message("Only the staff member who claimed this ticket can transfer it.", ephemeral=True)
+        if not claim and not is_staff_for(user, settings):
+            return await interaction.response.send_message("You don't have permission to transfer this ticket.", ephemeral=True)
+        if not is_staff_for(member, settings):
+            return await interaction.response.send_message(f"{member.mention} is not staff for this ticket type.", ephemeral=True)
+
+        await ticket_claims.transfer(channel.id, user.id, member.id)
+        topic_mirror.update(channel, claim_topic(member.id))
+        ticket_metrics.claimed(channel.id, member.id)
+
+        embed = discord.Embed(
+            title=f"{ticket_type.capitalize()} Ticket",
+            description=f"{channel.mention} has been transferred to {member.mention} by {user.mention}.",
+            color=config.EMBED_COLOR
+        )
+        await interaction.response.send_message(embed=embed)
+
+    @app_commands.command(name="tickethistory", description="Show the claim history of this ticket")
+    async def ticket_history(self, interaction: discord.Interaction):
+        channel = interaction.channel
+        if not is_ticket_staff(interaction.user):
+            return await interaction.response.send_message("You don't have permission to use this.", ephemeral=True)
+
+        events = await ticket_claims.history(channel.id)
+        if not events:
+            return await interaction.response.send_message("No claim history for this channel.", ephemeral=True)
+
+        lines = []
+        for event in events[-20:]:
+            if event.action == "claim":
+                lines.append(f"<t:{int(event.at)}:f> <@{event.actor_id}> claimed")
+            elif event.action == "unclaim":
+                lines.append(f"<t:{int(event.at)}:f> <@{event.actor_id}> unclaimed (was <@{event.target_id}>)")
+            else:
+                lines.append(f"<t:{int(event.at)}:f> <@{event.actor_id}> transferred to <@{event.target_id}>")
+
+        embed = discord.Embed(title="Claim History", description="\n".join(lines), color=config.EMBED_COLOR)
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
+    @app_commands.command(name="ticketstats", description="Show how long tickets wait to be claimed and closed")
+    @app_commands.describe(
+        ticket_type="Only this ticket type",
+        staff="Only tickets handled by this staff member",
+        export="Attach all stats as a JSON file"
+    )
+    async def ticket_stats(
+        self,
+        interaction: discord.Interaction,
+        ticket_type: str = None,
+        staff: discord.Member = None,
+        export: bool = False
+    ):
+        if not is_ticket_staff(interaction.user):
+            return await interaction.response.send_message("You don't have permission to use this.", ephemeral=True)
+
+        embed = discord.Embed(title="Ticket Stats", color=config.EMBED_COLOR)
+        if staff:
+            embed.description = f"Tickets handled by {staff.mention}"
+            embed.add_field(name="Time to claim", value=stats_line("time_to_claim", "staff", staff.id), inline=False)
+            embed.add_field(name="Time to close", value=stats_line("time_to_close", "staff", staff.id), inline=False)
+        elif ticket_type:
+            embed.description = f"**{ticket_type.capitalize()}** tickets"
+            embed.add_field(name="Time to claim", value=stats_line("time_to_claim", "type", ticket_type), inline=False)
+            embed.add_field(name="Time to close", value=stats_line("time_to_close", "type", ticket_type), inline=False)
+        else:
+            embed.add_field(
+                name="All tickets",
+                value=f"**Claim:** {stats_line('time_to_claim', 'all')}\n**Close:** {stats_line('time_to_close', 'all')}",
+                inline=False
+            )
+            for key in ticket_metrics.keys("type")[:20]:
+                embed.add_field(
+                    name=key.capitalize(),
+                    value=f"**Claim:** {stats_line('time_to_claim', 'type', key)}\n**Close:** {stats_line('time_to_close', 'type', key)}",
+                    inline=False
+                )
+
+        if export:
+            data = json.dumps(ticket_metrics.export(), indent=2).encode("utf-8")
+            file = discord.File(io.BytesIO(data), filename="ticket_stats.json")
+            return await interaction.response.send_message(embed=embed, file=file, ephemeral=True)
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
+    @ticket_stats.autocomplete("ticket_type")
+    async def ticket_stats_type_autocomplete(self, interaction: discord.Interaction, current: str):
+        return await self.ticket_type_autocomplete(interaction, current)
+
+    @app_commands.command(name="ticketsearch", description="Search closed ticket transcripts")
+    @app_commands.describe(
+        text="Words to look for in messages",
+        author="Only messages sent by this user",
+        ticket_type="Only tickets of this type",
+        since="Only messages on or after this date (YYYY-MM-DD)",
+        until="Only messages on or before this date (YYYY-MM-DD)"
+    )
+    async def ticket_search(
+        self,
+        interaction: discord.Interaction,
+        text: str = None,
+        author: discord.User = None,
+        ticket_type: str = None,
+        since: str = None,
+        until: str = None
+    ):
+        if not is_ticket_staff(interaction.user):
+            return await interaction.response.send_message("You don't have permission to use this.", ephemeral=True)
+
+        try:
+            since_ts = parse_date(since) if since else None
+            until_ts = parse_date(until) + 86400 if until else None
+        except ValueError:
+            return await interaction.response.send_message("Dates must look like `2025-01-31`.", ephemeral=True)
+
+        await interaction.response.defer(ephemeral=True)
+        view = TicketSearchView(interaction.user, {
+            "text": text,
+            "author_id": author.id if author else None,
+            "ticket_type": ticket_type,
+            "since": since_ts,
+            "until": until_ts
+        })
+        await interaction.followup.send(embed=await view.build_embed(), view=view, ephemeral=True)
+
+    @ticket_search.autocomplete("ticket_type")
+    async def ticket_type_autocomplete(self, interaction: discord.Interaction, current: str):
+        return [
+            app_commands.Choice(name=ticket_type.capitalize(), value=ticket_type)
+            for ticket_type in ticket_config.ticket_types()
+            if current.lower() in ticket_type
+        ][:25]
+
 
 async def setup(bot: commands.Bot):
     guild = discord.Object(id=config.GUILD_ID)
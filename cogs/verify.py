@@ -4,8 +4,38 @@ from discord.ext import commands
 from discord.ui import View, Modal, TextInput
 import config
 import asyncio
-
-cooldowns = {}
+import datetime
+import re
+from utils.database import Database
+from utils.applications import Application, ApplicationStore
+from utils.similarity import BackstoryIndex
+from utils.ttl_store import TTLStore
+from utils.blacklist import BlacklistStore
+from utils.rate_limit import RouteLimiter
+from utils.render import render_coalescer
+
+VERIFY_DB_FILE = "verify.db"
+BLACKLIST_FILE = "blacklist.json"
+BLACKLIST_PAGE_SIZE = 20
+BULK_WORKERS = 4
+BLACKLIST_IMPORT_MAX_BYTES = 2 * 1024 * 1024
+USER_ID = re.compile(rb"(?<!\d)\d{15,20}(?!\d)")
+
+# user id -> denial count, while the user is waiting to reapply
+cooldowns = TTLStore("verify_cooldowns.json")
+# user id -> denials so far; each one doubles the next cooldown
+deny_strikes = TTLStore("verify_strikes.json")
+# config.BLACKLIST only seeds the file the first time; /blacklist manages it after that.
+blacklist = BlacklistStore(BLACKLIST_FILE, seed=config.BLACKLIST)
+# Shared by single clicks and bulk reviews so neither can flood a route.
+decision_limits = RouteLimiter({
+    "member": (2, 5),
+    "staff_message": (1, 5),
+    "public_log": (1, 5),
+})
+verify_db = Database(VERIFY_DB_FILE)
+applications = ApplicationStore(verify_db)
+backstory_index = BackstoryIndex(verify_db)
 
 class VerifyModal(Modal, title="Whitelist"):
     char_name = TextInput(
@@ -31,110 +61,311 @@ class VerifyModal(Modal, title="Whitelist"):
         self.user = user
 
     async def on_submit(self, interaction: discord.Interaction):
-        if self.user.id in config.BLACKLIST:
-            await interaction.response.send_message("You are blacklisted and cannot verify.", ephemeral=True)
-            return
-
-        embed = discord.Embed(title="Whitelist Request", color=config.EMBED_COLOR)
-        embed.add_field(name="User", value=f"{self.user.mention} ({self.user.id})", inline=False)
-        embed.add_field(name="Character Name", value=self.char_name.value, inline=False)
-        embed.add_field(name="Steam Name", value=self.steam_name.value, inline=False)
-        embed.add_field(name="Backstory", value=self.backstory.value, inline=False)
+        # Storing, the similarity check and the staff post can outlast the 3 second window.
+        await interaction.response.defer(ephemeral=True, thinking=True)
+        application = await applications.create(
+            self.user.id, self.char_name.value, self.steam_name.value, self.backstory.value
+        )
+        embed = application_embed(application, "Whitelist Request", config.EMBED_COLOR)
+        similar = await similar_applications(application)
+        if similar:
+            embed.add_field(name="Similar Past Applications", value=similar, inline=False)
 
         staff_channel = interaction.client.get_channel(config.VERIFY_LOG_CHANNEL_ID)
-        view = StaffDecisionView(self.user, self.char_name.value, self.steam_name.value, self.backstory.value)
-        await staff_channel.send(content="@here", embed=embed, view=view)
-
-        await interaction.response.send_message("Your Allowlist request has been sent to staff.", ephemeral=True)
-
-class StaffDecisionView(View):
-    def __init__(self, user: discord.Member, char_name: str, steam_name: str, backstory: str):
-        super().__init__(timeout=None)
-        self.user = user
-        self.char_name = char_name
-        self.steam_name = steam_name
-        self.backstory = backstory
-
-    @discord.ui.button(label="Approve", style=discord.ButtonStyle.success)
-    async def approve(self, interaction: discord.Interaction, button: discord.ui.Button):
-        role = interaction.guild.get_role(config.VERIFIED_ROLE_ID)
-        await self.user.add_roles(role)
-
-        new_nickname = f"{self.char_name}"
-        try:
-            await self.user.edit(nick=new_nickname)
-        except discord.Forbidden:
-            await interaction.response.send_message(
-                "I don't have permission to change that user's nickname.", ephemeral=True
-            )
+        message = await staff_channel.send(content="@here", embed=embed, view=decision_view(application.id))
+        await applications.set_message(application.id, message.channel.id, message.id)
+
+        await interaction.followup.send("Your Allowlist request has been sent to staff.", ephemeral=True)
+
+async def similar_applications(application: Application) -> str | None:
+    """Index the backstory and describe the closest earlier ones for staff."""
+    try:
+        matches = await backstory_index.add(application.id, application.backstory)
+    except Exception as e:
+        print(f"Failed to check application #{application.id} for similar backstories: {e}")
+        return None
+    lines = []
+    for application_id, score in matches:
+        match = await applications.get(application_id)
+        if match:
+            lines.append(f"#{match.id} by <@{match.user_id}> ({match.status}) — {score:.0%} similar")
+    return "\n".join(lines) or None
+
+def format_wait(seconds: int) -> str:
+    hours, remainder = divmod(int(seconds), 3600)
+    minutes, seconds = divmod(remainder, 60)
+    if hours:
+        return f"{hours}h {minutes}m"
+    if minutes:
+        return f"{minutes}m {seconds}s" if seconds else f"{minutes} minutes"
+    return f"{seconds}s"
+
+def start_deny_cooldown(user_id: int) -> int:
+    """Start the reapply cooldown after a denial and return its length in seconds."""
+    strikes = deny_strikes.get(user_id, 0) + 1
+    deny_strikes.set(user_id, strikes, ttl=config.VERIFY_DENY_STRIKE_DAYS * 86400)
+    cooldown = min(config.VERIFY_DENY_COOLDOWN_MINUTES * 60 * 2 ** (strikes - 1), config.VERIFY_DENY_COOLDOWN_MAX_HOURS * 3600)
+    cooldowns.set(user_id, strikes, ttl=cooldown)
+    return cooldown
+
+def application_embed(application: Application, title: str, color) -> discord.Embed:
+    embed = discord.Embed(title=title, color=color)
+    embed.add_field(name="User", value=f"<@{application.user_id}> ({application.user_id})", inline=False)
+    embed.add_field(name="Character Name", value=application.char_name, inline=False)
+    embed.add_field(name="Steam Name", value=application.steam_name, inline=False)
+    embed.add_field(name="Backstory", value=application.backstory[:1024], inline=False)
+    embed.set_footer(text=f"Application #{application.id}")
+    return embed
+
+def decision_view(application_id: int) -> View:
+    """Approve/Deny buttons for one application. Not kept in memory: DecisionButton handles the clicks."""
+    view = View(timeout=None)
+    view.add_item(DecisionButton("approve", application_id))
+    view.add_item(DecisionButton("deny", application_id))
+    return view
+
+class DecisionButton(discord.ui.DynamicItem[discord.ui.Button], template=r"verify:(?P<action>approve|deny):(?P<id>[0-9]+)"):
+    """Staff decision button; the application id lives in the custom id, so it works after a restart."""
+
+    def __init__(self, action: str, application_id: int):
+        if action == "approve":
+            button = discord.ui.Button(label="Approve", style=discord.ButtonStyle.success, custom_id=f"verify:approve:{application_id}")
+        else:
+            button = discord.ui.Button(label="Deny", style=discord.ButtonStyle.danger, custom_id=f"verify:deny:{application_id}")
+        super().__init__(button)
+        self.action = action
+        self.application_id = application_id
+
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item: discord.ui.Button, match):
+        return cls(match["action"], int(match["id"]))
+
+    async def callback(self, interaction: discord.Interaction):
+        application = await applications.get(self.application_id)
+        if application is None:
+            await interaction.response.send_message("That application no longer exists.", ephemeral=True)
             return
-
-        embed = discord.Embed(title="Whitelist Request - Approved", color=discord.Color.green())
-        embed.add_field(name="User", value=f"{self.user.mention} ({self.user.id})", inline=False)
-        embed.add_field(name="Character Name", value=self.char_name, inline=False)
-        embed.add_field(name="Steam Name", value=self.steam_name, inline=False)
-        embed.add_field(name="Backstory", value=self.backstory, inline=False)
-
-        await interaction.response.edit_message(embed=embed, view=None)
-
+        if not await applications.decide(application.id, "approved" if self.action == "approve" else "denied", interaction.user.id):
+            await interaction.response.send_message("That application has already been handled.", ephemeral=True)
+            return
+        if self.action == "approve":
+            await approve(interaction, application)
+        else:
+            await deny(interaction, application)
+
+class DecisionError(Exception):
+    """An approval that couldn't be carried out; the message is shown to staff."""
+
+async def grant_whitelist(guild: discord.Guild, application: Application):
+    """Give the applicant the verified role and their character name."""
+    member = guild.get_member(application.user_id)
+    if member is None:
+        try:
+            member = await guild.fetch_member(application.user_id)
+        except discord.NotFound:
+            raise DecisionError("That user is no longer in the server.")
+
+    role = guild.get_role(config.VERIFIED_ROLE_ID)
+    await decision_limits.acquire("member")
+    await member.add_roles(role)
+
+    new_nickname = f"{application.char_name}"
+    await decision_limits.acquire("member")
+    try:
+        await member.edit(nick=new_nickname)
+    except discord.Forbidden:
+        raise DecisionError("I don't have permission to change that user's nickname.")
+
+def approved_embed(application: Application, reviewer: discord.abc.User) -> discord.Embed:
+    embed = application_embed(application, "Whitelist Request - Approved", discord.Color.green())
+    embed.set_footer(text=f"Application #{application.id} • Approved by {reviewer}")
+    return embed
+
+def denied_embed(application: Application, reviewer: discord.abc.User, wait: str) -> discord.Embed:
+    embed = application_embed(application, "Whitelist Request - Denied", discord.Color.red())
+    embed.set_footer(text=f"Application #{application.id} • Denied by {reviewer} • User may retry in {wait}.")
+    return embed
+
+def public_result_embed(application: Application, approved: bool, wait: str | None = None) -> discord.Embed:
+    if approved:
         public_embed = discord.Embed(
             title="✅ Whitelst Approved",
-            description=f"{self.user.mention} has been **approved and Whitelisted!**",
+            description=f"<@{application.user_id}> has been **approved and Whitelisted!**",
             color=discord.Color.green()
         )
-        public_embed.add_field(name="Character Name", value=self.char_name, inline=False)
-
+        public_embed.add_field(name="Character Name", value=application.char_name, inline=False)
         public_embed.set_image(url=config.APPROVED_IMAGE_URL)
+        return public_embed
 
-        public_log = interaction.client.get_channel(config.VERIFY_PUBLIC_LOG_CHANNEL)
-        if public_log:
-            await public_log.send(embed=public_embed)
-
-        self.stop()
-
-    @discord.ui.button(label="Deny", style=discord.ButtonStyle.danger)
-    async def deny(self, interaction: discord.Interaction, button: discord.ui.Button):
-        cooldowns[self.user.id] = asyncio.get_event_loop().time() + 600
-
-        embed = discord.Embed(title="Whitelist Request - Denied", color=discord.Color.red())
-        embed.add_field(name="User", value=f"{self.user.mention} ({self.user.id})", inline=False)
-        embed.add_field(name="Character Name", value=self.char_name, inline=False)
-        embed.add_field(name="Steam Name", value=self.steam_name, inline=False)
-        embed.add_field(name="Backstory", value=self.backstory, inline=False)
-        embed.set_footer(text="User may retry in 10 minutes.")
-
-        await interaction.response.edit_message(embed=embed, view=None)
-
-        public_embed = discord.Embed(
-            title="❌ Whitelist Denied",
-            description=f"{self.user.mention}, your Whitelist request was denied.",
-            color=discord.Color.red()
-        )
-        public_embed.add_field(name="Character Name", value=self.char_name, inline=False)
-        public_embed.add_field(name="Steam Name", value=self.steam_name, inline=False)
-        public_embed.add_field(name="Backstory", value=self.backstory, inline=False)
-        public_embed.set_footer(text="You may retry after 10 minutes.")
-
-        public_embed.set_image(url=config.DENIED_IMAGE_URL)
-
-        public_log = interaction.client.get_channel(config.VERIFY_PUBLIC_LOG_CHANNEL)
-        if public_log:
-            await public_log.send(embed=public_embed)
-
+    public_embed = discord.Embed(
+        title="❌ Whitelist Denied",
+        description=f"<@{application.user_id}>, your Whitelist request was denied.",
+        color=discord.Color.red()
+    )
+    public_embed.add_field(name="Character Name", value=application.char_name, inline=False)
+    public_embed.add_field(name="Steam Name", value=application.steam_name, inline=False)
+    public_embed.add_field(name="Backstory", value=application.backstory[:1024], inline=False)
+    public_embed.set_footer(text=f"You may retry after {wait}.")
+    public_embed.set_image(url=config.DENIED_IMAGE_URL)
+    return public_embed
+
+async def post_public_result(client: discord.Client, embed: discord.Embed):
+    public_log = client.get_channel(config.VERIFY_PUBLIC_LOG_CHANNEL)
+    if public_log:
+        await decision_limits.acquire("public_log")
+        await public_log.send(embed=embed)
+
+async def approve(interaction: discord.Interaction, application: Application):
+    # The member route may be busy with a bulk review, so don't let the interaction time out.
+    await interaction.response.defer()
+    try:
+        await grant_whitelist(interaction.guild, application)
+    except DecisionError as e:
+        await applications.reopen(application.id)
+        await interaction.followup.send(str(e), ephemeral=True)
+        return
+    except discord.HTTPException:
+        await applications.reopen(application.id)
+        raise
+
+    await interaction.edit_original_response(embed=approved_embed(application, interaction.user), view=None)
+    await post_public_result(interaction.client, public_result_embed(application, True))
+
+async def deny(interaction: discord.Interaction, application: Application):
+    wait = format_wait(start_deny_cooldown(application.user_id))
+
+    await interaction.response.edit_message(embed=denied_embed(application, interaction.user, wait), view=None)
+    await post_public_result(interaction.client, public_result_embed(application, False, wait))
+
+async def decide_in_bulk(interaction: discord.Interaction, application_ids: list[int], approved: bool,
+                         progress: discord.InteractionMessage) -> str:
+    """Approve or deny many applications and return a summary for staff.
+
+    Up to BULK_WORKERS applications are in flight at once, and every Discord
+    call waits on its route's bucket in `decision_limits`, so a big batch
+    neither trips rate limits nor crowds out single-click reviews. Progress
+    edits go through the render coalescer.
+    """
+    slots = asyncio.Semaphore(BULK_WORKERS)
+    status = "approved" if approved else "denied"
+    done, skipped, failed, warnings = [], [], [], []
+
+    def render():
+        handled = len(done) + len(skipped) + len(failed)
+        return {"content": f"Processing… {handled}/{len(application_ids)} ({len(done)} {status}, {len(failed)} failed)"}
+
+    async def process(application_id: int):
+        async with slots:
+            try:
+                application = await applications.get(application_id)
+                if application is None or not await applications.decide(application_id, status, interaction.user.id):
+                    skipped.append(application_id)
+                    return
+                try:
+                    if approved:
+                        await grant_whitelist(interaction.guild, application)
+                        wait = None
+                        embed = approved_embed(application, interaction.user)
+                    else:
+                        wait = format_wait(start_deny_cooldown(application.user_id))
+                        embed = denied_embed(application, interaction.user, wait)
+                except (DecisionError, discord.HTTPException) as e:
+                    await applications.reopen(application_id)
+                    failed.append(f"#{application_id} <@{application.user_id}>: {e}")
+                    return
+
+                try:
+                    if application.message_id:
+                        await decision_limits.acquire("staff_message")
+                        staff_message = interaction.client.get_partial_messageable(application.channel_id).get_partial_message(application.message_id)
+                        await staff_message.edit(embed=embed, view=None)
+                    await post_public_result(interaction.client, public_result_embed(application, approved, wait))
+                except discord.HTTPException as e:
+                    warnings.append(f"#{application_id}: {status}, but updating the messages failed ({e})")
+                done.append(application_id)
+            finally:
+                # Skipped and failed applications count towards progress too.
+                render_coalescer.mark_dirty(progress, render)
+
+    await asyncio.gather(*(process(application_id) for application_id in application_ids))
+    render_coalescer.discard(progress.id)
+
+    lines = [f"**{len(done)}** of {len(application_ids)} applications {status}."]
+    if skipped:
+        lines.append(f"{len(skipped)} were already handled by someone else.")
+    if failed:
+        lines.append(f"**{len(failed)} failed** and are still pending:")
+        lines.extend(failed[:15])
+        if len(failed) > 15:
+            lines.append(f"…and {len(failed) - 15} more.")
+    if warnings:
+        lines.extend(warnings[:5])
+    return "\n".join(lines)[:2000]
+
+class BulkReviewView(View):
+    """Pick several pending applications and approve or deny them together."""
+
+    def __init__(self, pending: list[Application]):
+        super().__init__(timeout=600)
+        self.pending = pending
+        self.selected: list[int] = []
+        self.pick.max_values = len(pending)
+        self.pick.options = [
+            discord.SelectOption(
+                label=f"#{application.id} {application.char_name}"[:100],
+                description=f"{application.steam_name} • submitted {datetime.datetime.fromtimestamp(application.submitted_at):%Y-%m-%d %H:%M}"[:100],
+                value=str(application.id)
+            )
+            for application in pending
+        ]
+
+    @discord.ui.select(placeholder="Choose applications", min_values=1)
+    async def pick(self, interaction: discord.Interaction, select: discord.ui.Select):
+        self.selected = [int(value) for value in select.values]
+        await interaction.response.defer()
+
+    @discord.ui.button(label="Select all", style=discord.ButtonStyle.secondary)
+    async def select_all(self, interaction: discord.Interaction, button: discord.ui.Button):
+        self.selected = [application.id for application in self.pending]
+        for option in self.pick.options:
+            option.default = True
+        await interaction.response.edit_message(view=self)
+
+    @discord.ui.button(label="Approve selected", style=discord.ButtonStyle.success)
+    async def approve_selected(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self.run(interaction, approved=True)
+
+    @discord.ui.button(label="Deny selected", style=discord.ButtonStyle.danger)
+    async def deny_selected(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self.run(interaction, approved=False)
+
+    async def run(self, interaction: discord.Interaction, approved: bool):
+        if not self.selected:
+            await interaction.response.send_message("Choose at least one application first.", ephemeral=True)
+            return
         self.stop()
+        await interaction.response.edit_message(content=f"Processing… 0/{len(self.selected)}", embed=None, view=None)
+        progress = await interaction.original_response()
+        summary = await decide_in_bulk(interaction, self.selected, approved, progress)
+        await interaction.edit_original_response(content=summary)
 
 class VerifyView(View):
     def __init__(self):
         super().__init__(timeout=None)
 
-    @discord.ui.button(label="Apply", style=discord.ButtonStyle.primary)
+    @discord.ui.button(label="Apply", style=discord.ButtonStyle.primary, custom_id="verify:apply")
     async def verify(self, interaction: discord.Interaction, button: discord.ui.Button):
         user = interaction.user
 
-        if user.id in cooldowns and asyncio.get_event_loop().time() < cooldowns[user.id]:
-            remaining = int(cooldowns[user.id] - asyncio.get_event_loop().time())
+        # Checked before the modal opens, so nobody fills it in for nothing.
+        if user.id in blacklist:
+            await interaction.response.send_message("You are blacklisted and cannot verify.", ephemeral=True)
+            return
+
+        remaining = cooldowns.remaining(user.id)
+        if remaining:
             await interaction.response.send_message(
-                f"You must wait {remaining // 60}m {remaining % 60}s before trying again.",
+                f"You must wait {format_wait(remaining)} before trying again.",
                 ephemeral=True
             )
             return
@@ -142,9 +373,38 @@ class VerifyView(View):
         await interaction.response.send_modal(VerifyModal(user))
 
 class Verify(commands.Cog):
+    blacklist_commands = app_commands.Group(
+        name="blacklist",
+        description="Manage who is blocked from applying",
+        guild_ids=[config.GUILD_ID]
+    )
+
     def __init__(self, bot):
         self.bot = bot
 
+    async def cog_load(self):
+        await applications.load()
+        blacklist.start_watching()
+        cooldowns.start()
+        deny_strikes.start()
+        await backstory_index.load()
+        self.bot.loop.create_task(self.backfill_index())
+        self.bot.add_view(VerifyView())
+        self.bot.add_dynamic_items(DecisionButton)
+
+    async def backfill_index(self):
+        indexed = await backstory_index.backfill()
+        if indexed:
+            print(f"Indexed {indexed} older application backstories.")
+
+    async def cog_unload(self):
+        self.bot.remove_dynamic_items(DecisionButton)
+        blacklist.stop_watching()
+        backstory_index.close()
+        await cooldowns.stop()
+        await deny_strikes.stop()
+        await verify_db.close()
+
     @app_commands.command(name="setupverify", description="Setup Allowlist embed")
     @app_commands.guilds(discord.Object(id=config.GUILD_ID))
     async def setupverify(self, interaction: discord.Interaction):
@@ -168,5 +428,77 @@ class Verify(commands.Cog):
         view = VerifyView()
         await interaction.channel.send(embed=embed, view=view)
 
+    @app_commands.command(name="reviewapps", description="Approve or deny several pending applications at once")
+    @app_commands.guilds(discord.Object(id=config.GUILD_ID))
+    @app_commands.checks.has_permissions(manage_roles=True)
+    async def reviewapps(self, interaction: discord.Interaction):
+        pending = await applications.pending(limit=25)
+        if not pending:
+            await interaction.response.send_message("There are no pending applications.", ephemeral=True)
+            return
+        await interaction.response.send_message(
+            f"Showing the {len(pending)} oldest pending applications.",
+            view=BulkReviewView(pending),
+            ephemeral=True
+        )
+
+    @blacklist_commands.command(name="add", description="Block a user from applying")
+    @app_commands.checks.has_permissions(administrator=True)
+    @app_commands.describe(user="The user to block", reason="Why they are blocked (optional)")
+    async def blacklist_add(self, interaction: discord.Interaction, user: discord.User, reason: str = None):
+        if await blacklist.add(user.id, reason, interaction.user.id):
+            await interaction.response.send_message(f"{user.mention} is now blacklisted.", ephemeral=True)
+        else:
+            await interaction.response.send_message(f"{user.mention} is already blacklisted.", ephemeral=True)
+
+    @blacklist_commands.command(name="remove", description="Allow a blacklisted user to apply again")
+    @app_commands.checks.has_permissions(administrator=True)
+    @app_commands.describe(user="The user to unblock")
+    async def blacklist_remove(self, interaction: discord.Interaction, user: discord.User):
+        if await blacklist.remove(user.id):
+            await interaction.response.send_message(f"{user.mention} was removed from the blacklist.", ephemeral=True)
+        else:
+            await interaction.response.send_message(f"{user.mention} is not blacklisted.", ephemeral=True)
+
+    @blacklist_commands.command(name="list", description="Show blacklisted users")
+    @app_commands.checks.has_permissions(administrator=True)
+    @app_commands.describe(page="Page number (default: 1)")
+    async def blacklist_list(self, interaction: discord.Interaction, page: int = 1):
+        entries = blacklist.entries()
+        pages = max(1, -(-len(entries) // BLACKLIST_PAGE_SIZE))
+        page = min(max(page, 1), pages)
+        shown = entries[(page - 1) * BLACKLIST_PAGE_SIZE:page * BLACKLIST_PAGE_SIZE]
+
+        lines = [
+            f"<@{user_id}> ({user_id})" + (f" — {info['reason']}" if info.get("reason") else "")
+            for user_id, info in shown
+        ]
+        embed = discord.Embed(
+            title="Verification Blacklist",
+            description="\n".join(lines)[:4096] or "Nobody is blacklisted.",
+            color=config.EMBED_COLOR
+        )
+        embed.set_footer(text=f"Page {page}/{pages} • {len(entries)} users")
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
+    @blacklist_commands.command(name="import", description="Blacklist every user ID found in a text/CSV/JSON file")
+    @app_commands.checks.has_permissions(administrator=True)
+    @app_commands.describe(file="File containing user IDs", reason="Reason recorded for every imported ID (optional)")
+    async def blacklist_import(self, interaction: discord.Interaction, file: discord.Attachment, reason: str = None):
+        if file.size > BLACKLIST_IMPORT_MAX_BYTES:
+            await interaction.response.send_message("That file is too large (2 MB max).", ephemeral=True)
+            return
+
+        await interaction.response.defer(ephemeral=True)
+        user_ids = {int(match) for match in USER_ID.findall(await file.read())}
+        if not user_ids:
+            await interaction.followup.send("No user IDs were found in that file.", ephemeral=True)
+            return
+
+        added = await blacklist.add_many(user_ids, reason, interaction.user.id)
+        await interaction.followup.send(
+            f"Imported {added} new IDs ({len(user_ids) - added} were already blacklisted).", ephemeral=True
+        )
+
 async def setup(bot):
-    await bot.add_cog(Verify(bot))
\ No newline at end of file
+    await bot.add_cog(Verify(bot))
@@ -17,10 +17,14 @@ WELCOME_IMAGE_URL = ""
 VERIFIED_ROLE_ID = 1407745449640595521 # Example
 VERIFY_PUBLIC_LOG_CHANNEL = 1407745749990768812 # Example
 VERIFY_LOG_CHANNEL_ID = 1407745747851546738 # Example
+VERIFY_DENY_COOLDOWN_MINUTES = 10 # Wait before reapplying after a denial; doubles with each repeat denial
+VERIFY_DENY_COOLDOWN_MAX_HOURS = 24 # Longest a repeat denial can make someone wait
+VERIFY_DENY_STRIKE_DAYS = 30 # Denials older than this no longer count towards the longer wait
 APPROVED_IMAGE_URL = "https://r2.fivemanage.com/Yj3vAdiwekRbupqA8pSa1/accept.png"
 DENIED_IMAGE_URL = "https://r2.fivemanage.com/Yj3vAdiwekRbupqA8pSa1/reject.png"
 
 # Blacklist of user IDs who cannot verify
+# Only used to create blacklist.json the first time; manage it with /blacklist after that
 BLACKLIST = [
     1234567890123456789, # example
 ]
@@ -32,6 +36,15 @@ DB_USER = "root" # DB Username
 DB_PASS = "root" # DB Password
 DB_NAME = "siliconrp" # DB Name
 
+# Live message updates (polls, giveaways)
+# At most one edit per message in this many seconds; clicks in between are merged
+RENDER_COALESCE_SECONDS = 2.0
+
+# Giveaways
+GIVEAWAY_DM_WINNERS = True # Also DM winners, not just ping them in the giveaway channel
+GIVEAWAY_LOG_CHANNEL_ID = 0 # Staff channel for giveaway results, 0 to disable
+GIVEAWAY_DMS_PER_SECOND = 5 # Caps winner DMs so big giveaways don't crowd out other bot traffic
+
 # Polls
 # Can everyone do polls or only admins/mods?
 POLLONLYADMIN = True
@@ -39,6 +52,7 @@ POLLONLYADMIN = True
 # Tickets
 # All done within discord (/help)
 TICKET_LOG_CHANNEL_ID = 1407745830173147160
+TICKET_TRANSCRIPT_HTML = False # Also attach an HTML transcript when a ticket closes
 
 # Feature Toggles
 FEATURES = {
@@ -0,0 +1,99 @@
+import time
+from dataclasses import dataclass
+
+from utils.database import Database
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS applications (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    char_name TEXT NOT NULL,
+    steam_name TEXT NOT NULL,
+    backstory TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    submitted_at REAL NOT NULL,
+    reviewer_id INTEGER,
+    decided_at REAL,
+    channel_id INTEGER,
+    message_id INTEGER
+);
+CREATE INDEX IF NOT EXISTS applications_status ON applications (status, submitted_at);
+CREATE INDEX IF NOT EXISTS applications_user ON applications (user_id);
+"""
+
+COLUMNS = "id, user_id, char_name, steam_name, backstory, status, submitted_at, reviewer_id, decided_at, channel_id, message_id"
+
+
+@dataclass
+class Application:
+    id: int
+    user_id: int
+    char_name: str
+    steam_name: str
+    backstory: str
+    status: str
+    submitted_at: float
+    reviewer_id: int | None = None
+    decided_at: float | None = None
+    channel_id: int | None = None
+    message_id: int | None = None
+
+
+class ApplicationStore:
+    """Whitelist applications in SQLite.
+
+    An application is 'pending' until a staff member approves or denies it.
+    `decide()` only moves a pending application, so two staff clicking at
+    once can't both act on it.
+    """
+
+    def __init__(self, db: Database):
+        self.db = db
+
+    async def load(self):
+        await self.db.executescript(SCHEMA)
+
+    async def create(self, user_id: int, char_name: str, steam_name: str, backstory: str) -> Application:
+        now = time.time()
+
+        def _insert(conn):
+            with conn:
+                return conn.execute(
+                    "INSERT INTO applications (user_id, char_name, steam_name, backstory, submitted_at) VALUES (?, ?, ?, ?, ?)",
+                    (user_id, char_name, steam_name, backstory, now)
+                ).lastrowid
+        application_id = await self.db.run(_insert)
+        return Application(application_id, user_id, char_name, steam_name, backstory, "pending", now)
+
+    async def set_message(self, application_id: int, channel_id: int, message_id: int):
+        await self.db.execute(
+            "UPDATE applications SET channel_id = ?, message_id = ? WHERE id = ?", (channel_id, message_id, application_id)
+        )
+
+    async def get(self, application_id: int) -> Application | None:
+        row = await self.db.fetchone(f"SELECT {COLUMNS} FROM applications WHERE id = ?", (application_id,))
+        return Application(*row) if row else None
+
+    async def pending(self, limit: int = 25) -> list[Application]:
+        """Oldest pending applications first."""
+        rows = await self.db.fetchall(
+            f"SELECT {COLUMNS} FROM applications WHERE status = 'pending' ORDER BY submitted_at LIMIT ?", (limit,)
+        )
+        return [Application(*row) for row in rows]
+
+    async def decide(self, application_id: int, status: str, reviewer_id: int) -> bool:
+        """Approve or deny a pending application. Returns False if it was already decided."""
+        def _decide(conn):
+            with conn:
+                return conn.execute(
+                    "UPDATE applications SET status = ?, reviewer_id = ?, decided_at = ? WHERE id = ? AND status = 'pending'",
+                    (status, reviewer_id, time.time(), application_id)
+                ).rowcount
+        return await self.db.run(_decide) == 1
+
+    async def reopen(self, application_id: int):
+        """Put an application back to pending, e.g. when acting on the decision failed."""
+        await self.db.execute(
+            "UPDATE applications SET status = 'pending', reviewer_id = NULL, decided_at = NULL WHERE id = ?",
+            (application_id,)
+        )
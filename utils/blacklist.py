@@ -0,0 +1,65 @@
+import time
+
+from utils.storage import JsonStore
+
+
+class BlacklistStore(JsonStore):
+    """Users barred from verifying, kept in a JSON file keyed by user id.
+
+    Membership checks go through a set of ids built from the current
+    snapshot, and the set is only rebuilt after the file changes, whether
+    through `/blacklist` or a hand edit picked up by the watcher.
+    """
+
+    def __init__(self, path: str, seed: list[int] = ()):
+        super().__init__(path, default=lambda: {str(user_id): entry(None, None) for user_id in seed})
+        self._indexed = None
+        self._ids: frozenset[int] = frozenset()
+
+    def _index(self) -> frozenset[int]:
+        data = self.snapshot()
+        if data is not self._indexed:
+            self._ids = frozenset(int(user_id) for user_id in data)
+            self._indexed = data
+        return self._ids
+
+    def __contains__(self, user_id: int) -> bool:
+        return user_id in self._index()
+
+    def __len__(self) -> int:
+        return len(self._index())
+
+    def entries(self) -> list[tuple[int, dict]]:
+        """All entries, most recently added first."""
+        return sorted(
+            ((int(user_id), info) for user_id, info in self.snapshot().items()),
+            key=lambda item: -(item[1].get("added_at") or 0)
+        )
+
+    async def add(self, user_id: int, reason: str | None, added_by: int) -> bool:
+        if user_id in self:
+            return False
+        async with self.edit() as data:
+            data[str(user_id)] = entry(reason, added_by)
+        return True
+
+    async def remove(self, user_id: int) -> bool:
+        if user_id not in self:
+            return False
+        async with self.edit() as data:
+            data.pop(str(user_id), None)
+        return True
+
+    async def add_many(self, user_ids, reason: str | None, added_by: int) -> int:
+        """Add many ids with a single write. Returns how many were new."""
+        new = {user_id for user_id in user_ids if user_id not in self}
+        if not new:
+            return 0
+        async with self.edit() as data:
+            for user_id in new:
+                data[str(user_id)] = entry(reason, added_by)
+        return len(new)
+
+
+def entry(reason: str | None, added_by: int | None) -> dict:
+    return {"reason": reason, "added_by": added_by, "added_at": time.time()}
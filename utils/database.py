@@ -0,0 +1,120 @@
+import asyncio
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+
+
+class Database:
+    """A sqlite3 connection that is only ever touched from one worker thread.
+
+    Every call is queued on a single-thread executor, so statements are
+    serialized and the event loop never waits on disk.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sqlite")
+        self._conn: sqlite3.Connection | None = None
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.row_factory = sqlite3.Row
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+        return self._conn
+
+    async def run(self, fn, *args):
+        """Run fn(conn, *args) on the database thread and return its result."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, lambda: fn(self._connection(), *args))
+
+    async def execute(self, sql: str, params=()):
+        def _execute(conn):
+            with conn:
+                return conn.execute(sql, params).rowcount
+        return await self.run(_execute)
+
+    async def executemany(self, sql: str, rows):
+        rows = list(rows)
+
+        def _executemany(conn):
+            with conn:
+                conn.executemany(sql, rows)
+        await self.run(_executemany)
+
+    async def executescript(self, script: str):
+        await self.run(lambda conn: conn.executescript(script))
+
+    async def fetchone(self, sql: str, params=()):
+        return await self.run(lambda conn: conn.execute(sql, params).fetchone())
+
+    async def fetchall(self, sql: str, params=()):
+        return await self.run(lambda conn: conn.execute(sql, params).fetchall())
+
+    async def close(self):
+        def _close(conn):
+            conn.close()
+            self._conn = None
+        if self._conn is not None:
+            await self.run(_close)
+        self._executor.shutdown(wait=False)
+
+
+class WriteBehind:
+    """Latest value per key, saved to SQLite in one transaction every `interval` seconds.
+
+    `set()` only updates an in-memory map, so a burst of changes to the same
+    key costs one write. On flush, keys with a truthy value go through
+    `upsert_sql` (key columns, then `encode(value)`) and the rest through
+    `delete_sql` (key columns only). If the write fails, the batch is put
+    back without overwriting anything newer.
+    """
+
+    def __init__(self, db: Database, name: str, upsert_sql: str, delete_sql: str,
+                 encode=lambda value: value, interval: float = 5.0):
+        self.db = db
+        self.name = name
+        self.upsert_sql = upsert_sql
+        self.delete_sql = delete_sql
+        self.encode = encode
+        self.interval = interval
+        self._pending: dict[tuple, object] = {}
+        self._task: asyncio.Task | None = None
+
+    def set(self, key: tuple, value):
+        self._pending[key] = value
+
+    def start(self):
+        self._task = asyncio.create_task(self._flush_loop())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+        await self.flush()
+
+    async def flush(self):
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, {}
+        upserts = [(*key, self.encode(value)) for key, value in pending.items() if value]
+        deletes = [key for key, value in pending.items() if not value]
+
+        def _flush(conn):
+            with conn:
+                conn.executemany(self.upsert_sql, upserts)
+                conn.executemany(self.delete_sql, deletes)
+        try:
+            await self.db.run(_flush)
+        except BaseException:
+            # Keep anything newer that arrived while we were writing.
+            for key, value in pending.items():
+                self._pending.setdefault(key, value)
+            raise
+
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                print(f"Failed to save {self.name}: {e}")
@@ -0,0 +1,7 @@
+def parse_duration(duration: str) -> int | None:
+    """Turn `10m`, `2h` or `3d` into seconds, or None if it can't be read."""
+    units = {"m": 60, "h": 3600, "d": 86400}
+    try:
+        return int(duration[:-1]) * units[duration[-1].lower()]
+    except (ValueError, IndexError, KeyError):
+        return None
@@ -0,0 +1,68 @@
+from array import array
+from bisect import bisect_left
+
+
+class EntryArray:
+    """Giveaway entrants as a sorted array of user ids with a parallel array of weights.
+
+    Costs 12 bytes per entrant instead of the ~70 a set of ints needs.
+    Lookups are a binary search; inserts and removals find their slot the
+    same way and then shift the tail with a single memmove (~20 us at 100k
+    entrants).
+    """
+
+    __slots__ = ("ids", "weights")
+
+    def __init__(self, entries: dict[int, int] | None = None):
+        self.ids = array("q")
+        self.weights = array("I")
+        if entries:
+            for user_id in sorted(entries):
+                self.ids.append(user_id)
+                self.weights.append(entries[user_id])
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def _find(self, user_id: int) -> int:
+        """Index of user_id, or -1 if they haven't entered."""
+        i = bisect_left(self.ids, user_id)
+        return i if i < len(self.ids) and self.ids[i] == user_id else -1
+
+    def __contains__(self, user_id: int) -> bool:
+        return self._find(user_id) >= 0
+
+    def weight(self, user_id: int) -> int:
+        i = self._find(user_id)
+        return self.weights[i] if i >= 0 else 0
+
+    def add(self, user_id: int, weight: int = 1) -> bool:
+        """Add an entrant; returns False if they had already entered."""
+        i = bisect_left(self.ids, user_id)
+        if i < len(self.ids) and self.ids[i] == user_id:
+            return False
+        self.ids.insert(i, user_id)
+        self.weights.insert(i, weight)
+        return True
+
+    def remove(self, user_id: int) -> bool:
+        i = self._find(user_id)
+        if i < 0:
+            return False
+        del self.ids[i]
+        del self.weights[i]
+        return True
+
+    def items(self):
+        """(user id, weight) pairs, so the array can be passed to WeightedDraw."""
+        return zip(self.ids, self.weights)
+
+    def to_bytes(self) -> tuple[bytes, bytes]:
+        return self.ids.tobytes(), self.weights.tobytes()
+
+    @classmethod
+    def from_bytes(cls, ids: bytes, weights: bytes) -> "EntryArray":
+        entries = cls()
+        entries.ids.frombytes(ids)
+        entries.weights.frombytes(weights)
+        return entries
@@ -0,0 +1,77 @@
+from dataclasses import dataclass, field
+
+import discord
+
+
+@dataclass
+class GiveawayRules:
+    """Who may enter a giveaway, and how many entries each member gets.
+
+    `bonus_roles` maps a role id to the extra entries that role adds; a member
+    with several bonus roles gets all of them on top of their one base entry.
+    """
+    required_roles: list[int] = field(default_factory=list)
+    forbidden_roles: list[int] = field(default_factory=list)
+    min_account_days: int = 0
+    min_member_days: int = 0
+    bonus_roles: dict[int, int] = field(default_factory=dict)
+
+    @property
+    def restricted(self) -> bool:
+        """True if entrants have to be checked at all."""
+        return bool(self.required_roles or self.forbidden_roles or self.min_account_days or self.min_member_days)
+
+    def check(self, member: discord.Member) -> str | None:
+        """Return why the member can't enter, or None if they can."""
+        role_ids = {role.id for role in getattr(member, "roles", [])}
+        missing = [role_id for role_id in self.required_roles if role_id not in role_ids]
+        if missing:
+            return "You need " + ", ".join(f"<@&{role_id}>" for role_id in missing) + " to enter."
+        if any(role_id in role_ids for role_id in self.forbidden_roles):
+            return "Your roles don't allow you to enter this giveaway."
+
+        now = discord.utils.utcnow()
+        if self.min_account_days and (now - member.created_at).days < self.min_account_days:
+            return f"Your account must be at least {self.min_account_days} days old to enter."
+        joined_at = getattr(member, "joined_at", None)
+        if self.min_member_days and (joined_at is None or (now - joined_at).days < self.min_member_days):
+            return f"You must have been in the server for at least {self.min_member_days} days to enter."
+        return None
+
+    def weight(self, member: discord.Member) -> int:
+        role_ids = {role.id for role in getattr(member, "roles", [])}
+        return 1 + sum(extra for role_id, extra in self.bonus_roles.items() if role_id in role_ids)
+
+    def describe(self) -> str:
+        lines = []
+        if self.required_roles:
+            lines.append("**Required roles:** " + ", ".join(f"<@&{r}>" for r in self.required_roles))
+        if self.forbidden_roles:
+            lines.append("**Not open to:** " + ", ".join(f"<@&{r}>" for r in self.forbidden_roles))
+        if self.min_account_days:
+            lines.append(f"**Account age:** at least {self.min_account_days} days")
+        if self.min_member_days:
+            lines.append(f"**Time in server:** at least {self.min_member_days} days")
+        for role_id, extra in self.bonus_roles.items():
+            lines.append(f"**Bonus:** <@&{role_id}> gets +{extra} entries")
+        return "\n".join(lines)
+
+    def to_dict(self) -> dict:
+        return {
+            "required_roles": self.required_roles,
+            "forbidden_roles": self.forbidden_roles,
+            "min_account_days": self.min_account_days,
+            "min_member_days": self.min_member_days,
+            "bonus_roles": {str(role_id): extra for role_id, extra in self.bonus_roles.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict | None) -> "GiveawayRules":
+        data = data or {}
+        return cls(
+            required_roles=list(data.get("required_roles", [])),
+            forbidden_roles=list(data.get("forbidden_roles", [])),
+            min_account_days=data.get("min_account_days", 0),
+            min_member_days=data.get("min_member_days", 0),
+            bonus_roles={int(role_id): extra for role_id, extra in data.get("bonus_roles", {}).items()},
+        )
@@ -0,0 +1,172 @@
+import json
+
+from utils.database import Database, WriteBehind
+from utils.giveaway_entries import EntryArray
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS giveaways (
+    id INTEGER PRIMARY KEY,
+    channel_id INTEGER NOT NULL,
+    message_id INTEGER NOT NULL,
+    host_id INTEGER NOT NULL,
+    prize TEXT NOT NULL,
+    prize_link TEXT,
+    winner_count INTEGER NOT NULL,
+    end_time REAL NOT NULL,
+    status TEXT NOT NULL DEFAULT 'active',
+    winners TEXT,
+    rules TEXT
+);
+CREATE INDEX IF NOT EXISTS giveaways_status ON giveaways (status);
+CREATE INDEX IF NOT EXISTS giveaways_message ON giveaways (message_id);
+
+CREATE TABLE IF NOT EXISTS giveaway_entries (
+    giveaway_id INTEGER NOT NULL,
+    user_id INTEGER NOT NULL,
+    weight INTEGER NOT NULL DEFAULT 1,
+    PRIMARY KEY (giveaway_id, user_id)
+);
+
+CREATE TABLE IF NOT EXISTS giveaway_snapshots (
+    giveaway_id INTEGER PRIMARY KEY,
+    user_ids BLOB NOT NULL,
+    weights BLOB NOT NULL
+);
+"""
+
+FLUSH_INTERVAL = 5
+
+
+class GiveawayStore:
+    """Giveaways and their entries in SQLite.
+
+    A giveaway is 'active' until its winners are drawn, 'drawn' once the
+    winners are saved but not yet announced, and 'done' after the
+    announcement, so a restart between the two steps announces the same
+    winners instead of drawing again. Entries are keyed by (giveaway, user)
+    with the entrant's weight (1 plus any bonus entries) and written behind
+    every FLUSH_INTERVAL seconds; the latest enter/leave per user wins.
+
+    When the winners are drawn the final entry list is saved as one packed
+    snapshot (the EntryArray's raw arrays) and the per-entry rows are
+    dropped; rerolls and a resumed announcement read the snapshot.
+    """
+
+    def __init__(self, db: Database):
+        self.db = db
+        # (giveaway id, user id) -> weight
+        self._entries = WriteBehind(
+            db, "giveaway entries",
+            "INSERT OR REPLACE INTO giveaway_entries (giveaway_id, user_id, weight) VALUES (?, ?, ?)",
+            "DELETE FROM giveaway_entries WHERE giveaway_id = ? AND user_id = ?",
+            interval=FLUSH_INTERVAL
+        )
+
+    async def load(self):
+        await self.db.executescript(SCHEMA)
+
+    def start(self):
+        self._entries.start()
+
+    async def stop(self):
+        await self._entries.stop()
+
+    async def create(self, giveaway_id: int, channel_id: int, message_id: int, host_id: int, prize: str,
+                     prize_link: str | None, winner_count: int, end_time: float, rules: dict):
+        await self.db.execute(
+            "INSERT INTO giveaways (id, channel_id, message_id, host_id, prize, prize_link, winner_count, end_time, rules) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (giveaway_id, channel_id, message_id, host_id, prize, prize_link, winner_count, end_time, json.dumps(rules))
+        )
+
+    async def unfinished(self) -> list[dict]:
+        """Every giveaway that is still running or hasn't announced its winners, with its entries.
+
+        Drawn giveaways get their entries from the snapshot taken at the draw.
+        """
+        def _load(conn):
+            giveaways = []
+            rows = conn.execute(
+                "SELECT g.id, g.channel_id, g.message_id, g.host_id, g.prize, g.prize_link, g.winner_count, g.end_time, "
+                "g.status, g.winners, g.rules, s.user_ids, s.weights "
+                "FROM giveaways g LEFT JOIN giveaway_snapshots s ON s.giveaway_id = g.id WHERE g.status != 'done'"
+            ).fetchall()
+            for row in rows:
+                if row[11] is not None:
+                    # Drawn but not announced: the entry rows are gone, the snapshot has them.
+                    entries = EntryArray.from_bytes(row[11], row[12])
+                else:
+                    entries = EntryArray(dict(
+                        conn.execute("SELECT user_id, weight FROM giveaway_entries WHERE giveaway_id = ?", (row[0],))
+                    ))
+                giveaways.append({
+                    "id": row[0],
+                    "channel_id": row[1],
+                    "message_id": row[2],
+                    "host_id": row[3],
+                    "prize": row[4],
+                    "prize_link": row[5],
+                    "winner_count": row[6],
+                    "end_time": row[7],
+                    "status": row[8],
+                    "winners": json.loads(row[9]) if row[9] else [],
+                    "rules": json.loads(row[10]) if row[10] else {},
+                    "entries": entries,
+                })
+            return giveaways
+        return await self.db.run(_load)
+
+    def record_entry(self, giveaway_id: int, user_id: int, weight: int):
+        """Save an entry with its weight; a weight of 0 removes it."""
+        self._entries.set((giveaway_id, user_id), weight)
+
+    async def save_winners(self, giveaway_id: int, winners: list[int], entries: EntryArray):
+        """Record the draw and snapshot the final entries in one transaction."""
+        await self.flush()
+        user_ids, weights = entries.to_bytes()
+
+        def _save(conn):
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO giveaway_snapshots (giveaway_id, user_ids, weights) VALUES (?, ?, ?)",
+                    (giveaway_id, user_ids, weights)
+                )
+                conn.execute(
+                    "UPDATE giveaways SET status = 'drawn', winners = ? WHERE id = ?", (json.dumps(winners), giveaway_id)
+                )
+                conn.execute("DELETE FROM giveaway_entries WHERE giveaway_id = ?", (giveaway_id,))
+        await self.db.run(_save)
+
+    async def set_winners(self, giveaway_id: int, winners: list[int]):
+        """Replace the list of everyone who has won this giveaway (after a reroll)."""
+        await self.db.execute("UPDATE giveaways SET winners = ? WHERE id = ?", (json.dumps(winners), giveaway_id))
+
+    async def find_ended(self, message_id: int) -> dict | None:
+        """An ended giveaway by its message id, with its entry snapshot, or None."""
+        def _find(conn):
+            row = conn.execute(
+                "SELECT g.id, g.channel_id, g.message_id, g.host_id, g.prize, g.prize_link, g.winners, g.rules, "
+                "s.user_ids, s.weights FROM giveaways g JOIN giveaway_snapshots s ON s.giveaway_id = g.id "
+                "WHERE g.message_id = ?",
+                (message_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            return {
+                "id": row[0],
+                "channel_id": row[1],
+                "message_id": row[2],
+                "host_id": row[3],
+                "prize": row[4],
+                "prize_link": row[5],
+                "winners": json.loads(row[6]) if row[6] else [],
+                "rules": json.loads(row[7]) if row[7] else {},
+                "entries": EntryArray.from_bytes(row[8], row[9]),
+            }
+        return await self.db.run(_find)
+
+    async def mark_done(self, giveaway_id: int):
+        await self.db.execute("UPDATE giveaways SET status = 'done' WHERE id = ?", (giveaway_id,))
+
+    async def flush(self):
+        await self._entries.flush()
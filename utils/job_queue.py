@@ -0,0 +1,163 @@
+import asyncio
+import json
+import random
+import time
+import traceback
+from dataclasses import dataclass, field
+from functools import partial
+
+from utils.database import Database
+from utils.scheduler import DeadlineScheduler
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY,
+    kind TEXT NOT NULL,
+    key TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    state TEXT NOT NULL DEFAULT 'pending',
+    step TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_run REAL NOT NULL,
+    last_error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_state ON jobs (state, next_run);
+CREATE UNIQUE INDEX IF NOT EXISTS jobs_active_key ON jobs (kind, key) WHERE state = 'pending';
+"""
+
+DONE_RETENTION = 7 * 86400
+
+
+@dataclass
+class Job:
+    id: int
+    kind: str
+    key: str
+    payload: dict
+    step: str | None = None
+    attempts: int = 0
+    next_run: float = 0.0
+    queue: "JobQueue" = field(default=None, repr=False)
+
+    async def checkpoint(self, step: str, **payload):
+        """Record that `step` finished, so a retry or restart resumes after it."""
+        self.step = step
+        self.payload.update(payload)
+        await self.queue._save(self)
+
+
+class JobQueue:
+    """Persistent background jobs with retry/backoff and bounded concurrency.
+
+    Jobs are rows in SQLite, so anything not finished when the bot stops is
+    picked up again by `start()`. Handlers should be written as a series of
+    idempotent steps and call `job.checkpoint()` after each one. Due jobs are
+    run by a DeadlineScheduler limited to `workers` at a time.
+    """
+
+    def __init__(self, db: Database, workers: int = 3, max_attempts: int = 8,
+                 base_delay: float = 5.0, max_delay: float = 600.0):
+        self.db = db
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.handlers = {}
+        self._jobs: dict[int, Job] = {}
+        self._keys: dict[tuple[str, str], int] = {}
+        self._deadlines = DeadlineScheduler("jobs", max_concurrent=workers)
+
+    def register(self, kind: str, handler):
+        self.handlers[kind] = handler
+
+    async def start(self):
+        await self.db.executescript(SCHEMA)
+        await self.db.execute(
+            "DELETE FROM jobs WHERE state IN ('done', 'failed') AND updated_at < ?",
+            (time.time() - DONE_RETENTION,)
+        )
+        rows = await self.db.fetchall(
+            "SELECT id, kind, key, payload, step, attempts, next_run FROM jobs WHERE state = 'pending'"
+        )
+        for row in rows:
+            job = Job(row[0], row[1], row[2], json.loads(row[3]), row[4], row[5], row[6], queue=self)
+            self._track(job)
+        if rows:
+            print(f"Resuming {len(rows)} pending background jobs.")
+        self._deadlines.start()
+
+    async def stop(self):
+        self._deadlines.stop()
+
+    def _track(self, job: Job):
+        self._jobs[job.id] = job
+        self._keys[(job.kind, job.key)] = job.id
+        self._deadlines.schedule(job.id, job.next_run, partial(self._run, job))
+
+    def _untrack(self, job: Job):
+        self._jobs.pop(job.id, None)
+        if self._keys.get((job.kind, job.key)) == job.id:
+            del self._keys[(job.kind, job.key)]
+
+    def get(self, kind: str, key: str) -> Job | None:
+        job_id = self._keys.get((kind, str(key)))
+        return self._jobs.get(job_id) if job_id is not None else None
+
+    async def enqueue(self, kind: str, key, payload: dict, delay: float = 0) -> Job | None:
+        """Queue a job. Returns None if a job with the same kind and key is already pending."""
+        key = str(key)
+        if (kind, key) in self._keys:
+            return None
+        now = time.time()
+        job = Job(0, kind, key, dict(payload), next_run=now + delay, queue=self)
+        # Reserve the key before awaiting so a concurrent enqueue is rejected.
+        self._keys[(kind, key)] = 0
+        try:
+            job.id = await self.db.run(lambda conn: _insert(conn, job, now))
+        except BaseException:
+            del self._keys[(kind, key)]
+            raise
+        self._track(job)
+        return job
+
+    async def _save(self, job: Job, state: str = "pending", error: str | None = None):
+        await self.db.execute(
+            "UPDATE jobs SET payload = ?, state = ?, step = ?, attempts = ?, next_run = ?, last_error = ?, updated_at = ? WHERE id = ?",
+            (json.dumps(job.payload), state, job.step, job.attempts, job.next_run, error, time.time(), job.id)
+        )
+
+    async def _run(self, job: Job):
+        handler = self.handlers.get(job.kind)
+        try:
+            if handler is None:
+                raise RuntimeError(f"No handler registered for job kind {job.kind!r}")
+            await handler(job)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            job.attempts += 1
+            error = "".join(traceback.format_exception_only(type(e), e)).strip()
+            if job.attempts >= self.max_attempts:
+                print(f"Job {job.kind}:{job.key} failed permanently: {error}")
+                self._untrack(job)
+                await self._save(job, "failed", error)
+                return
+            backoff = min(self.max_delay, self.base_delay * 2 ** (job.attempts - 1))
+            job.next_run = time.time() + backoff * random.uniform(0.8, 1.2)
+            print(f"Job {job.kind}:{job.key} failed (attempt {job.attempts}), retrying in {int(backoff)}s: {error}")
+            await self._save(job, "pending", error)
+            self._deadlines.schedule(job.id, job.next_run, partial(self._run, job))
+            return
+
+        self._untrack(job)
+        await self._save(job, "done")
+
+
+def _insert(conn, job: Job, now: float) -> int:
+    with conn:
+        return conn.execute(
+            "INSERT INTO jobs (kind, key, payload, state, next_run, created_at, updated_at) VALUES (?, ?, ?, 'pending', ?, ?, ?)",
+            (job.kind, job.key, json.dumps(job.payload), job.next_run, now, now)
+        ).lastrowid
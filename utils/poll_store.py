@@ -0,0 +1,102 @@
+import json
+
+from utils.database import Database, WriteBehind
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS polls (
+    id INTEGER PRIMARY KEY,
+    channel_id INTEGER NOT NULL,
+    message_id INTEGER NOT NULL,
+    kind TEXT NOT NULL DEFAULT 'single',
+    question TEXT NOT NULL,
+    options TEXT NOT NULL,
+    links TEXT NOT NULL,
+    author TEXT NOT NULL,
+    end_time REAL NOT NULL,
+    ended INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS polls_active ON polls (ended, end_time);
+
+CREATE TABLE IF NOT EXISTS poll_ballots (
+    poll_id INTEGER NOT NULL,
+    user_id INTEGER NOT NULL,
+    ballot TEXT NOT NULL,
+    PRIMARY KEY (poll_id, user_id)
+);
+"""
+
+FLUSH_INTERVAL = 5
+
+
+class PollStore:
+    """Poll definitions and ballots in SQLite.
+
+    Ballots are written behind: a click only updates the pending map, and a
+    background task saves the latest ballot per voter every FLUSH_INTERVAL
+    seconds in one transaction. A ballot is a list of option indexes (one for
+    single-choice polls); None means the vote was withdrawn.
+    """
+
+    def __init__(self, db: Database):
+        self.db = db
+        # (poll id, user id) -> ballot
+        self._ballots = WriteBehind(
+            db, "poll votes",
+            "INSERT OR REPLACE INTO poll_ballots (poll_id, user_id, ballot) VALUES (?, ?, ?)",
+            "DELETE FROM poll_ballots WHERE poll_id = ? AND user_id = ?",
+            encode=json.dumps, interval=FLUSH_INTERVAL
+        )
+
+    async def load(self):
+        await self.db.executescript(SCHEMA)
+
+    def start(self):
+        self._ballots.start()
+
+    async def stop(self):
+        await self._ballots.stop()
+
+    async def create(self, poll_id: int, channel_id: int, message_id: int, kind: str, question: str,
+                     options: list[str], links: dict, author: str, end_time: float):
+        await self.db.execute(
+            "INSERT INTO polls (id, channel_id, message_id, kind, question, options, links, author, end_time) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (poll_id, channel_id, message_id, kind, question, json.dumps(options), json.dumps(links), author, end_time)
+        )
+
+    async def active_polls(self) -> list[dict]:
+        """Every poll that hasn't ended, with its saved ballots."""
+        def _load(conn):
+            polls = []
+            rows = conn.execute(
+                "SELECT id, channel_id, message_id, kind, question, options, links, author, end_time FROM polls WHERE ended = 0"
+            ).fetchall()
+            for row in rows:
+                ballots = {
+                    user_id: json.loads(ballot)
+                    for user_id, ballot in conn.execute("SELECT user_id, ballot FROM poll_ballots WHERE poll_id = ?", (row[0],))
+                }
+                polls.append({
+                    "id": row[0],
+                    "channel_id": row[1],
+                    "message_id": row[2],
+                    "kind": row[3],
+                    "question": row[4],
+                    "options": json.loads(row[5]),
+                    "links": json.loads(row[6]),
+                    "author": row[7],
+                    "end_time": row[8],
+                    "ballots": ballots,
+                })
+            return polls
+        return await self.db.run(_load)
+
+    def record_ballot(self, poll_id: int, user_id: int, ballot: list[int] | None):
+        self._ballots.set((poll_id, user_id), ballot)
+
+    async def mark_ended(self, poll_id: int):
+        await self.flush()
+        await self.db.execute("UPDATE polls SET ended = 1 WHERE id = ?", (poll_id,))
+
+    async def flush(self):
+        await self._ballots.flush()
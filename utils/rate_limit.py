@@ -0,0 +1,39 @@
+import asyncio
+import time
+
+
+class TokenBucket:
+    """Allows `rate` acquisitions per second on average, with bursts of up to `burst`.
+
+    Waiters are served in arrival order.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.capacity = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class RouteLimiter:
+    """One TokenBucket per route name, e.g. "dm" or "log"."""
+
+    def __init__(self, limits: dict[str, tuple[float, int]]):
+        self.buckets = {route: TokenBucket(rate, burst) for route, (rate, burst) in limits.items()}
+
+    async def acquire(self, route: str):
+        bucket = self.buckets.get(route)
+        if bucket:
+            await bucket.acquire()
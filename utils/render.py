@@ -0,0 +1,87 @@
+import asyncio
+import time
+
+import discord
+
+import config
+
+
+class RenderCoalescer:
+    """Collapses bursts of message edits into at most one edit per message per window.
+
+    Callers mark a message dirty with a `render` callable that returns the
+    keyword arguments for `message.edit()`, or None to skip the edit (e.g. once
+    the view has ended). The first mark after a quiet
+    period is sent straight away; marks inside the window only replace the
+    pending render, and the latest state goes out when the window ends.
+    """
+
+    def __init__(self, window: float):
+        self.window = window
+        self.marks = 0
+        self.edits_sent = 0
+        self.edits_failed = 0
+        self._pending: dict[int, tuple[discord.Message, callable]] = {}
+        self._last_edit: dict[int, float] = {}
+        self._tasks: dict[int, asyncio.Task] = {}
+
+    @property
+    def edits_saved(self) -> int:
+        return max(0, self.marks - self.edits_sent - self.edits_failed - len(self._pending))
+
+    def mark_dirty(self, message: discord.Message, render):
+        if message is None:
+            return
+        self.marks += 1
+        self._pending[message.id] = (message, render)
+        if message.id not in self._tasks:
+            self._tasks[message.id] = asyncio.create_task(self._flush(message.id))
+
+    def discard(self, message_id: int):
+        """Drop any pending edit, e.g. right before a final edit made directly."""
+        self._pending.pop(message_id, None)
+        task = self._tasks.pop(message_id, None)
+        if task:
+            task.cancel()
+
+    async def _flush(self, message_id: int):
+        try:
+            while message_id in self._pending:
+                wait = self._last_edit.get(message_id, 0) + self.window - time.monotonic()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                pending = self._pending.pop(message_id, None)
+                if pending is None:
+                    break
+                message, render = pending
+                kwargs = render()
+                if kwargs is None:
+                    continue
+                try:
+                    await message.edit(**kwargs)
+                    self.edits_sent += 1
+                except discord.HTTPException as e:
+                    self.edits_failed += 1
+                    print(f"Failed to edit message {message_id}: {e}")
+                self._last_edit[message_id] = time.monotonic()
+        finally:
+            if self._tasks.get(message_id) is asyncio.current_task():
+                del self._tasks[message_id]
+            self._prune()
+
+    def _prune(self):
+        if len(self._last_edit) < 1000:
+            return
+        cutoff = time.monotonic() - self.window
+        for message_id, at in list(self._last_edit.items()):
+            if at < cutoff and message_id not in self._tasks:
+                del self._last_edit[message_id]
+
+    def stats(self) -> str:
+        return (
+            f"{self.marks} updates requested, {self.edits_sent} edits sent, "
+            f"{self.edits_saved} edits saved, {self.edits_failed} failed"
+        )
+
+
+render_coalescer = RenderCoalescer(config.RENDER_COALESCE_SECONDS)
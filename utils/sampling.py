@@ -0,0 +1,34 @@
+import heapq
+import math
+import random
+
+
+class WeightedDraw:
+    """Weighted random order without replacement (Efraimidis-Spirakis).
+
+    Every item gets the key log(u) / weight for a uniform u in (0, 1], and
+    items come out highest key first, which gives each remaining item a
+    chance proportional to its weight at every draw. Building the heap is
+    O(n) and each draw is O(log n), so callers can keep drawing past
+    candidates they reject (e.g. ones no longer eligible) without
+    re-sampling. Building over a large pool is worth doing in an executor.
+    """
+
+    def __init__(self, weights: dict[int, float], rng: random.Random | None = None):
+        rand = (rng or random).random
+        self._heap = [
+            (math.log(1.0 - rand()) / -weight, item)
+            for item, weight in weights.items() if weight > 0
+        ]
+        heapq.heapify(self._heap)
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> int:
+        if not self._heap:
+            raise StopIteration
+        return heapq.heappop(self._heap)[1]
@@ -0,0 +1,99 @@
+import asyncio
+import heapq
+import time
+
+
+class DeadlineScheduler:
+    """Runs callbacks at wall-clock deadlines from a single min-heap.
+
+    Each key has at most one live deadline; rescheduling or cancelling a key
+    leaves its old heap entry behind, and stale entries are skipped when they
+    reach the top. One task sleeps until the earliest deadline (woken early
+    when something sooner is scheduled) and starts each due callback as its
+    own task, so a slow callback doesn't hold up the others. Deadlines that
+    are already in the past fire straight away. With `max_concurrent`, due
+    callbacks beyond that many wait their turn in deadline order.
+
+    Giveaway endings, the ticket inactivity checks and JobQueue all run on it.
+    """
+
+    def __init__(self, name: str = "scheduler", max_concurrent: int | None = None):
+        self.name = name
+        self._slots = asyncio.Semaphore(max_concurrent) if max_concurrent else None
+        self._heap: list[tuple[float, int, object]] = []
+        self._live: dict[object, tuple[float, int]] = {}
+        self._callbacks: dict[object, callable] = {}
+        self._counter = 0
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self._running: set[asyncio.Task] = set()
+
+    def __len__(self) -> int:
+        return len(self._live)
+
+    def __contains__(self, key) -> bool:
+        return key in self._live
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    def stop(self):
+        if self._task:
+            self._task.cancel()
+        for task in self._running:
+            task.cancel()
+
+    def schedule(self, key, when: float, callback):
+        """Call `await callback()` at `when` (a UNIX timestamp), replacing any earlier deadline for key."""
+        self._counter += 1
+        self._live[key] = (when, self._counter)
+        self._callbacks[key] = callback
+        heapq.heappush(self._heap, (when, self._counter, key))
+        self._wakeup.set()
+
+    def when(self, key) -> float | None:
+        """The live deadline for key, or None."""
+        live = self._live.get(key)
+        return live[0] if live else None
+
+    def cancel(self, key):
+        self._live.pop(key, None)
+        self._callbacks.pop(key, None)
+
+    async def _run(self):
+        while True:
+            if not self._heap:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            when, seq, key = self._heap[0]
+            if self._live.get(key) != (when, seq):
+                heapq.heappop(self._heap)
+                continue
+
+            delay = when - time.time()
+            if delay > 0:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            heapq.heappop(self._heap)
+            del self._live[key]
+            callback = self._callbacks.pop(key)
+            task = asyncio.create_task(self._fire(key, callback))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    async def _fire(self, key, callback):
+        try:
+            if self._slots:
+                async with self._slots:
+                    await callback()
+            else:
+                await callback()
+        except Exception as e:
+            print(f"{self.name}: job {key} failed: {e}")
@@ -0,0 +1,143 @@
+import asyncio
+import random
+import re
+import zlib
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.database import Database
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS backstory_signatures (
+    application_id INTEGER PRIMARY KEY,
+    signature BLOB NOT NULL
+);
+"""
+
+NUM_PERM = 64
+BANDS = 16  # 16 bands of 4 rows: pairs above ~50% similarity almost always share a bucket
+SHINGLE_WORDS = 3
+MERSENNE = (1 << 61) - 1
+MAX_HASH = (1 << 32) - 1
+# Fixed seed: stored signatures are only comparable if the permutations never change.
+_rng = random.Random(0x5EED)
+PERMUTATIONS = [(_rng.randrange(1, MERSENNE), _rng.randrange(0, MERSENNE)) for _ in range(NUM_PERM)]
+WORD = re.compile(r"[a-z0-9']+")
+
+
+def shingles(text: str) -> set[int]:
+    """Hashed word 3-grams, so reordered paragraphs and small edits still overlap."""
+    words = WORD.findall(text.lower())
+    if len(words) < SHINGLE_WORDS:
+        grams = [" ".join(words)] if words else []
+    else:
+        grams = [" ".join(words[i:i + SHINGLE_WORDS]) for i in range(len(words) - SHINGLE_WORDS + 1)]
+    return {zlib.crc32(gram.encode()) for gram in grams}
+
+
+def signature(text: str) -> array:
+    hashes = shingles(text)
+    if not hashes:
+        return array("Q", [MAX_HASH] * NUM_PERM)
+    return array("Q", [
+        min(((a * h + b) % MERSENNE) & MAX_HASH for h in hashes)
+        for a, b in PERMUTATIONS
+    ])
+
+
+def similarity(sig_a: array, sig_b: array) -> float:
+    """Estimated Jaccard similarity: the share of matching signature slots."""
+    return sum(x == y for x, y in zip(sig_a, sig_b)) / NUM_PERM
+
+
+class BackstoryIndex:
+    """MinHash/LSH index of application backstories.
+
+    Each backstory becomes a 64-value MinHash signature, split into 16 bands;
+    applications whose signatures agree on a whole band land in the same
+    bucket, so a query only scores the handful of candidates it shares a
+    bucket with instead of every stored application. Signatures are saved in
+    SQLite and the buckets are rebuilt from them on load. All index work runs
+    on one worker thread, which also keeps the buckets single-threaded.
+    """
+
+    def __init__(self, db: Database):
+        self.db = db
+        self._signatures: dict[int, array] = {}
+        self._buckets: list[dict[tuple, list[int]]] = [{} for _ in range(BANDS)]
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="backstory-index")
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    async def load(self):
+        await self.db.executescript(SCHEMA)
+        rows = await self.db.fetchall("SELECT application_id, signature FROM backstory_signatures")
+
+        def _build():
+            for application_id, blob in rows:
+                sig = array("Q")
+                sig.frombytes(blob)
+                self._insert(application_id, sig)
+        await self._run(_build)
+
+    async def _run(self, fn, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, fn, *args)
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+
+    def _bands(self, sig: array):
+        rows = NUM_PERM // BANDS
+        for band in range(BANDS):
+            yield band, tuple(sig[band * rows:(band + 1) * rows])
+
+    def _insert(self, application_id: int, sig: array):
+        self._signatures[application_id] = sig
+        for band, key in self._bands(sig):
+            self._buckets[band].setdefault(key, []).append(application_id)
+
+    def _query(self, sig: array, limit: int, min_score: float) -> list[tuple[int, float]]:
+        candidates = set()
+        for band, key in self._bands(sig):
+            candidates.update(self._buckets[band].get(key, ()))
+        scored = [(application_id, similarity(sig, self._signatures[application_id])) for application_id in candidates]
+        scored = [match for match in scored if match[1] >= min_score]
+        scored.sort(key=lambda match: -match[1])
+        return scored[:limit]
+
+    async def backfill(self) -> int:
+        """Index applications saved before they had a signature. Expects the applications table in the same database."""
+        rows = await self.db.fetchall(
+            "SELECT a.id, a.backstory FROM applications a "
+            "LEFT JOIN backstory_signatures s ON s.application_id = a.id WHERE s.application_id IS NULL"
+        )
+
+        def _sign():
+            signed = []
+            for application_id, text in rows:
+                sig = signature(text)
+                self._insert(application_id, sig)
+                signed.append((application_id, sig.tobytes()))
+            return signed
+        signed = await self._run(_sign)
+        if signed:
+            await self.db.executemany(
+                "INSERT OR REPLACE INTO backstory_signatures (application_id, signature) VALUES (?, ?)", signed
+            )
+        return len(signed)
+
+    async def add(self, application_id: int, text: str, limit: int = 3, min_score: float = 0.3) -> list[tuple[int, float]]:
+        """Index a new backstory and return the closest earlier ones as (application id, similarity)."""
+        def _add():
+            sig = signature(text)
+            matches = self._query(sig, limit, min_score)
+            self._insert(application_id, sig)
+            return sig, matches
+        sig, matches = await self._run(_add)
+        await self.db.execute(
+            "INSERT OR REPLACE INTO backstory_signatures (application_id, signature) VALUES (?, ?)",
+            (application_id, sig.tobytes())
+        )
+        return matches
@@ -0,0 +1,106 @@
+import asyncio
+import copy
+import json
+import os
+import tempfile
+from contextlib import asynccontextmanager
+
+
+def atomic_write_json(path: str, data) -> None:
+    """Write data to a temp file next to path, then rename it over path."""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=".tmp-", suffix=".json", dir=directory)
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f, indent=4)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+class JsonStore:
+    """In-memory copy of a JSON file.
+
+    Readers get the current snapshot without touching disk. Writers go through
+    `edit()`, which works on a deep copy and swaps it in once the block exits,
+    so a snapshot handed out earlier never changes under the reader. Saves are
+    serialized and done in an executor. A watcher task picks up hand edits by
+    polling the file's mtime.
+    """
+
+    def __init__(self, path: str, default=dict, poll_interval: float = 5.0):
+        self.path = path
+        self.default = default
+        self.poll_interval = poll_interval
+        self._lock = asyncio.Lock()
+        self._watcher: asyncio.Task | None = None
+
+        if not os.path.exists(self.path):
+            atomic_write_json(self.path, self.default())
+        self._data, self._mtime = self._read()
+
+    def _read(self):
+        with open(self.path, "r") as f:
+            data = json.load(f)
+        return data, os.stat(self.path).st_mtime_ns
+
+    def _write(self, data) -> int:
+        atomic_write_json(self.path, data)
+        return os.stat(self.path).st_mtime_ns
+
+    def _stat(self) -> int | None:
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def snapshot(self):
+        """Return the current data. Treat it as read-only."""
+        return self._data
+
+    @asynccontextmanager
+    async def edit(self):
+        """Yield a private copy of the data and persist it on exit.
+
+        If the block raises, the copy is dropped and nothing is written.
+        """
+        async with self._lock:
+            data = copy.deepcopy(self._data)
+            yield data
+            self._data = data
+            loop = asyncio.get_running_loop()
+            self._mtime = await loop.run_in_executor(None, self._write, data)
+
+    async def reload(self):
+        """Re-read the file if it changed on disk since we last saw it."""
+        loop = asyncio.get_running_loop()
+        async with self._lock:
+            mtime = await loop.run_in_executor(None, self._stat)
+            if mtime is None or mtime == self._mtime:
+                return False
+            self._data, self._mtime = await loop.run_in_executor(None, self._read)
+            return True
+
+    async def _watch(self):
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                if await self.reload():
+                    print(f"Reloaded {self.path} (changed on disk)")
+            except (OSError, ValueError) as e:
+                print(f"Failed to reload {self.path}: {e}")
+
+    def start_watching(self):
+        if self._watcher is None or self._watcher.done():
+            self._watcher = asyncio.create_task(self._watch())
+
+    def stop_watching(self):
+        if self._watcher:
+            self._watcher.cancel()
+            self._watcher = None
@@ -0,0 +1,157 @@
+import re
+import time
+from dataclasses import dataclass
+
+from utils.database import Database
+from utils.transcripts import read_spool
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS archived_tickets (
+    id INTEGER PRIMARY KEY,
+    channel_id INTEGER NOT NULL,
+    channel_name TEXT NOT NULL,
+    ticket_type TEXT,
+    opener_id INTEGER,
+    closed_by INTEGER,
+    reason TEXT,
+    opened_at REAL,
+    closed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS archived_tickets_type ON archived_tickets (ticket_type, closed_at);
+CREATE UNIQUE INDEX IF NOT EXISTS archived_tickets_channel ON archived_tickets (channel_id);
+
+CREATE TABLE IF NOT EXISTS archived_messages (
+    id INTEGER PRIMARY KEY,
+    ticket_id INTEGER NOT NULL REFERENCES archived_tickets (id),
+    author_id INTEGER NOT NULL,
+    author_name TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    content TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS archived_messages_ticket ON archived_messages (ticket_id, created_at);
+CREATE INDEX IF NOT EXISTS archived_messages_author ON archived_messages (author_id, created_at);
+CREATE INDEX IF NOT EXISTS archived_messages_time ON archived_messages (created_at);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS archived_messages_fts USING fts5 (
+    content, content='archived_messages', content_rowid='id', tokenize='unicode61'
+);
+"""
+
+INSERT_BATCH = 500
+
+
+@dataclass
+class SearchResult:
+    channel_name: str
+    ticket_type: str | None
+    author_id: int
+    author_name: str
+    created_at: float
+    content: str
+
+
+def fts_query(text: str) -> str | None:
+    """Turn free text into an FTS5 query that matches every word (prefix match on the last one)."""
+    words = re.findall(r"\w+", text)
+    if not words:
+        return None
+    terms = [f'"{word}"' for word in words]
+    terms[-1] += "*"
+    return " ".join(terms)
+
+
+class TicketArchive:
+    """Closed-ticket transcripts in SQLite with an FTS5 index over message content."""
+
+    def __init__(self, db: Database):
+        self.db = db
+
+    async def setup(self):
+        await self.db.executescript(SCHEMA)
+
+    async def archive(self, spool_path: str, channel_id: int, channel_name: str, ticket_type: str | None,
+                      opener_id: int | None, closed_by: int, reason: str, opened_at: float | None) -> int:
+        """Store a ticket and every message from its transcript spool. Returns the archive id.
+
+        Archiving the same channel twice replaces the earlier copy, so a retried
+        close does not duplicate messages.
+        """
+        def _archive(conn):
+            with conn:
+                previous = conn.execute("SELECT id FROM archived_tickets WHERE channel_id = ?", (channel_id,)).fetchone()
+                if previous:
+                    conn.execute(
+                        "INSERT INTO archived_messages_fts (archived_messages_fts, rowid, content) "
+                        "SELECT 'delete', id, content FROM archived_messages WHERE ticket_id = ?",
+                        (previous[0],)
+                    )
+                    conn.execute("DELETE FROM archived_messages WHERE ticket_id = ?", (previous[0],))
+                    conn.execute("DELETE FROM archived_tickets WHERE id = ?", (previous[0],))
+
+                ticket_id = conn.execute(
+                    "INSERT INTO archived_tickets (channel_id, channel_name, ticket_type, opener_id, closed_by, reason, opened_at, closed_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (channel_id, channel_name, ticket_type, opener_id, closed_by, reason, opened_at, time.time())
+                ).lastrowid
+
+                batch = []
+                for record in read_spool(spool_path):
+                    content = record["content"]
+                    if record["attachments"]:
+                        content = " ".join([content, *record["attachments"]]).strip()
+                    batch.append((ticket_id, record["author_id"], record["author"], record["timestamp"], content))
+                    if len(batch) >= INSERT_BATCH:
+                        _insert_messages(conn, batch)
+                        batch = []
+                if batch:
+                    _insert_messages(conn, batch)
+                conn.execute(
+                    "INSERT INTO archived_messages_fts (rowid, content) SELECT id, content FROM archived_messages WHERE ticket_id = ?",
+                    (ticket_id,)
+                )
+                return ticket_id
+
+        return await self.db.run(_archive)
+
+    async def search(self, text: str | None = None, author_id: int | None = None, ticket_type: str | None = None,
+                     since: float | None = None, until: float | None = None,
+                     limit: int = 10, offset: int = 0) -> tuple[list[SearchResult], bool]:
+        """Return one page of matching messages, newest first, and whether there are more."""
+        clauses = []
+        params = []
+        match = fts_query(text) if text else None
+        if match:
+            source = "archived_messages_fts f JOIN archived_messages m ON m.id = f.rowid"
+            clauses.append("archived_messages_fts MATCH ?")
+            params.append(match)
+        else:
+            source = "archived_messages m"
+        if author_id is not None:
+            clauses.append("m.author_id = ?")
+            params.append(author_id)
+        if ticket_type:
+            clauses.append("t.ticket_type = ?")
+            params.append(ticket_type)
+        if since is not None:
+            clauses.append("m.created_at >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("m.created_at < ?")
+            params.append(until)
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        sql = (
+            "SELECT t.channel_name, t.ticket_type, m.author_id, m.author_name, m.created_at, m.content "
+            f"FROM {source} JOIN archived_tickets t ON t.id = m.ticket_id "
+            f"{where} ORDER BY m.created_at DESC LIMIT ? OFFSET ?"
+        )
+        rows = await self.db.fetchall(sql, (*params, limit + 1, offset))
+        results = [SearchResult(*row) for row in rows[:limit]]
+        return results, len(rows) > limit
+
+
+def _insert_messages(conn, batch):
+    conn.executemany(
+        "INSERT INTO archived_messages (ticket_id, author_id, author_name, created_at, content) VALUES (?, ?, ?, ?, ?)",
+        batch
+    )
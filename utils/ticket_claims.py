@@ -0,0 +1,165 @@
+import asyncio
+import time
+from dataclasses import dataclass
+
+import discord
+
+from utils.database import Database
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS ticket_claims (
+    channel_id INTEGER PRIMARY KEY,
+    claimed_by INTEGER NOT NULL,
+    claimed_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS ticket_claim_history (
+    id INTEGER PRIMARY KEY,
+    channel_id INTEGER NOT NULL,
+    action TEXT NOT NULL,
+    actor_id INTEGER NOT NULL,
+    target_id INTEGER,
+    at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ticket_claim_history_channel ON ticket_claim_history (channel_id, at);
+"""
+
+# Discord allows two topic edits per channel per ten minutes.
+TOPIC_EDIT_INTERVAL = 300
+
+
+@dataclass
+class Claim:
+    channel_id: int
+    claimed_by: int
+    claimed_at: float
+
+
+@dataclass
+class ClaimEvent:
+    action: str
+    actor_id: int
+    target_id: int | None
+    at: float
+
+
+def parse_claim_topic(topic: str | None) -> int | None:
+    if not topic or "claimed_by:" not in topic:
+        return None
+    try:
+        return int(topic.split("claimed_by:")[1].strip())
+    except ValueError:
+        return None
+
+
+class TicketClaims:
+    """Who owns each ticket, plus an append-only claim history.
+
+    The current claim is checked and set in memory before anything is awaited,
+    so two staff clicking Claim at once can't both win.
+    """
+
+    def __init__(self, db: Database):
+        self.db = db
+        self._claims: dict[int, Claim] = {}
+
+    async def load(self):
+        await self.db.executescript(SCHEMA)
+        rows = await self.db.fetchall("SELECT channel_id, claimed_by, claimed_at FROM ticket_claims")
+        self._claims = {row[0]: Claim(*row) for row in rows}
+
+    def get(self, channel_id: int) -> Claim | None:
+        return self._claims.get(channel_id)
+
+    async def _record(self, channel_id: int, action: str, actor_id: int, target_id: int | None):
+        await self.db.execute(
+            "INSERT INTO ticket_claim_history (channel_id, action, actor_id, target_id, at) VALUES (?, ?, ?, ?, ?)",
+            (channel_id, action, actor_id, target_id, time.time())
+        )
+
+    async def _store(self, claim: Claim):
+        await self.db.execute(
+            "INSERT OR REPLACE INTO ticket_claims (channel_id, claimed_by, claimed_at) VALUES (?, ?, ?)",
+            (claim.channel_id, claim.claimed_by, claim.claimed_at)
+        )
+
+    async def claim(self, channel_id: int, user_id: int) -> bool:
+        """Claim an unclaimed ticket. Returns False if someone already holds it."""
+        if channel_id in self._claims:
+            return False
+        claim = Claim(channel_id, user_id, time.time())
+        self._claims[channel_id] = claim
+        await self._store(claim)
+        await self._record(channel_id, "claim", user_id, user_id)
+        return True
+
+    async def unclaim(self, channel_id: int, actor_id: int) -> Claim | None:
+        claim = self._claims.pop(channel_id, None)
+        if claim:
+            await self.db.execute("DELETE FROM ticket_claims WHERE channel_id = ?", (channel_id,))
+            await self._record(channel_id, "unclaim", actor_id, claim.claimed_by)
+        return claim
+
+    async def transfer(self, channel_id: int, actor_id: int, target_id: int) -> Claim:
+        claim = Claim(channel_id, target_id, time.time())
+        self._claims[channel_id] = claim
+        await self._store(claim)
+        await self._record(channel_id, "transfer", actor_id, target_id)
+        return claim
+
+    async def forget(self, channel_id: int):
+        """Drop the current claim for a deleted channel. History is kept."""
+        if self._claims.pop(channel_id, None):
+            await self.db.execute("DELETE FROM ticket_claims WHERE channel_id = ?", (channel_id,))
+
+    async def history(self, channel_id: int) -> list[ClaimEvent]:
+        rows = await self.db.fetchall(
+            "SELECT action, actor_id, target_id, at FROM ticket_claim_history WHERE channel_id = ? ORDER BY at",
+            (channel_id,)
+        )
+        return [ClaimEvent(*row) for row in rows]
+
+
+class TopicMirror:
+    """Best-effort channel topic updates, at most one edit per channel per interval.
+
+    Only the latest wanted topic is written; intermediate states are skipped.
+    """
+
+    def __init__(self, interval: float = TOPIC_EDIT_INTERVAL):
+        self.interval = interval
+        self._wanted: dict[int, tuple[discord.TextChannel, str]] = {}
+        self._last_edit: dict[int, float] = {}
+        self._tasks: dict[int, asyncio.Task] = {}
+
+    def update(self, channel: discord.TextChannel, topic: str):
+        self._wanted[channel.id] = (channel, topic)
+        if channel.id not in self._tasks:
+            self._tasks[channel.id] = asyncio.create_task(self._flush(channel.id))
+
+    async def _flush(self, channel_id: int):
+        try:
+            while channel_id in self._wanted:
+                wait = self._last_edit.get(channel_id, 0) + self.interval - time.monotonic()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                channel, topic = self._wanted.pop(channel_id)
+                if (channel.topic or "") == topic:
+                    continue
+                try:
+                    await channel.edit(topic=topic)
+                except discord.HTTPException:
+                    pass
+                self._last_edit[channel_id] = time.monotonic()
+        finally:
+            self._tasks.pop(channel_id, None)
+
+    def forget(self, channel_id: int):
+        self._wanted.pop(channel_id, None)
+        self._last_edit.pop(channel_id, None)
+        task = self._tasks.pop(channel_id, None)
+        if task:
+            task.cancel()
+
+    def cancel_all(self):
+        for channel_id in list(self._tasks):
+            self.forget(channel_id)
@@ -0,0 +1,172 @@
+import asyncio
+import time
+from dataclasses import dataclass
+from functools import partial
+
+from utils.database import Database
+from utils.scheduler import DeadlineScheduler
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS ticket_activity (
+    channel_id INTEGER PRIMARY KEY,
+    last_activity REAL NOT NULL,
+    warned INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+FLUSH_INTERVAL = 60
+
+
+@dataclass
+class Activity:
+    last_activity: float
+    warned: bool = False
+
+
+class InactivityScheduler:
+    """Warns about and closes idle tickets from one DeadlineScheduler.
+
+    Each ticket has at most one live deadline. Messages only update the
+    in-memory last-activity time; when a deadline comes due the real one is
+    recomputed and rescheduled if the ticket saw activity since.
+    Activity is written to SQLite in batches every FLUSH_INTERVAL seconds.
+
+    `policy(channel_id)` returns (warn_after, close_after) in seconds, 0 to
+    disable either, or None if the channel is not a ticket. `on_warn` and
+    `on_close` are coroutines taking the channel id; set them before `start()`.
+    """
+
+    def __init__(self, db: Database, policy, on_warn=None, on_close=None):
+        self.db = db
+        self.policy = policy
+        self.on_warn = on_warn
+        self.on_close = on_close
+        self._activity: dict[int, Activity] = {}
+        self._deadlines = DeadlineScheduler("ticket inactivity")
+        self._dirty: set[int] = set()
+        self._removed: set[int] = set()
+        self._flush_task: asyncio.Task | None = None
+
+    async def load(self):
+        await self.db.executescript(SCHEMA)
+        rows = await self.db.fetchall("SELECT channel_id, last_activity, warned FROM ticket_activity")
+        for channel_id, last_activity, warned in rows:
+            self._activity[channel_id] = Activity(last_activity, bool(warned))
+
+    def start(self):
+        self._deadlines.start()
+        self._flush_task = asyncio.create_task(self._flush_loop())
+
+    async def stop(self):
+        self._deadlines.stop()
+        if self._flush_task:
+            self._flush_task.cancel()
+        await self.flush()
+
+    def track(self, channel_id: int, last_activity: float | None = None):
+        """Start watching a ticket. Keeps any stored activity newer than last_activity.
+
+        Newer activity than what's stored, e.g. a reply sent while the bot was
+        offline, clears an earlier warning just like `touch()` does.
+        """
+        activity = self._activity.get(channel_id)
+        if activity is None:
+            self._activity[channel_id] = Activity(last_activity or time.time())
+            self._dirty.add(channel_id)
+        elif last_activity and last_activity > activity.last_activity:
+            activity.last_activity = last_activity
+            activity.warned = False
+            self._dirty.add(channel_id)
+        self._removed.discard(channel_id)
+        self._schedule(channel_id)
+
+    def last_activity(self, channel_id: int) -> float | None:
+        activity = self._activity.get(channel_id)
+        return activity.last_activity if activity else None
+
+    def touch(self, channel_id: int, at: float | None = None):
+        """Record activity in a ticket channel."""
+        activity = self._activity.get(channel_id)
+        if activity is None:
+            return self.track(channel_id, at)
+        activity.last_activity = max(activity.last_activity, at or time.time())
+        activity.warned = False
+        self._dirty.add(channel_id)
+        # The existing deadline is re-evaluated when it fires, so no reschedule here.
+        if channel_id not in self._deadlines:
+            self._schedule(channel_id)
+
+    def forget(self, channel_id: int):
+        if self._activity.pop(channel_id, None) is not None:
+            self._removed.add(channel_id)
+        self._dirty.discard(channel_id)
+        self._deadlines.cancel(channel_id)
+
+    def _next_deadline(self, channel_id: int) -> float | None:
+        activity = self._activity.get(channel_id)
+        policy = self.policy(channel_id)
+        if activity is None or policy is None:
+            return None
+        warn_after, close_after = policy
+        deadlines = []
+        if warn_after and not activity.warned:
+            deadlines.append(activity.last_activity + warn_after)
+        if close_after:
+            deadlines.append(activity.last_activity + close_after)
+        return min(deadlines) if deadlines else None
+
+    def _schedule(self, channel_id: int):
+        deadline = self._next_deadline(channel_id)
+        if deadline is None:
+            self._deadlines.cancel(channel_id)
+            return
+        if self._deadlines.when(channel_id) == deadline:
+            return
+        self._deadlines.schedule(channel_id, deadline, partial(self._fire, channel_id))
+
+    async def _fire(self, channel_id: int):
+        activity = self._activity.get(channel_id)
+        policy = self.policy(channel_id)
+        if activity is None or policy is None:
+            return
+        warn_after, close_after = policy
+        idle = time.time() - activity.last_activity
+
+        if close_after and idle >= close_after:
+            self.forget(channel_id)
+            await self.on_close(channel_id)
+            return
+        if warn_after and not activity.warned and idle >= warn_after:
+            activity.warned = True
+            self._dirty.add(channel_id)
+            await self.on_warn(channel_id)
+        self._schedule(channel_id)
+
+    async def flush(self):
+        if not self._dirty and not self._removed:
+            return
+        rows = [
+            (channel_id, self._activity[channel_id].last_activity, int(self._activity[channel_id].warned))
+            for channel_id in self._dirty if channel_id in self._activity
+        ]
+        removed = [(channel_id,) for channel_id in self._removed]
+        self._dirty.clear()
+        self._removed.clear()
+        if rows:
+            await self.db.executemany(
+                "INSERT OR REPLACE INTO ticket_activity (channel_id, last_activity, warned) VALUES (?, ?, ?)", rows
+            )
+        if removed:
+            await self.db.executemany("DELETE FROM ticket_activity WHERE channel_id = ?", removed)
+
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(FLUSH_INTERVAL)
+            # Picks up tickets whose type had no policy until the config was edited.
+            for channel_id in list(self._activity):
+                if channel_id not in self._deadlines:
+                    self._schedule(channel_id)
+            try:
+                await self.flush()
+            except Exception as e:
+                print(f"Failed to save ticket activity: {e}")
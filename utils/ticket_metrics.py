@@ -0,0 +1,233 @@
+import asyncio
+import bisect
+import json
+import math
+import time
+from dataclasses import dataclass
+
+from utils.database import Database
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS ticket_sla (
+    channel_id INTEGER PRIMARY KEY,
+    ticket_type TEXT NOT NULL,
+    opened_at REAL NOT NULL,
+    claimed_at REAL,
+    claimed_by INTEGER,
+    closed_at REAL,
+    closed_by INTEGER
+);
+CREATE TABLE IF NOT EXISTS ticket_histograms (
+    metric TEXT NOT NULL,
+    scope TEXT NOT NULL,
+    key TEXT NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (metric, scope, key)
+);
+"""
+
+# Log-spaced bucket upper bounds from 1 second to ~30 days, 10% apart.
+GROWTH = 1.1
+BUCKET_BOUNDS = [GROWTH ** i for i in range(int(math.log(30 * 86400, GROWTH)) + 2)]
+
+FLUSH_INTERVAL = 60
+
+
+class Histogram:
+    """Fixed log-bucketed histogram: constant memory, percentiles within ~10%."""
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKET_BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def add(self, value: float):
+        value = max(0.0, value)
+        self.counts[bisect.bisect_left(BUCKET_BOUNDS, value)] += 1
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def percentile(self, q: float) -> float | None:
+        if not self.count:
+            return None
+        rank = max(1, math.ceil(q / 100 * self.count))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                upper = BUCKET_BOUNDS[index] if index < len(BUCKET_BOUNDS) else self.max
+                return min(max(upper, self.min), self.max)
+        return self.max
+
+    @property
+    def mean(self) -> float | None:
+        return self.total / self.count if self.count else None
+
+    def summary(self) -> dict:
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "min": self.min,
+            "max": self.max,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+        }
+
+    def to_dict(self) -> dict:
+        # Only non-empty buckets are stored.
+        return {
+            "buckets": {str(i): c for i, c in enumerate(self.counts) if c},
+            "count": self.count,
+            "total": self.total,
+            "min": self.min,
+            "max": self.max,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Histogram":
+        histogram = cls()
+        for index, count in data["buckets"].items():
+            if int(index) < len(histogram.counts):
+                histogram.counts[int(index)] = count
+        histogram.count = data["count"]
+        histogram.total = data["total"]
+        histogram.min = data["min"]
+        histogram.max = data["max"]
+        return histogram
+
+
+@dataclass
+class TicketTimes:
+    channel_id: int
+    ticket_type: str
+    opened_at: float
+    claimed_at: float | None = None
+    claimed_by: int | None = None
+    closed_at: float | None = None
+    closed_by: int | None = None
+
+
+def format_duration(seconds: float | None) -> str:
+    if seconds is None:
+        return "n/a"
+    seconds = int(seconds)
+    days, seconds = divmod(seconds, 86400)
+    hours, seconds = divmod(seconds, 3600)
+    minutes, seconds = divmod(seconds, 60)
+    parts = [f"{v}{u}" for v, u in ((days, "d"), (hours, "h"), (minutes, "m"), (seconds, "s")) if v]
+    return " ".join(parts[:2]) if parts else "0s"
+
+
+class TicketMetrics:
+    """Open/claim/close times per ticket, folded into histograms as they happen.
+
+    Histograms are kept per ticket type (scope "type") and per staff member
+    (scope "staff") and saved in batches, so stats never rescan old tickets.
+    """
+
+    def __init__(self, db: Database):
+        self.db = db
+        self._open: dict[int, TicketTimes] = {}
+        self._histograms: dict[tuple[str, str, str], Histogram] = {}
+        self._dirty_histograms: set[tuple[str, str, str]] = set()
+        self._dirty_tickets: dict[int, TicketTimes] = {}
+        self._task: asyncio.Task | None = None
+
+    async def load(self):
+        await self.db.executescript(SCHEMA)
+        rows = await self.db.fetchall("SELECT * FROM ticket_sla WHERE closed_at IS NULL")
+        self._open = {row[0]: TicketTimes(*row) for row in rows}
+        rows = await self.db.fetchall("SELECT metric, scope, key, data FROM ticket_histograms")
+        self._histograms = {(m, s, k): Histogram.from_dict(json.loads(d)) for m, s, k, d in rows}
+
+    def start(self):
+        self._task = asyncio.create_task(self._flush_loop())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+        await self.flush()
+
+    def _observe(self, metric: str, value: float, ticket_type: str, staff_id: int | None):
+        keys = [(metric, "type", ticket_type), (metric, "all", "")]
+        if staff_id:
+            keys.append((metric, "staff", str(staff_id)))
+        for key in keys:
+            self._histograms.setdefault(key, Histogram()).add(value)
+            self._dirty_histograms.add(key)
+
+    def opened(self, channel_id: int, ticket_type: str, opened_at: float | None = None):
+        if channel_id in self._open:
+            return
+        times = TicketTimes(channel_id, ticket_type, opened_at or time.time())
+        self._open[channel_id] = times
+        self._dirty_tickets[channel_id] = times
+
+    def claimed(self, channel_id: int, user_id: int, at: float | None = None):
+        """Record the first claim of a ticket; later claims don't count."""
+        times = self._open.get(channel_id)
+        if not times or times.claimed_at is not None:
+            return
+        times.claimed_at = at or time.time()
+        times.claimed_by = user_id
+        self._dirty_tickets[channel_id] = times
+        self._observe("time_to_claim", times.claimed_at - times.opened_at, times.ticket_type, user_id)
+
+    def closed(self, channel_id: int, user_id: int | None, at: float | None = None, automatic: bool = False):
+        """Record a close. `automatic` closes (by the bot itself) are only credited to a claimer."""
+        times = self._open.pop(channel_id, None)
+        if not times:
+            return
+        times.closed_at = at or time.time()
+        times.closed_by = user_id
+        self._dirty_tickets[channel_id] = times
+        # Close time is credited to whoever owned the ticket, falling back to who closed it.
+        staff_id = times.claimed_by or (None if automatic else user_id)
+        self._observe("time_to_close", times.closed_at - times.opened_at, times.ticket_type, staff_id)
+
+    def histogram(self, metric: str, scope: str, key="") -> Histogram:
+        return self._histograms.get((metric, scope, str(key))) or Histogram()
+
+    def keys(self, scope: str) -> list[str]:
+        return sorted({k for _, s, k in self._histograms if s == scope})
+
+    def export(self) -> dict:
+        data = {"generated_at": time.time(), "bucket_bounds": BUCKET_BOUNDS, "metrics": []}
+        for (metric, scope, key), histogram in sorted(self._histograms.items()):
+            data["metrics"].append({
+                "metric": metric,
+                "scope": scope,
+                "key": key,
+                **histogram.summary(),
+                "buckets": histogram.to_dict()["buckets"],
+            })
+        return data
+
+    async def flush(self):
+        tickets = list(self._dirty_tickets.values())
+        histograms = [(*key, json.dumps(self._histograms[key].to_dict())) for key in self._dirty_histograms]
+        self._dirty_tickets.clear()
+        self._dirty_histograms.clear()
+        if tickets:
+            await self.db.executemany(
+                "INSERT OR REPLACE INTO ticket_sla (channel_id, ticket_type, opened_at, claimed_at, claimed_by, closed_at, closed_by) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(t.channel_id, t.ticket_type, t.opened_at, t.claimed_at, t.claimed_by, t.closed_at, t.closed_by) for t in tickets]
+            )
+        if histograms:
+            await self.db.executemany(
+                "INSERT OR REPLACE INTO ticket_histograms (metric, scope, key, data) VALUES (?, ?, ?, ?)", histograms
+            )
+
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(FLUSH_INTERVAL)
+            try:
+                await self.flush()
+            except Exception as e:
+                print(f"Failed to save ticket metrics: {e}")
@@ -0,0 +1,86 @@
+import time
+from collections import Counter, deque
+
+from utils.database import Database
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS ticket_pool (
+    channel_id INTEGER PRIMARY KEY,
+    ticket_type TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+"""
+
+
+class TicketChannelPool:
+    """Hidden, pre-created ticket channels waiting to be handed to a user.
+
+    Channel ids are kept per ticket type in memory and in SQLite, so the pool
+    survives restarts. Hit/miss counters are per ticket type and in-memory.
+    """
+
+    def __init__(self, db: Database):
+        self.db = db
+        self._channels: dict[str, deque[int]] = {}
+        self._types: dict[int, str] = {}
+        self.last_refill: dict[str, float] = {}
+        self.hits = Counter()
+        self.misses = Counter()
+
+    async def load(self):
+        await self.db.executescript(SCHEMA)
+        rows = await self.db.fetchall("SELECT channel_id, ticket_type FROM ticket_pool ORDER BY created_at")
+        self._channels.clear()
+        self._types.clear()
+        for channel_id, ticket_type in rows:
+            self._channels.setdefault(ticket_type, deque()).append(channel_id)
+            self._types[channel_id] = ticket_type
+
+    def size(self, ticket_type: str) -> int:
+        return len(self._channels.get(ticket_type, ()))
+
+    def __contains__(self, channel_id: int) -> bool:
+        return channel_id in self._types
+
+    def channel_ids(self) -> list[int]:
+        return list(self._types)
+
+    async def add(self, ticket_type: str, channel_id: int):
+        self._channels.setdefault(ticket_type, deque()).append(channel_id)
+        self._types[channel_id] = ticket_type
+        self.last_refill[ticket_type] = time.time()
+        await self.db.execute(
+            "INSERT OR REPLACE INTO ticket_pool (channel_id, ticket_type, created_at) VALUES (?, ?, ?)",
+            (channel_id, ticket_type, time.time())
+        )
+
+    async def take(self, ticket_type: str) -> int | None:
+        """Pop the oldest pooled channel id for this type, counting a hit or a miss."""
+        channels = self._channels.get(ticket_type)
+        if not channels:
+            self.misses[ticket_type] += 1
+            return None
+        channel_id = channels.popleft()
+        del self._types[channel_id]
+        self.hits[ticket_type] += 1
+        await self.db.execute("DELETE FROM ticket_pool WHERE channel_id = ?", (channel_id,))
+        return channel_id
+
+    async def discard(self, channel_id: int):
+        ticket_type = self._types.pop(channel_id, None)
+        if ticket_type is None:
+            return
+        try:
+            self._channels[ticket_type].remove(channel_id)
+        except ValueError:
+            pass
+        await self.db.execute("DELETE FROM ticket_pool WHERE channel_id = ?", (channel_id,))
+
+    def due(self, ticket_type: str, pool_size: int, refill_seconds: float) -> bool:
+        """True if this type is below pool_size and its refill interval has passed."""
+        if self.size(ticket_type) >= pool_size:
+            return False
+        return time.time() - self.last_refill.get(ticket_type, 0) >= refill_seconds
+
+    def stats(self, ticket_type: str) -> str:
+        return f"{self.size(ticket_type)} ready, {self.hits[ticket_type]} hits, {self.misses[ticket_type]} misses"
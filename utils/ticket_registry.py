@@ -0,0 +1,132 @@
+import time
+from dataclasses import dataclass
+
+from utils.database import Database
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tickets (
+    channel_id INTEGER PRIMARY KEY,
+    user_id INTEGER NOT NULL,
+    ticket_type TEXT NOT NULL,
+    opened_at REAL NOT NULL
+);
+-- Not unique: a user can end up with two tickets of one type (e.g. opened
+-- by hand), and both must stay closable.
+DROP INDEX IF EXISTS tickets_owner;
+CREATE INDEX IF NOT EXISTS tickets_by_owner ON tickets (user_id, ticket_type);
+"""
+
+
+@dataclass
+class TicketRecord:
+    channel_id: int
+    user_id: int
+    ticket_type: str
+    opened_at: float
+
+
+def parse_ticket_channel_name(name: str, slugs: dict[str, str]) -> tuple[str, int] | None:
+    """Split `<slug>-<user id>` into (ticket type, user id) using a slug -> type map."""
+    slug, _, user_id = name.rpartition("-")
+    if not slug or not user_id.isdigit() or slug not in slugs:
+        return None
+    return slugs[slug], int(user_id)
+
+
+class TicketRegistry:
+    """Open tickets indexed by channel id and by (user id, ticket type).
+
+    Lookups are served from memory; every change is mirrored to SQLite so the
+    registry survives restarts. An owner can have more than one ticket of a
+    type; every one of them stays in the registry.
+    """
+
+    def __init__(self, db: Database):
+        self.db = db
+        self._by_channel: dict[int, TicketRecord] = {}
+        self._by_owner: dict[tuple[int, str], list[int]] = {}
+
+    async def load(self):
+        await self.db.executescript(SCHEMA)
+        rows = await self.db.fetchall("SELECT channel_id, user_id, ticket_type, opened_at FROM tickets")
+        self._by_channel.clear()
+        self._by_owner.clear()
+        for row in rows:
+            self._index(TicketRecord(*row))
+
+    def _index(self, record: TicketRecord):
+        self._by_channel[record.channel_id] = record
+        self._by_owner.setdefault((record.user_id, record.ticket_type), []).append(record.channel_id)
+
+    def _unindex(self, channel_id: int) -> TicketRecord | None:
+        record = self._by_channel.pop(channel_id, None)
+        if record:
+            key = (record.user_id, record.ticket_type)
+            owned = self._by_owner.get(key, [])
+            if channel_id in owned:
+                owned.remove(channel_id)
+            if not owned:
+                self._by_owner.pop(key, None)
+        return record
+
+    def get(self, channel_id: int) -> TicketRecord | None:
+        return self._by_channel.get(channel_id)
+
+    def find(self, user_id: int, ticket_type: str) -> int | None:
+        """Return the channel id of the user's open ticket of this type (the newest if there are several)."""
+        owned = self._by_owner.get((user_id, ticket_type))
+        return owned[-1] if owned else None
+
+    def __len__(self):
+        return len(self._by_channel)
+
+    def __iter__(self):
+        return iter(list(self._by_channel.values()))
+
+    async def add(self, channel_id: int, user_id: int, ticket_type: str, opened_at: float | None = None) -> TicketRecord:
+        existing = self._by_channel.get(channel_id)
+        if existing and existing.user_id == user_id and existing.ticket_type == ticket_type:
+            return existing
+        self._unindex(channel_id)
+
+        record = TicketRecord(channel_id, user_id, ticket_type, opened_at or time.time())
+        self._index(record)
+        await self.db.execute(
+            "INSERT OR REPLACE INTO tickets (channel_id, user_id, ticket_type, opened_at) VALUES (?, ?, ?, ?)",
+            (record.channel_id, record.user_id, record.ticket_type, record.opened_at)
+        )
+        return record
+
+    async def remove(self, channel_id: int) -> TicketRecord | None:
+        record = self._unindex(channel_id)
+        if record:
+            await self.db.execute("DELETE FROM tickets WHERE channel_id = ?", (channel_id,))
+        return record
+
+    async def rebuild(self, channels, slugs: dict[str, str]) -> list[int]:
+        """Reconcile the registry with the guild's text channels.
+
+        `channels` is every text channel in the guild, whatever its category,
+        since ticket types can have no category or move to another one.
+        Records are only dropped when their channel no longer exists; ticket
+        channels we don't know about (e.g. opened while the bot was offline)
+        are found by name and added. Returns the channel ids that were dropped.
+        """
+        existing = set()
+        for channel in channels:
+            existing.add(channel.id)
+            if channel.id in self._by_channel:
+                continue
+            parsed = parse_ticket_channel_name(channel.name, slugs)
+            if parsed:
+                ticket_type, user_id = parsed
+                await self.add(channel.id, user_id, ticket_type, channel.created_at.timestamp())
+
+        removed = [cid for cid in self._by_channel if cid not in existing]
+        for channel_id in removed:
+            await self.remove(channel_id)
+        return removed
+
+    def duplicates(self) -> list[list[int]]:
+        """Channel ids of owners with more than one open ticket of the same type."""
+        return [list(owned) for owned in self._by_owner.values() if len(owned) > 1]
@@ -0,0 +1,208 @@
+import asyncio
+import gzip
+import html
+import json
+import os
+import shutil
+import tempfile
+from dataclasses import dataclass
+
+PAGE_SIZE = 100
+
+HTML_HEADER = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<style>
+body {{ background: #313338; color: #dbdee1; font-family: "gg sans", "Helvetica Neue", Arial, sans-serif; margin: 0; padding: 16px; }}
+h1 {{ font-size: 18px; color: #f2f3f5; border-bottom: 1px solid #3f4147; padding-bottom: 8px; }}
+.msg {{ padding: 4px 0; }}
+.author {{ font-weight: 600; color: #f2f3f5; }}
+.id, .time {{ color: #949ba4; font-size: 12px; margin-left: 6px; }}
+.content {{ white-space: pre-wrap; word-wrap: break-word; margin-top: 2px; }}
+.attachment a {{ color: #00a8fc; }}
+</style>
+</head>
+<body>
+<h1>{title}</h1>
+"""
+HTML_FOOTER = "</body>\n</html>\n"
+SPOOL_FILE = "history.jsonl.gz"
+
+
+@dataclass
+class Transcript:
+    directory: str
+    spool_path: str
+    paths: list[str]
+    message_count: int
+
+
+def message_record(message) -> dict:
+    return {
+        "time": message.created_at.strftime("%Y-%m-%d %H:%M:%S"),
+        "timestamp": message.created_at.timestamp(),
+        "author": str(message.author),
+        "author_id": message.author.id,
+        "content": message.content,
+        "attachments": [att.url for att in message.attachments],
+    }
+
+
+def _write_lines(spool, lines: list[str]):
+    spool.write("".join(lines))
+
+
+async def spool_history(channel, path: str) -> int:
+    """Stream the channel history into a gzip'd JSON-lines file, one page at a time."""
+    loop = asyncio.get_running_loop()
+    count = 0
+    spool = await loop.run_in_executor(None, lambda: gzip.open(path, "wt", encoding="utf-8"))
+    try:
+        page = []
+        async for message in channel.history(limit=None, oldest_first=True):
+            page.append(json.dumps(message_record(message)) + "\n")
+            if len(page) >= PAGE_SIZE:
+                await loop.run_in_executor(None, _write_lines, spool, page)
+                count += len(page)
+                page = []
+        if page:
+            await loop.run_in_executor(None, _write_lines, spool, page)
+            count += len(page)
+    finally:
+        await loop.run_in_executor(None, spool.close)
+    return count
+
+
+def read_spool(path: str):
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            yield json.loads(line)
+
+
+def render_text_line(record: dict) -> str:
+    content = record["content"]
+    if record["attachments"]:
+        content += " " + " ".join(record["attachments"])
+    return f"[{record['time']}] {record['author']} ({record['author_id']}): {content}\n"
+
+
+def render_html_message(record: dict) -> str:
+    attachments = "".join(
+        f'<div class="attachment"><a href="{html.escape(url)}">{html.escape(url.rsplit("/", 1)[-1])}</a></div>'
+        for url in record["attachments"]
+    )
+    return (
+        '<div class="msg">'
+        f'<span class="author">{html.escape(record["author"])}</span>'
+        f'<span class="id">{record["author_id"]}</span>'
+        f'<span class="time">{record["time"]}</span>'
+        f'<div class="content">{html.escape(record["content"])}</div>'
+        f"{attachments}</div>\n"
+    )
+
+
+class SplitWriter:
+    """Write text into numbered part files, starting a new part before one would exceed max_bytes."""
+
+    def __init__(self, directory: str, stem: str, suffix: str, max_bytes: int, header: str = "", footer: str = ""):
+        self.directory = directory
+        self.stem = stem
+        self.suffix = suffix
+        self.max_bytes = max_bytes
+        self.header = header
+        self.footer = footer
+        self.paths: list[str] = []
+        self._out = None
+        self._size = 0
+        self._empty = True
+
+    def _open(self):
+        path = os.path.join(self.directory, f"{self.stem}-part{len(self.paths) + 1}{self.suffix}")
+        self.paths.append(path)
+        self._out = open(path, "wb")
+        self._size = 0
+        self._empty = True
+        self._emit(self.header.encode("utf-8"))
+
+    def _emit(self, data: bytes):
+        self._out.write(data)
+        self._size += len(data)
+
+    def _finish(self):
+        self._emit(self.footer.encode("utf-8"))
+        self._out.close()
+        self._out = None
+
+    def write(self, text: str):
+        data = text.encode("utf-8")
+        if self._out is None:
+            self._open()
+        elif not self._empty and self._size + len(data) + len(self.footer) > self.max_bytes:
+            self._finish()
+            self._open()
+        self._emit(data)
+        self._empty = False
+
+    def close(self) -> list[str]:
+        if self._out is None:
+            self._open()
+        self._finish()
+        if len(self.paths) == 1:
+            single = os.path.join(self.directory, f"{self.stem}{self.suffix}")
+            os.replace(self.paths[0], single)
+            self.paths = [single]
+        return self.paths
+
+
+def render_transcript(spool_path: str, directory: str, name: str, max_bytes: int, render_html: bool = False) -> list[str]:
+    """Render the spool into upload-sized plain-text (and optionally HTML) files. Runs in a worker thread.
+
+    Only the spool is gzip'd; the uploads stay plain so staff can preview them in Discord.
+    """
+    text = SplitWriter(directory, f"transcript-{name}", ".txt", max_bytes)
+    page = None
+    if render_html:
+        title = html.escape(f"Transcript: {name}")
+        page = SplitWriter(directory, f"transcript-{name}", ".html", max_bytes,
+                           header=HTML_HEADER.format(title=title), footer=HTML_FOOTER)
+
+    for record in read_spool(spool_path):
+        text.write(render_text_line(record))
+        if page:
+            page.write(render_html_message(record))
+
+    paths = text.close()
+    if page:
+        paths += page.close()
+    return paths
+
+
+async def build_transcript(channel, max_bytes: int, render_html: bool = False, directory: str | None = None) -> Transcript:
+    """Build transcript files for a channel in `directory` (a new temp dir by default).
+
+    Anything already in `directory` is replaced. The caller removes it with
+    `cleanup()` once the files are uploaded.
+    """
+    loop = asyncio.get_running_loop()
+    if directory is None:
+        directory = await loop.run_in_executor(None, tempfile.mkdtemp, "", "transcript-")
+    else:
+        await cleanup(directory)
+        await loop.run_in_executor(None, lambda: os.makedirs(directory, exist_ok=True))
+    try:
+        spool_path = os.path.join(directory, SPOOL_FILE)
+        count = await spool_history(channel, spool_path)
+        paths = await loop.run_in_executor(
+            None, render_transcript, spool_path, directory, channel.name, max_bytes, render_html
+        )
+    except BaseException:
+        await cleanup(directory)
+        raise
+    return Transcript(directory, spool_path, paths, count)
+
+
+async def cleanup(directory: str):
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(None, shutil.rmtree, directory, True)
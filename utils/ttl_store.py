@@ -0,0 +1,119 @@
+import asyncio
+import heapq
+import json
+import os
+import time
+
+from utils.storage import atomic_write_json
+
+
+class TTLStore:
+    """Keys that expire at a wall-clock time, saved to a JSON file.
+
+    Every key has its own lifetime, set when it's written. Expired keys are
+    dropped lazily when read and by a periodic sweep that pops them off a
+    min-heap of expiry times, so neither a lookup nor a sweep scans the
+    whole store. Because expiry is a UNIX timestamp, a cooldown set before a
+    restart still holds after it. Changes are written behind every
+    `flush_interval` seconds and on `stop()`.
+    """
+
+    def __init__(self, path: str, flush_interval: float = 5.0, sweep_interval: float = 60.0):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.sweep_interval = sweep_interval
+        self._entries: dict[str, list] = {}  # key -> [expires_at, value]
+        self._heap: list[tuple[float, str]] = []
+        self._dirty = False
+        self._task: asyncio.Task | None = None
+
+        if os.path.exists(self.path):
+            with open(self.path, "r") as f:
+                saved = json.load(f)
+            now = time.time()
+            for key, (expires_at, value) in saved.items():
+                if expires_at > now:
+                    self._entries[key] = [expires_at, value]
+                    self._heap.append((expires_at, key))
+            heapq.heapify(self._heap)
+
+    def __len__(self) -> int:
+        """Number of keys, possibly including some that expired but haven't been swept yet."""
+        return len(self._entries)
+
+    def __contains__(self, key) -> bool:
+        return self._live(str(key)) is not None
+
+    def _live(self, key: str) -> list | None:
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] <= time.time():
+            del self._entries[key]
+            self._dirty = True
+            return None
+        return entry
+
+    def set(self, key, value=True, ttl: float = 60.0):
+        key = str(key)
+        expires_at = time.time() + ttl
+        self._entries[key] = [expires_at, value]
+        heapq.heappush(self._heap, (expires_at, key))
+        self._dirty = True
+
+    def get(self, key, default=None):
+        entry = self._live(str(key))
+        return entry[1] if entry is not None else default
+
+    def remaining(self, key) -> float:
+        """Seconds until key expires, or 0 if it isn't set."""
+        entry = self._live(str(key))
+        return max(0.0, entry[0] - time.time()) if entry is not None else 0.0
+
+    def delete(self, key):
+        if self._entries.pop(str(key), None) is not None:
+            self._dirty = True
+
+    def sweep(self) -> int:
+        """Drop every expired key. Heap entries for keys that were re-set or deleted are skipped."""
+        now = time.time()
+        removed = 0
+        while self._heap and self._heap[0][0] <= now:
+            expires_at, key = heapq.heappop(self._heap)
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == expires_at:
+                del self._entries[key]
+                removed += 1
+        if removed:
+            self._dirty = True
+        return removed
+
+    async def flush(self):
+        if not self._dirty:
+            return
+        self._dirty = False
+        data = {key: list(entry) for key, entry in self._entries.items()}
+        loop = asyncio.get_running_loop()
+        try:
+            await loop.run_in_executor(None, atomic_write_json, self.path, data)
+        except BaseException:
+            self._dirty = True
+            raise
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+        await self.flush()
+
+    async def _run(self):
+        last_sweep = time.monotonic()
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            if time.monotonic() - last_sweep >= self.sweep_interval:
+                self.sweep()
+                last_sweep = time.monotonic()
+            try:
+                await self.flush()
+            except OSError as e:
+                print(f"Failed to save {self.path}: {e}")
@@ -0,0 +1,268 @@
+from array import array
+
+
+class VoteIndex:
+    """Single-choice ballots: voter id -> option index, plus running per-option counts.
+
+    Voting, changing a vote, retracting and reading the tally are all O(1);
+    nothing is recounted when results are rendered. Option indexes are small
+    ints, which Python caches, so each voter only costs one dict slot and the
+    id itself.
+    """
+
+    __slots__ = ("_choices", "counts")
+
+    def __init__(self, option_count: int):
+        self._choices: dict[int, int] = {}
+        self.counts = array("q", [0] * option_count)
+
+    def __len__(self) -> int:
+        return len(self._choices)
+
+    def __contains__(self, voter_id: int) -> bool:
+        return voter_id in self._choices
+
+    @property
+    def total(self) -> int:
+        return len(self._choices)
+
+    def choice(self, voter_id: int) -> int | None:
+        return self._choices.get(voter_id)
+
+    def vote(self, voter_id: int, option: int) -> int | None:
+        """Set the voter's choice. Returns their previous choice, if any."""
+        previous = self._choices.get(voter_id)
+        if previous == option:
+            return previous
+        if previous is not None:
+            self.counts[previous] -= 1
+        self._choices[voter_id] = option
+        self.counts[option] += 1
+        return previous
+
+    def retract(self, voter_id: int) -> int | None:
+        previous = self._choices.pop(voter_id, None)
+        if previous is not None:
+            self.counts[previous] -= 1
+        return previous
+
+    def items(self):
+        return self._choices.items()
+
+
+class MultiVoteIndex:
+    """Multi-select ballots: voter id -> bitmask of chosen options, plus per-option counts.
+
+    Changing a ballot only touches the options that flipped, so an update is
+    O(options changed) and the tally is always current.
+    """
+
+    __slots__ = ("_choices", "counts")
+
+    def __init__(self, option_count: int):
+        self._choices: dict[int, int] = {}
+        self.counts = array("q", [0] * option_count)
+
+    def __len__(self) -> int:
+        return len(self._choices)
+
+    @property
+    def total(self) -> int:
+        """Number of voters (not selections)."""
+        return len(self._choices)
+
+    def choices(self, voter_id: int) -> list[int]:
+        mask = self._choices.get(voter_id, 0)
+        return [i for i in range(len(self.counts)) if mask >> i & 1]
+
+    def vote(self, voter_id: int, options) -> None:
+        mask = 0
+        for option in options:
+            mask |= 1 << option
+        previous = self._choices.get(voter_id, 0)
+        changed = previous ^ mask
+        while changed:
+            bit = changed & -changed
+            option = bit.bit_length() - 1
+            self.counts[option] += 1 if mask & bit else -1
+            changed ^= bit
+        if mask:
+            self._choices[voter_id] = mask
+        else:
+            self._choices.pop(voter_id, None)
+
+    def retract(self, voter_id: int) -> None:
+        self.vote(voter_id, ())
+
+
+class _Round:
+    __slots__ = ("remaining", "counts", "exhausted", "outcome")
+
+    def __init__(self, remaining: frozenset, option_count: int):
+        self.remaining = remaining
+        self.counts = [0] * option_count
+        self.exhausted = 0
+        self.outcome: tuple[str, int | None] | None = None
+
+
+class RankedTally:
+    """Instant-runoff tally that is kept up to date ballot by ballot.
+
+    The tally stores every round: who was still in it, each candidate's
+    count, and the round's outcome (eliminate X, X wins, or no result).
+    A vote only records the ballot change; the recount waits until
+    `rounds` or `winner` is read, which for a poll is once per render
+    flush. The queued old and new rankings are then removed from and added
+    to each round's counts, and the rounds are re-checked from the first
+    one. Only when a round's outcome actually changes are the rounds after
+    it rebuilt, from the grouped ballots, so a burst of votes costs at most
+    one rebuild.
+
+    Ties for elimination go to the candidate with fewer first-round votes,
+    then to the later option.
+    """
+
+    def __init__(self, option_count: int):
+        self.option_count = option_count
+        self._ballots: dict[int, tuple[int, ...]] = {}
+        self._groups: dict[tuple[int, ...], int] = {}
+        # ballot -> net weight not yet applied to the rounds
+        self._pending: dict[tuple[int, ...], int] = {}
+        self._rounds: list[_Round] = []
+        self._rebuild_from(0)
+
+    def __len__(self) -> int:
+        return len(self._ballots)
+
+    @property
+    def total(self) -> int:
+        return len(self._ballots)
+
+    @property
+    def rounds(self) -> list["_Round"]:
+        self._settle()
+        return self._rounds
+
+    @property
+    def winner(self) -> int | None:
+        outcome = self.rounds[-1].outcome
+        return outcome[1] if outcome and outcome[0] == "win" else None
+
+    def ranking(self, voter_id: int) -> list[int]:
+        return list(self._ballots.get(voter_id, ()))
+
+    @staticmethod
+    def _top(ballot: tuple[int, ...], remaining: frozenset) -> int | None:
+        for option in ballot:
+            if option in remaining:
+                return option
+        return None
+
+    def _apply(self, ballot: tuple[int, ...], weight: int):
+        for round_ in self._rounds:
+            top = self._top(ballot, round_.remaining)
+            if top is None:
+                round_.exhausted += weight
+            else:
+                round_.counts[top] += weight
+
+    def _decide(self, index: int) -> tuple[str, int | None]:
+        round_ = self._rounds[index]
+        active = sum(round_.counts[c] for c in round_.remaining)
+        if not round_.remaining or active == 0:
+            return ("none", None)
+        leader = max(sorted(round_.remaining), key=lambda c: round_.counts[c])
+        if round_.counts[leader] * 2 > active or len(round_.remaining) == 1:
+            return ("win", leader)
+        first = self._rounds[0].counts
+        loser = min(round_.remaining, key=lambda c: (round_.counts[c], first[c], -c))
+        return ("eliminate", loser)
+
+    def _rebuild_from(self, index: int):
+        """Recount round `index` onward from the grouped ballots.
+
+        Ballots are sorted into one pile per candidate once; each elimination
+        then only moves the eliminated candidate's pile.
+        """
+        if index == 0:
+            remaining = frozenset(range(self.option_count))
+        else:
+            previous = self._rounds[index - 1]
+            remaining = previous.remaining - {previous.outcome[1]}
+        del self._rounds[index:]
+
+        piles: dict[int, list[tuple[tuple[int, ...], int]]] = {c: [] for c in remaining}
+        round_ = _Round(remaining, self.option_count)
+        for ballot, weight in self._groups.items():
+            top = self._top(ballot, remaining)
+            if top is None:
+                round_.exhausted += weight
+            else:
+                round_.counts[top] += weight
+                piles[top].append((ballot, weight))
+
+        while True:
+            self._rounds.append(round_)
+            round_.outcome = self._decide(len(self._rounds) - 1)
+            if round_.outcome[0] != "eliminate":
+                return
+            loser = round_.outcome[1]
+            remaining = remaining - {loser}
+            following = _Round(remaining, self.option_count)
+            following.counts = list(round_.counts)
+            following.counts[loser] = 0
+            following.exhausted = round_.exhausted
+            for ballot, weight in piles.pop(loser):
+                top = self._top(ballot, remaining)
+                if top is None:
+                    following.exhausted += weight
+                else:
+                    following.counts[top] += weight
+                    piles[top].append((ballot, weight))
+            round_ = following
+
+    def _revalidate(self):
+        for index in range(len(self._rounds)):
+            outcome = self._decide(index)
+            if outcome != self._rounds[index].outcome:
+                self._rounds[index].outcome = outcome
+                if outcome[0] == "eliminate":
+                    self._rebuild_from(index + 1)
+                else:
+                    del self._rounds[index + 1:]
+                return
+
+    def _settle(self):
+        """Apply the queued ballot changes and re-check the rounds once."""
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, {}
+        for ballot, weight in pending.items():
+            self._apply(ballot, weight)
+        self._revalidate()
+
+    @staticmethod
+    def _add(groups: dict, ballot: tuple[int, ...], weight: int):
+        count = groups.get(ballot, 0) + weight
+        if count:
+            groups[ballot] = count
+        else:
+            groups.pop(ballot, None)
+
+    def vote(self, voter_id: int, ranking) -> None:
+        ballot = tuple(dict.fromkeys(ranking))
+        previous = self._ballots.get(voter_id)
+        if previous == ballot:
+            return
+        if previous is not None:
+            self._add(self._groups, previous, -1)
+            self._add(self._pending, previous, -1)
+        if ballot:
+            self._ballots[voter_id] = ballot
+            self._add(self._groups, ballot, 1)
+            self._add(self._pending, ballot, 1)
+        else:
+            self._ballots.pop(voter_id, None)
+
+    def retract(self, voter_id: int) -> None:
+        self.vote(voter_id, ())